@@ -1,4 +1,9 @@
 from .symbol_table import SymbolTable
 from .parser import C0ASTParser
+from .parser_trace import ParserTrace, ParserCounters, TokenPrinter
 from .semantic_analyser import Analyser
 from .ast import Ast
+from .visitor import Visitor, visits
+from .arena import AstArena
+from .parallel_parser import parse_parallel
+from .session import CompileSession
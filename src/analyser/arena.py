@@ -0,0 +1,309 @@
+import marshal
+import typing
+from array import array
+from analyser.ast import Ast, AstType, Expression, expression_kinds, kind_names
+from tokenizer.line_index import LineIndex
+from tokenizer.token import Token
+from tokenizer.token_buffer import TokenBuffer, TokenView
+
+# bumped whenever the layout of `AstArena.to_bytes` changes
+version_tag = 'c0-ast-arena-2'
+
+
+class AstArena(object):
+    def __init__(self):
+        """
+        Nodes of a parsed program stored column by column in `array`s, one
+        int per node in each: kind, index of the first child and of the next
+        sibling (-1 if none), index of the token in `tokens` (-1 if none),
+        and source span, offsets of the first char and past the last char
+        of the node (-1 for a node without children).
+
+        Pass one to `C0ASTParser` as builder to parse into it, the parser
+        then returns an `ArenaNode` of the root, a cursor with the interface
+        of `Ast` and `Expression` that `Analyser` walks. Nodes are appended
+        children first, the root is the last one.
+
+        Expressions keep their extra tokens as TOKEN children: the types of
+        a CAST before its operand, the '(' of a CALL before its arguments.
+        """
+        self.kinds = array('i')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.token_idx = array('i')
+        self.span_st = array('i')
+        self.span_ed = array('i')
+        self.tokens = TokenBuffer()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __append(self, kind: int, children: typing.Sequence[int],
+                 token: Token = None, st: int = None, ed: int = None) -> int:
+        idx = len(self.kinds)
+        self.kinds.append(kind)
+        self.next_sibling.append(-1)
+        if children:
+            self.first_child.append(children[0])
+            for prev, child in zip(children, children[1:]):
+                self.next_sibling[prev] = child
+        else:
+            self.first_child.append(-1)
+        if token is None:
+            self.token_idx.append(-1)
+        else:
+            self.token_idx.append(len(self.tokens))
+            self.tokens.append(token)
+        if st is None:
+            st = self.span_st[children[0]] if children else -1
+        if ed is None:
+            ed = self.span_ed[children[-1]] if children else -1
+        self.span_st.append(st)
+        self.span_ed.append(ed)
+        return idx
+
+    def node(self, kind: int, children: typing.Sequence[int]) -> int:
+        return self.__append(kind, children)
+
+    def token(self, token: Token) -> int:
+        return self.__append(AstType.TOKEN, (), token, token.st, token.ed)
+
+    def binary_op(self, op: Token, left: int, right: int) -> int:
+        return self.__append(AstType.BINARY_OP, (left, right), op)
+
+    def unary(self, op: Token, operand: int) -> int:
+        return self.__append(AstType.UNARY, (operand,), op, st=op.st)
+
+    def cast(self, paren: Token, types: typing.List[Token], operand: int) -> int:
+        children = [self.token(token) for token in types]
+        children.append(operand)
+        return self.__append(AstType.CAST, children, st=paren.st)
+
+    def literal(self, token: Token) -> int:
+        return self.__append(AstType.LITERAL, (), token, token.st, token.ed)
+
+    def var(self, token: Token) -> int:
+        return self.__append(AstType.VAR, (), token, token.st, token.ed)
+
+    def call(self, name: Token, paren: Token, args: typing.List[int],
+             close: Token) -> int:
+        children = [self.token(paren)]
+        children.extend(args)
+        return self.__append(AstType.CALL, children, name, name.st, close.ed)
+
+    def parenthesized(self, paren: Token, expression: int, close: Token) -> int:
+        self.span_st[expression] = paren.st
+        self.span_ed[expression] = close.ed
+        return expression
+
+    def finish(self, root: int):
+        return ArenaNode(self, root)
+
+    @property
+    def root(self):
+        return ArenaNode(self, len(self.kinds) - 1)
+
+    def graft(self, other: 'AstArena') -> typing.List[int]:
+        """
+        Append the nodes of `other` but its root, with their tokens, and
+        return the indexes here of the children of its root, to build a node
+        of. Spans are copied, `other` must be parsed from the same source
+        """
+        node_offset = len(self.kinds)
+        token_offset = len(self.tokens)
+        count = len(other.kinds) - 1
+
+        self.kinds.extend(other.kinds[:count])
+        self.first_child.extend(idx if idx == -1 else idx + node_offset
+                                for idx in other.first_child[:count])
+        self.next_sibling.extend(idx if idx == -1 else idx + node_offset
+                                 for idx in other.next_sibling[:count])
+        self.token_idx.extend(idx if idx == -1 else idx + token_offset
+                              for idx in other.token_idx[:count])
+        self.span_st.extend(other.span_st[:count])
+        self.span_ed.extend(other.span_ed[:count])
+
+        tokens = self.tokens
+        tokens.kinds.extend(other.tokens.kinds)
+        tokens.starts.extend(other.tokens.starts)
+        tokens.ends.extend(other.tokens.ends)
+        tokens.name_ids.extend(other.tokens.name_ids)
+        tokens.literals.extend(other.tokens.literals)
+
+        children = []
+        child = other.first_child[count]
+        while child != -1:
+            children.append(child + node_offset)
+            child = other.next_sibling[child]
+        return children
+
+    def to_bytes(self) -> bytes:
+        """
+        The whole arena, tokens and line index included, in one buffer for
+        `from_bytes`. Name ids are kept, they are only meaningful with the
+        `NameTable` of the tokens parsed
+        """
+        tokens = self.tokens
+        lines = tokens.lines if tokens.lines is not None else LineIndex()
+        return marshal.dumps((version_tag,
+                              self.kinds.tobytes(),
+                              self.first_child.tobytes(),
+                              self.next_sibling.tobytes(),
+                              self.token_idx.tobytes(),
+                              self.span_st.tobytes(),
+                              self.span_ed.tobytes(),
+                              tokens.kinds.tobytes(),
+                              tokens.starts.tobytes(),
+                              tokens.ends.tobytes(),
+                              tokens.name_ids.tobytes(),
+                              tokens.literals,
+                              lines.starts.tobytes()))
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        (tag, kinds, first_child, next_sibling, token_idx, span_st, span_ed,
+         token_kinds, token_starts, token_ends, name_ids, literals,
+         line_starts) = marshal.loads(data)
+        if tag != version_tag:
+            raise ValueError(f'Cannot load AST arena of version {tag}')
+
+        arena = cls()
+        arena.kinds.frombytes(kinds)
+        arena.first_child.frombytes(first_child)
+        arena.next_sibling.frombytes(next_sibling)
+        arena.token_idx.frombytes(token_idx)
+        arena.span_st.frombytes(span_st)
+        arena.span_ed.frombytes(span_ed)
+        tokens = arena.tokens
+        tokens.kinds.frombytes(token_kinds)
+        tokens.starts.frombytes(token_starts)
+        tokens.ends.frombytes(token_ends)
+        tokens.name_ids.frombytes(name_ids)
+        tokens.literals = literals
+        tokens.lines = LineIndex()
+        tokens.lines.starts = array('q')
+        tokens.lines.starts.frombytes(line_starts)
+        return arena
+
+    def __getstate__(self):
+        return self.to_bytes()
+
+    def __setstate__(self, data: bytes):
+        self.__dict__.update(AstArena.from_bytes(data).__dict__)
+
+
+class ArenaNode(object):
+    """
+    Cursor on node `idx` of an `AstArena`, read-only with the interface of
+    `Ast`, or of `Expression` for the expression kinds, created on access
+    """
+    __slots__ = ('arena', 'idx')
+
+    def __init__(self, arena: AstArena, idx: int):
+        self.arena = arena
+        self.idx = idx
+
+    @property
+    def kind(self) -> int:
+        return self.arena.kinds[self.idx]
+
+    @property
+    def type(self) -> str:
+        return kind_names[self.kind]
+
+    @property
+    def token(self) -> typing.Union[TokenView, None]:
+        token_idx = self.arena.token_idx[self.idx]
+        if token_idx == -1:
+            return None
+        return TokenView(self.arena.tokens, token_idx)
+
+    @property
+    def span(self) -> tuple:
+        return self.arena.span_st[self.idx], self.arena.span_ed[self.idx]
+
+    @property
+    def st_pos(self) -> tuple:
+        st = self.arena.span_st[self.idx]
+        lines = self.arena.tokens.lines
+        if st == -1 or lines is None:
+            return 0, 0
+        return lines.pos(st + 1)
+
+    def nodes(self) -> tuple:
+        """
+        All the children as stored
+        """
+        arena = self.arena
+        nodes = []
+        child = arena.first_child[self.idx]
+        while child != -1:
+            nodes.append(ArenaNode(arena, child))
+            child = arena.next_sibling[child]
+        return tuple(nodes)
+
+    @property
+    def children(self) -> tuple:
+        kind = self.kind
+        if kind == AstType.CAST:
+            return self.nodes()[-1:]
+        if kind == AstType.CALL:
+            return self.nodes()[1:]
+        return self.nodes()
+
+    def get_children(self):
+        return self.children
+
+    def first_child(self):
+        return ArenaNode(self.arena, self.arena.first_child[self.idx])
+
+    # `Expression` interface, only meaningful for the matching kinds
+
+    @property
+    def op(self) -> TokenView:
+        return self.token
+
+    @property
+    def left(self):
+        return self.first_child()
+
+    @property
+    def right(self):
+        arena = self.arena
+        return ArenaNode(arena, arena.next_sibling[arena.first_child[self.idx]])
+
+    @property
+    def operand(self):
+        return self.nodes()[-1]
+
+    @property
+    def types(self) -> tuple:
+        return tuple(node.token for node in self.nodes()[:-1])
+
+    @property
+    def name(self) -> TokenView:
+        return self.token
+
+    @property
+    def paren(self) -> TokenView:
+        return self.first_child().token
+
+    @property
+    def args(self) -> tuple:
+        return self.nodes()[1:]
+
+    def label(self) -> str:
+        kind = self.kind
+        if kind == AstType.CAST:
+            return ''.join(f'({token.literal})' for token in self.types)
+        if kind == AstType.LITERAL:
+            return repr(self.token.value)
+        return self.token.literal
+
+    def draw(self, draw_full_ast=False):
+        print(self.draw_iter(indent=0, draw_full_ast=draw_full_ast))
+
+    def draw_iter(self, indent: int, islast=False, draw_full_ast=False):
+        draw_iter = Expression.draw_iter if self.kind in expression_kinds \
+            else Ast.draw_iter
+        return draw_iter(self, indent, islast, draw_full_ast)
@@ -1,6 +1,6 @@
 from exception.parser_exceptions import AstException
 from tokenizer import Token
-from typing import List
+from typing import List, Sequence, Tuple
 
 
 class ConsoleColors:
@@ -26,71 +26,108 @@ def get_level_color(level):
 
 
 class AstType(object):
-    C0 = '<C0-root>'
-    VARIABLE_DECLARATION = 'VARIABLE_DECLARATION'
-    FUNCTION_DEFINITION = 'FUNCTION_DEFINITION'
-
-    TYPE_SPECIFIER = 'TYPE_SPECIFIER'
-    INIT_DECLARATOR_LIST = 'INIT_DECLARATOR_LIST'
-    INIT_DECLARATOR = 'INIT_DECLARATOR'
-    INITIALIZER = 'INITIALIZER'
-    ASSIGNMENT_EXPRESSION = 'ASSIGNMENT_EXPRESSION'
-    EXPRESSION = 'EXPRESSION'
-    ADDITIVE_EXPRESSION = 'ADDITIVE_EXPRESSION'
-    MULTIPLICATIVE_EXPRESSION = 'MULTIPLICATIVE_EXPRESSION'
-    CAST_EXPRESSION = 'CAST_EXPRESSION'
-    UNARY_EXPRESSION = 'UNARY_EXPRESSION'
-    PRIMARY_EXPRESSION = 'PRIMARY_EXPRESSION'
-    FUNCTION_CALL = 'FUNCTION_CALL'
-    EXPRESSION_LIST = 'EXPRESSION_LIST'
-    PARAMETER_CLAUSE = 'PARAMETER_CLAUSE'
-    PARAMETER_DECLARATION_LIST = 'PARAMETER_DECLARATION_LIST'
-    PARAMETER_DECLARATION = 'PARAMETER_DECLARATION'
-    COMPOUND_STATEMENT = 'COMPOUND_STATEMENT'
-    STATEMENT_SEQ = 'STATEMENT_SEQ'
-    STATEMENT = 'STATEMENT'
-    CONDITION_STATEMENT = 'CONDITION_STATEMENT'
-    LABELED_STATEMENT = 'LABELED_STATEMENT'
-    LOOP_STATEMENT = 'LOOP_STATEMENT'
-    FOR_INIT_STATEMENT = 'FOR_INIT_STATEMENT'
-    FOR_UPDATE_STATEMENT = 'FOR_UPDATE_STATEMENT'
-    JUMP_STATEMENT = 'JUMP_STATEMENT'
-    RETURN_STATEMENT = 'RETURN_STATEMENT'
-    SCAN_STATEMENT = 'SCAN_STATEMENT'
-    PRINT_STATEMENT = 'PRINT_STATEMENT'
-    PRINTABLE_LIST = 'PRINTABLE_LIST'
-    PRINTABLE = 'PRINTABLE'
-    CONDITION = 'CONDITION'
-
-    IDENTIFIER = 'IDENTIFIER'
-    INTEGER_LITERAL = 'INTEGER_LITERAL'
-    CHAR_LITERAL = 'CHAR_LITERAL'
-    FLOAT_LITERAL = 'FLOAT_LITERAL'
-    STR_LITERAL = 'STR_LITERAL'
-
-    UNARY_OPERATOR = 'UNARY_OPERATOR'
-    ADDITIVE_OPERATOR = 'ADDITIVE_OPERATOR'
-    MULTIPLICATIVE_OPERATOR = 'MULTIPLICATIVE_OPERATOR'
-    RELATIONAL_OPERATOR = 'RELATIONAL_OPERATOR'
-    ASSIGNMENT_OPERATOR = 'ASSIGNMENT_OPERATOR'
-    CONST_QUALIFIER = 'CONST_QUALIFIER'
-    SIMPLE_TYPE_SPECIFIER = 'SIMPLE_TYPE_SPECIFIER'
-
-    TOKEN = 'TOKEN'
+    """
+    Kinds of nodes, small ints compared by the analyser, `kind_names` has
+    their names
+    """
+    C0 = 0
+    VARIABLE_DECLARATION = 1
+    FUNCTION_DEFINITION = 2
+
+    TYPE_SPECIFIER = 3
+    INIT_DECLARATOR_LIST = 4
+    INIT_DECLARATOR = 5
+    INITIALIZER = 6
+    ASSIGNMENT_EXPRESSION = 7
+    PARAMETER_CLAUSE = 8
+    PARAMETER_DECLARATION_LIST = 9
+    PARAMETER_DECLARATION = 10
+    COMPOUND_STATEMENT = 11
+    STATEMENT_SEQ = 12
+    STATEMENT = 13
+    CONDITION_STATEMENT = 14
+    LABELED_STATEMENT = 15
+    LOOP_STATEMENT = 16
+    FOR_INIT_STATEMENT = 17
+    FOR_UPDATE_STATEMENT = 18
+    JUMP_STATEMENT = 19
+    RETURN_STATEMENT = 20
+    SCAN_STATEMENT = 21
+    PRINT_STATEMENT = 22
+    PRINTABLE_LIST = 23
+    PRINTABLE = 24
+    CONDITION = 25
+
+    IDENTIFIER = 26
+    INTEGER_LITERAL = 27
+    CHAR_LITERAL = 28
+    STR_LITERAL = 29
+
+    RELATIONAL_OPERATOR = 30
+    ASSIGNMENT_OPERATOR = 31
+    CONST_QUALIFIER = 32
+    SIMPLE_TYPE_SPECIFIER = 33
+
+    TOKEN = 34
+
+    # expression nodes, see `Expression`
+    BINARY_OP = 35
+    UNARY = 36
+    CAST = 37
+    LITERAL = 38
+    VAR = 39
+    CALL = 40
+
+
+kind_names = {kind: name for name, kind in vars(AstType).items()
+              if isinstance(kind, int)}
+kind_names[AstType.C0] = '<C0-root>'
 
 
 class Ast(object):
-    def __init__(self, ast_type: str, token: Token = None):
-        if ast_type != AstType.TOKEN:
+    """
+    Node of the grammar of `kind`, a TOKEN node holds a `token` and no
+    children, any other holds its children and no token. Children are
+    frozen into a tuple at construction, and so are `first` and `last`,
+    the first and last tokens of the node in the source (None if it has
+    no children)
+    """
+    __slots__ = ('kind', 'token', 'children', 'first', 'last')
+
+    def __init__(self, kind: int, children: Sequence = (), token: Token = None):
+        if kind != AstType.TOKEN:
             if token is not None:
-                raise AstException(f'Cannot init {ast_type} Ast with token')
-        self.type = ast_type
+                raise AstException(f'Cannot init {kind_names[kind]} Ast with token')
+        self.kind = kind
         self.token: Token = token
-        self.children: List[Ast] = []
-        # print(f'==>[Parsing] {self.type}')
+        self.children: Tuple[Ast, ...] = tuple(children)
+        if token is not None:
+            self.first = self.last = token
+        elif self.children:
+            self.first = self.children[0].first
+            self.last = self.children[-1].last
+        else:
+            self.first = self.last = None
+
+    @property
+    def type(self) -> str:
+        return kind_names[self.kind]
 
-    def add_child(self, ast):
-        self.children.append(ast)
+    @property
+    def span(self) -> tuple:
+        """
+        Offsets of the first char and past the last char of the node,
+        (-1, -1) if it has no children, as in `AstArena`
+        """
+        if self.first is None:
+            return -1, -1
+        return self.first.st, self.last.ed
+
+    @property
+    def st_pos(self) -> tuple:
+        if self.first is None:
+            return 0, 0
+        return self.first.st_pos
 
     def get_children(self):
         return self.children
@@ -103,7 +140,7 @@ class Ast(object):
 
     def draw_iter(self, indent: int, islast=False, draw_full_ast=False):
         string = ''
-        if self.type == AstType.STATEMENT and len(self.children) == 1 and not draw_full_ast:
+        if self.kind == AstType.STATEMENT and len(self.children) == 1 and not draw_full_ast:
             string += self.children[0].draw_iter(indent=indent,
                                                  islast=islast,
                                                  draw_full_ast=draw_full_ast)
@@ -131,3 +168,202 @@ class Ast(object):
             string += f'{" " * indent}|-{get_level_color(indent)}token{ConsoleColors.END} @type={self.token.tok_type}, '
             string += f'{ConsoleColors.FAIL}@value={repr(self.token.value)}{ConsoleColors.END}\n'
         return string
+
+
+class Expression(object):
+    """
+    Expressions are not built of `Ast`s for every level of the grammar, but
+    of one node per operator, literal, variable or call.
+
+    `first` and `last` are the first and last tokens of the expression in
+    the source, an enclosing '(' and ')' included, diagnostics about the
+    whole expression are reported at `first`
+    """
+    __slots__ = ('first', 'last')
+    kind: int = None
+
+    @property
+    def type(self) -> str:
+        return kind_names[self.kind]
+
+    @property
+    def span(self) -> tuple:
+        return self.first.st, self.last.ed
+
+    @property
+    def st_pos(self) -> tuple:
+        return self.first.st_pos
+
+    @property
+    def children(self) -> tuple:
+        return ()
+
+    def label(self) -> str:
+        return ''
+
+    def draw_iter(self, indent: int, islast=False, draw_full_ast=False):
+        string = f'{" " * indent}{"`-" if islast else "|-"}'
+        string += f'{get_level_color(indent)}{self.type.lower()}{ConsoleColors.END} '
+        string += f'{ConsoleColors.FAIL}{self.label()}{ConsoleColors.END}\n'
+        children = self.children
+        for idx, child in enumerate(children):
+            string += ' ' * indent
+            string += child.draw_iter(indent=indent + 1,
+                                      islast=idx == len(children) - 1,
+                                      draw_full_ast=draw_full_ast)
+        return string
+
+
+class BinaryOp(Expression):
+    """
+    `left` `op` `right`, `op` is one of '+', '-', '*' and '/'
+    """
+    __slots__ = ('op', 'left', 'right')
+    kind = AstType.BINARY_OP
+
+    def __init__(self, op: Token, left: Expression, right: Expression):
+        self.first = left.first
+        self.last = right.last
+        self.op = op
+        self.left = left
+        self.right = right
+
+    @property
+    def children(self) -> tuple:
+        return self.left, self.right
+
+    def label(self) -> str:
+        return self.op.literal
+
+
+class Unary(Expression):
+    """
+    `op` `operand`, `op` is '+' or '-'
+    """
+    __slots__ = ('op', 'operand')
+    kind = AstType.UNARY
+
+    def __init__(self, op: Token, operand: Expression):
+        self.first = op
+        self.last = operand.last
+        self.op = op
+        self.operand = operand
+
+    @property
+    def children(self) -> tuple:
+        return self.operand,
+
+    def label(self) -> str:
+        return self.op.literal
+
+
+class Cast(Expression):
+    """
+    '(' `types[0]` ')' ... '(' `types[-1]` ')' `operand`, `types` are the
+    tokens of the type keywords, the last one is applied first
+    """
+    __slots__ = ('types', 'operand')
+    kind = AstType.CAST
+
+    def __init__(self, paren: Token, types: List[Token], operand: Expression):
+        self.first = paren
+        self.last = operand.last
+        self.types = tuple(types)
+        self.operand = operand
+
+    @property
+    def children(self) -> tuple:
+        return self.operand,
+
+    def label(self) -> str:
+        return ''.join(f'({token.literal})' for token in self.types)
+
+
+class Literal(Expression):
+    """
+    Integer, char or floating literal
+    """
+    __slots__ = ('token',)
+    kind = AstType.LITERAL
+
+    def __init__(self, token: Token):
+        self.first = self.last = token
+        self.token = token
+
+    def label(self) -> str:
+        return repr(self.token.value)
+
+
+class Var(Expression):
+    __slots__ = ('token',)
+    kind = AstType.VAR
+
+    def __init__(self, token: Token):
+        self.first = self.last = token
+        self.token = token
+
+    def label(self) -> str:
+        return self.token.literal
+
+
+class Call(Expression):
+    """
+    `name` `paren` `args` `close`, `paren` and `close` are the tokens of
+    the '(' and ')'
+    """
+    __slots__ = ('name', 'paren', 'args')
+    kind = AstType.CALL
+
+    def __init__(self, name: Token, paren: Token, args: List[Expression],
+                 close: Token):
+        self.first = name
+        self.last = close
+        self.name = name
+        self.paren = paren
+        self.args = tuple(args)
+
+    @property
+    def children(self) -> tuple:
+        return self.args
+
+    def label(self) -> str:
+        return self.name.literal
+
+
+# kinds of the nodes that are `Expression`s
+expression_kinds = frozenset([AstType.BINARY_OP, AstType.UNARY, AstType.CAST,
+                              AstType.LITERAL, AstType.VAR, AstType.CALL])
+
+
+class TreeBuilder(object):
+    """
+    What `C0ASTParser` builds nodes with, this one builds `Ast` and
+    `Expression` objects. `analyser.arena.AstArena` has the same methods
+    and stores the nodes in arrays instead.
+
+    Children passed in are nodes returned by the same builder, `finish`
+    turns the root into what `C0ASTParser.parse` returns
+    """
+    # the constructors themselves, to not pay a call more per node
+    node = Ast
+    binary_op = BinaryOp
+    unary = Unary
+    cast = Cast
+    literal = Literal
+    var = Var
+    call = Call
+
+    @staticmethod
+    def token(token: Token) -> Ast:
+        return Ast(AstType.TOKEN, token=token)
+
+    @staticmethod
+    def parenthesized(paren: Token, expression: Expression,
+                      close: Token) -> Expression:
+        expression.first = paren
+        expression.last = close
+        return expression
+
+    @staticmethod
+    def finish(root: Ast) -> Ast:
+        return root
@@ -0,0 +1,119 @@
+import os
+import typing
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from analyser.arena import AstArena, ArenaNode
+from analyser.ast import AstType
+from analyser.parser import C0ASTParser
+from tokenizer.token import Token, TokenType
+from tokenizer.token_buffer import TokenBuffer, type_to_kind
+
+# smaller programs are not worth starting processes for
+min_parallel_tokens = 256 * 1024
+
+
+def function_ends(kinds: typing.Sequence[int]) -> typing.Union[list, None]:
+    """
+    Indexes of the tokens following every '}' at the top level of a
+    program, where a function definition ends, or None if the braces of
+    the `TokenBuffer` kinds `kinds` do not match
+    """
+    left_brace = type_to_kind[TokenType.LEFT_BRACE]
+    right_brace = type_to_kind[TokenType.RIGHT_BRACE]
+    ends = []
+    depth = 0
+    for idx, kind in enumerate(kinds):
+        if kind == left_brace:
+            depth += 1
+        elif kind == right_brace:
+            depth -= 1
+            if depth == 0:
+                ends.append(idx + 1)
+            elif depth < 0:
+                return None
+    return ends if depth == 0 else None
+
+
+def split_functions(ends: typing.List[int], count: int, runs: int) -> list:
+    """
+    Token indexes splitting `count` tokens into at most `runs` runs of
+    about the same size, each ending where a function ends but the last
+    """
+    splits = [0]
+    for k in range(1, runs):
+        idx = bisect_left(ends, count * k // runs)
+        if idx == len(ends) or ends[idx] >= count:
+            break
+        if ends[idx] > splits[-1]:
+            splits.append(ends[idx])
+    splits.append(count)
+    return splits
+
+
+def parse_run(kinds: bytes, starts: bytes, ends: bytes, name_ids: bytes,
+              literals: list, functions_only: bool):
+    """
+    Parse a run of tokens, given as `TokenBuffer` columns, into an
+    `AstArena`, returned as bytes, or None if parsing failed. Tokens have no
+    line index, positions are only needed for the exceptions, which are
+    raised again by the caller
+    """
+    tokens = TokenBuffer()
+    tokens.kinds.frombytes(kinds)
+    tokens.starts.frombytes(starts)
+    tokens.ends.frombytes(ends)
+    tokens.name_ids.frombytes(name_ids)
+    tokens.literals = literals
+    arena = AstArena()
+    try:
+        C0ASTParser(tokens, arena, functions_only).parse()
+    except Exception:
+        return None
+    return arena.to_bytes()
+
+
+def parse_parallel(tokens: typing.Iterable[Token], workers: int = None,
+                   min_size: int = min_parallel_tokens) -> ArenaNode:
+    """
+    Parse the program of `tokens` in `workers` processes into an
+    `AstArena`, the tree is the same as
+    `C0ASTParser(tokens, AstArena()).parse()`, and so are the exceptions.
+
+    Function definitions hold the only braces of a program, so functions
+    end at the top level '}'s. Runs of whole functions are parsed on their
+    own, the first one with the variable declarations before them, and
+    their trees grafted in order under the root. If any run fails, the
+    program is parsed again in this process, which raises the exception at
+    the earliest position, as do programs with unmatched braces.
+    Programs of less than `min_size` tokens are parsed in this process
+    """
+    if not isinstance(tokens, TokenBuffer):
+        tokens = TokenBuffer(tokens)
+    workers = workers or os.cpu_count() or 1
+    ends = None
+    if workers > 1 and len(tokens) >= min_size:
+        ends = function_ends(tokens.kinds)
+    if not ends:
+        return C0ASTParser(tokens, AstArena()).parse()
+
+    splits = split_functions(ends, len(tokens), workers * 4)
+    runs = list(zip(splits, splits[1:]))
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(
+            parse_run,
+            [tokens.kinds[st:ed].tobytes() for st, ed in runs],
+            [tokens.starts[st:ed].tobytes() for st, ed in runs],
+            [tokens.ends[st:ed].tobytes() for st, ed in runs],
+            [tokens.name_ids[st:ed].tobytes() for st, ed in runs],
+            [tokens.literals[st:ed] for st, ed in runs],
+            [st > 0 for st, _ in runs]))
+
+    if None in results:
+        return C0ASTParser(tokens, AstArena()).parse()
+
+    arena = AstArena()
+    arena.tokens.lines = tokens.lines
+    children = []
+    for data in results:
+        children.extend(arena.graft(AstArena.from_bytes(data)))
+    return arena.finish(arena.node(AstType.C0, children))
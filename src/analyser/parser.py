@@ -1,27 +1,121 @@
+import inspect
 import sys
 import typing
-from tokenizer import TokenType
+from tokenizer import TokenType, TokenStream
 from exception.parser_exceptions import *
-from analyser.ast import Ast, AstType
-
-is_debug = False
-
-
-def debug(*arg, **kwargs):
-    if is_debug:
-        print(*arg, **kwargs)
+from analyser.ast import Ast, AstType, Expression, Call, TreeBuilder
+from analyser.trampoline import trampoline
+from analyser.parser_trace import ParserTrace
+
+# binding power of the binary operators, higher binds tighter
+binary_precedence = {
+    TokenType.ADD: 1,
+    TokenType.SUB: 1,
+    TokenType.MUL: 2,
+    TokenType.DIV: 2,
+}
+
+literal_types = (TokenType.INTEGER_LITERAL, TokenType.CHAR_LITERAL,
+                 TokenType.FLOAT_LITERAL)
+
+
+class ExpressionFrame(object):
+    """
+    Expression being parsed inside a '(' `paren`, or the arguments of a call
+    to `name` when it is set, with the operands and (operator, precedence)
+    pairs not folded yet. `prefix` is what `__parse_prefix` read before the
+    '(' or the call, applied once it is closed
+    """
+    __slots__ = ('prefix', 'paren', 'name', 'args', 'operands', 'operators')
+
+    def __init__(self, prefix: tuple = (None, (), None), paren: Token = None,
+                 name: Token = None):
+        self.prefix = prefix
+        self.paren = paren
+        self.name = name
+        self.args = []
+        self.operands = []
+        self.operators = []
 
 
 class C0ASTParser(object):
-    def __init__(self, tokens: typing.List[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: typing.Iterable[Token], builder=None,
+                 functions_only: bool = False, trace: ParserTrace = None):
+        """
+        tokens: a list of tokens or an iterator such as
+            `Tokenizer.iter_tokens`, read as parsing goes, the parser only
+            keeps the last few in a `TokenStream`
+        builder: what nodes are built with, a `TreeBuilder` by default,
+            pass an `AstArena` to store them in arrays
+        functions_only: parse `tokens` as the function definitions that
+            follow the variable declarations of a program
+        trace: hooks called on every rule and token, see `ParserTrace`
+        """
+        self.tokens = TokenStream(tokens)
+        self.build = TreeBuilder() if builder is None else builder
+        self.functions_only = functions_only
         self.tok_idx = 0
         self.parsed = False
         self.__ast: Ast = ...
+        if trace is not None:
+            self.__install_trace(trace)
+
+    def __install_trace(self, trace: ParserTrace):
+        """
+        Shadow the methods of the rules and of reading tokens with ones
+        calling `trace`, on this instance only, so that untraced parsers
+        run the methods of the class as they are
+        """
+        prefix = '_C0ASTParser__parse_'
+        for name, function in vars(C0ASTParser).items():
+            if name.startswith(prefix):
+                method = getattr(self, name)
+                rule = name[len(prefix):]
+                if inspect.isgeneratorfunction(function):
+                    traced = self.__traced_generator(trace, rule, method)
+                else:
+                    traced = self.__traced(trace, rule, method)
+                setattr(self, name, traced)
+
+        next_token = self.__next_token
+        unread_token = self.__unread_token
+
+        def traced_next_token(suppress_exception: bool = False):
+            token = next_token(suppress_exception)
+            trace.next_token(token)
+            return token
+
+        def traced_unread_token():
+            unread_token()
+            trace.unread_token(self.tokens[self.tok_idx])
+
+        self.__next_token = traced_next_token
+        self.__unread_token = traced_unread_token
+
+    @staticmethod
+    def __traced(trace: ParserTrace, rule: str, method):
+        def traced(*args, **kwargs):
+            trace.enter(rule)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                trace.exit(rule)
+        return traced
+
+    @staticmethod
+    def __traced_generator(trace: ParserTrace, rule: str, method):
+        # entered when `trampoline` starts it, left when it returns
+        def traced(*args, **kwargs):
+            trace.enter(rule)
+            try:
+                return (yield from method(*args, **kwargs))
+            finally:
+                trace.exit(rule)
+        return traced
 
     def parse(self) -> Ast:
         if not self.parsed:
-            self.__ast = self.__parse_c0()
+            self.__ast = self.build.finish(self.__parse_c0())
             self.parsed = True
         return self.__ast
 
@@ -31,14 +125,15 @@ class C0ASTParser(object):
         <C0-program> ::= {<variable-declaration>}{<function-definition>}
         """
 
-        ast = Ast(AstType.C0)
+        children = []
 
         # {<variable-declaration>}
-        while self.__peek_token(suppress_exception=True) is not None:
+        while not self.functions_only \
+                and self.__peek_token(suppress_exception=True) is not None:
             token = self.__peek_token()
 
             if token.tok_type == TokenType.CONST:
-                ast.add_child(self.__parse_variable_declaration())
+                children.append(self.__parse_variable_declaration())
             elif token.tok_type in TokenType.types:
                 a, b, c = [self.__next_token(
                     suppress_exception=True) for _ in range(3)]
@@ -49,194 +144,277 @@ class C0ASTParser(object):
                     self.__unread_token()
 
                 if c.tok_type == TokenType.LEFT_PARENTHESES:
-                    ast.add_child(self.__parse_function_definition())
+                    children.append(self.__parse_function_definition())
                     break
                 else:
-                    ast.add_child(self.__parse_variable_declaration())
+                    children.append(self.__parse_variable_declaration())
             else:
                 raise ExpectedTypeSpecifier(token.st_pos)
 
         # {<function-definition>}
         while self.__peek_token(suppress_exception=True) is not None:
-            ast.add_child(self.__parse_function_definition())
+            children.append(self.__parse_function_definition())
 
-        return ast
+        return self.build.node(AstType.C0, children)
 
     def __parse_function_definition(self) -> Ast:
         """
         <function-definition> ::=
             <type-specifier><identifier><parameter-clause><compound-statement>
         """
-        ast = Ast(AstType.FUNCTION_DEFINITION)
+        children = []
         start_pos = self.__current_pos()
 
         try:
-            ast.add_child(self.__parse_type_specifier())
-            ast.add_child(self.__parse_identifier())
-            ast.add_child(self.__parse_parameter_clause())
-            ast.add_child(self.__parse_compound_statement())
+            children.append(self.__parse_type_specifier())
+            children.append(self.__parse_identifier())
+            children.append(self.__parse_parameter_clause())
+            children.append(trampoline(self.__parse_compound_statement()))
         except TokenIndexOutOfRange as e:
             print(e, file=sys.stderr)
             raise InvalidFunctionDefinition(start_pos)
 
-        return ast
+        return self.build.node(AstType.FUNCTION_DEFINITION, children)
 
     def __parse_variable_declaration(self) -> Ast:
         """
         <variable-declaration> ::=
             [<const-qualifier>]<type-specifier><init-declarator-list>';'
         """
-        ast = Ast(AstType.VARIABLE_DECLARATION)
+        children = []
         start_pos = self.__current_pos()
 
         try:
             token = self.__peek_token()
             if token.tok_type == TokenType.CONST:
-                ast.add_child(self.__parse_const_qualifier())
+                children.append(self.__parse_const_qualifier())
 
-            ast.add_child(self.__parse_type_specifier())
-            ast.add_child(self.__parse_init_declarator_list())
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+            children.append(self.__parse_type_specifier())
+            children.append(self.__parse_init_declarator_list())
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
         except TokenIndexOutOfRange as e:
             print(e, file=sys.stderr)
             raise InvalidVariableDeclaration(start_pos)
 
-        return ast
+        return self.build.node(AstType.VARIABLE_DECLARATION, children)
 
     def __parse_const_qualifier(self) -> Ast:
         """
         <const-qualifier>        ::= 'const'
         """
-        ast = Ast(AstType.CONST_QUALIFIER)
-        ast.add_child(self.__assert_token('const', TokenType.CONST))
-        return ast
+        children = []
+        children.append(self.__assert_token('const', TokenType.CONST))
+        return self.build.node(AstType.CONST_QUALIFIER, children)
 
     def __parse_type_specifier(self) -> Ast:
         """
         <type-specifier>         ::= <simple-type-specifier>
         """
-        ast = Ast(AstType.TYPE_SPECIFIER)
-        ast.add_child(self.__parse_simple_type_specifier())
-        return ast
+        children = []
+        children.append(self.__parse_simple_type_specifier())
+        return self.build.node(AstType.TYPE_SPECIFIER, children)
 
     def __parse_simple_type_specifier(self) -> Ast:
         """
         <simple-type-specifier>  ::= 'void'|'int'|'char'|'double'
         """
-        ast = Ast(AstType.SIMPLE_TYPE_SPECIFIER)
+        children = []
 
         token = self.__next_token()
         if token.tok_type in TokenType.types:
-            ast.add_child(Ast(AstType.TOKEN, token))
+            children.append(self.build.token(token))
         else:
             raise UnknownVariableType(token.st_pos, token.literal)
 
-        return ast
+        return self.build.node(AstType.SIMPLE_TYPE_SPECIFIER, children)
 
     def __parse_init_declarator_list(self) -> Ast:
         """
         <init-declarator-list> ::=
             <init-declarator>{','<init-declarator>}
         """
-        ast = Ast(AstType.INIT_DECLARATOR_LIST)
+        children = []
 
-        ast.add_child(self.__parse_init_declarator())
+        children.append(self.__parse_init_declarator())
 
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None or token.tok_type != TokenType.COMMA:
                 break
-            ast.add_child(self.__assert_token(',', TokenType.COMMA))
-            ast.add_child(self.__parse_init_declarator())
-        return ast
+            children.append(self.__assert_token(',', TokenType.COMMA))
+            children.append(self.__parse_init_declarator())
+        return self.build.node(AstType.INIT_DECLARATOR_LIST, children)
 
     def __parse_init_declarator(self) -> Ast:
         """
         <init-declarator> ::=
             <identifier>[<initializer>]
         """
-        ast = Ast(AstType.INIT_DECLARATOR)
+        children = []
 
-        ast.add_child(self.__parse_identifier())
+        children.append(self.__parse_identifier())
 
         token = self.__peek_token()
         if token.tok_type == TokenType.ASSIGN:
-            ast.add_child(self.__parse_initializer())
-        return ast
+            children.append(self.__parse_initializer())
+        return self.build.node(AstType.INIT_DECLARATOR, children)
 
     def __parse_identifier(self) -> Ast:
-        ast = Ast(AstType.IDENTIFIER)
+        token = self.__parse_identifier_token()
+        return self.build.node(AstType.IDENTIFIER, [self.build.token(token)])
 
+    def __parse_identifier_token(self) -> Token:
         token = self.__next_token(suppress_exception=True)
         if token is None:
             raise ExpectedIdentifier(self.__prev_token().st_pos)
 
         if token.tok_type != TokenType.IDENTIFIER:
             raise ExpectedIdentifier(token.st_pos)
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+        return token
 
     def __parse_initializer(self) -> Ast:
         """
         <initializer> ::=
             '='<expression>
         """
-        ast = Ast(AstType.INITIALIZER)
+        children = []
 
-        ast.add_child(self.__assert_token('=', TokenType.ASSIGN))
-        ast.add_child(self.__parse_expression())
-        return ast
+        children.append(self.__assert_token('=', TokenType.ASSIGN))
+        children.append(self.__parse_expression())
+        return self.build.node(AstType.INITIALIZER, children)
 
-    def __parse_expression(self) -> Ast:
+    def __parse_expression(self) -> Expression:
         """
         <expression> ::=
             <additive-expression>
-        """
-        ast = Ast(AstType.EXPRESSION)
-        ast.add_child(self.__parse_additive_expression())
-        return ast
-
-    def __parse_additive_expression(self) -> Ast:
-        """
         <additive-expression> ::=
             <multiplicative-expression>{<additive-operator><multiplicative-expression>}
+        <multiplicative-expression> ::=
+            <cast-expression>{<multiplicative-operator><cast-expression>}
+        <cast-expression> ::=
+            {'('<type-specifier>')'}<unary-expression>
+        <unary-expression> ::=
+            [<unary-operator>]<primary-expression>
+        <unary-operator>          ::= '+' | '-'
+        <primary-expression> ::=
+            '('<expression>')'
+            |<identifier>
+            |<integer-literal>
+            |<char-literal>
+            |<floating-literal>
+            |<function-call>
         """
-        ast = Ast(AstType.ADDITIVE_EXPRESSION)
-
-        ast.add_child(self.__parse_multiplicative_expression())
-
-        while True:
-            token = self.__peek_token(suppress_exception=True)
-            if token is None or token.tok_type not in [TokenType.ADD, TokenType.SUB]:
-                break
-            ast.add_child(self.__parse_additive_operator())
-            ast.add_child(self.__parse_multiplicative_expression())
-        return ast
+        return self.__parse_nested_expression(ExpressionFrame())
 
-    def __parse_multiplicative_expression(self) -> Ast:
+    def __parse_function_call(self) -> Call:
         """
-        <multiplicative-expression> ::=
-            <cast-expression>{<multiplicative-operator><cast-expression>}
+        <function-call> ::=
+            <identifier> '(' [<expression-list>] ')'
+        <expression-list> ::=
+            <expression>{','<expression>}
         """
-        ast = Ast(AstType.MULTIPLICATIVE_EXPRESSION)
+        name = self.__parse_identifier_token()
+        paren = self.__expect_token('(', TokenType.LEFT_PARENTHESES)
+        return self.__parse_nested_expression(ExpressionFrame(paren=paren,
+                                                              name=name))
 
-        ast.add_child(self.__parse_cast_expression())
+    def __parse_nested_expression(self, frame) -> Expression:
+        """
+        Parse the expression, or the arguments of the call, `frame` starts,
+        without recursion however deeply parentheses and calls nest: every
+        '(' and call opens a frame on `frames`, closed at its ')'.
 
+        Within a frame operators are folded by precedence climbing, an
+        operator first folds the operators before it binding at least as
+        tight, so operators of the same precedence associate to the left
+        """
+        frames = [frame]
+        # operand just parsed, to be folded into the innermost frame
+        operand = None
         while True:
-            token = self.__peek_token(suppress_exception=True)
-            if token is None or token.tok_type not in [TokenType.MUL, TokenType.DIV]:
-                break
-            ast.add_child(self.__parse_multiplicative_operator())
-            ast.add_child(self.__parse_cast_expression())
-        return ast
+            frame = frames[-1]
+            if operand is None:
+                if frame.name is not None and not frame.args \
+                        and not frame.operands:
+                    # first argument, or none
+                    token = self.__peek_token(suppress_exception=True)
+                    if token is None:
+                        raise ExpectedSymbol(self.__prev_token().ed_pos, ')')
+                    if token.tok_type == TokenType.RIGHT_PARENTHESES:
+                        operand = self.__close_call(frames.pop())
+                        if not frames:
+                            return operand
+                        continue
+
+                prefix = self.__parse_prefix()
+                token = self.__peek_token(suppress_exception=True)
+                if token is None:
+                    raise InvalidExpression(self.__prev_token().ed_pos)
+
+                if token.tok_type == TokenType.LEFT_PARENTHESES:
+                    self.__next_token()
+                    frames.append(ExpressionFrame(prefix, paren=token))
+                    continue
+                elif token.tok_type in literal_types:
+                    self.__next_token()
+                    operand = self.build.literal(token)
+                elif token.tok_type == TokenType.IDENTIFIER:
+                    self.__next_token()
+                    lookahead = self.__peek_token(suppress_exception=True)
+                    if lookahead is None:
+                        raise MissingSemicolon(self.__prev_token().ed_pos)
+                    if lookahead.tok_type == TokenType.LEFT_PARENTHESES:
+                        self.__next_token()
+                        frames.append(ExpressionFrame(prefix, paren=lookahead,
+                                                      name=token))
+                        continue
+                    operand = self.build.var(token)
+                else:
+                    raise InvalidExpression(token.st_pos)
+                operand = self.__apply_prefix(prefix, operand)
 
-    def __parse_cast_expression(self) -> Ast:
-        """
-        <cast-expression> ::=
-            {'('<type-specifier>')'}<unary-expression>
-        """
-        ast = Ast(AstType.CAST_EXPRESSION)
+            operands = frame.operands
+            operators = frame.operators
+            operands.append(operand)
+            operand = None
 
+            token = self.__peek_token(suppress_exception=True)
+            precedence = None if token is None \
+                else binary_precedence.get(token.tok_type)
+            if precedence is not None:
+                self.__next_token()
+                self.__fold(operands, operators, precedence)
+                operators.append((token, precedence))
+                continue
+
+            # end of the expression of the frame
+            self.__fold(operands, operators, 0)
+            expression = operands.pop()
+            if frame.paren is None:
+                return expression
+            if frame.name is None:
+                close = self.__expect_token(')', TokenType.RIGHT_PARENTHESES)
+                frames.pop()
+                expression = self.build.parenthesized(frame.paren, expression,
+                                                      close)
+                operand = self.__apply_prefix(frame.prefix, expression)
+                continue
+
+            frame.args.append(expression)
+            if token is not None and token.tok_type == TokenType.COMMA:
+                self.__next_token()
+                continue
+            operand = self.__close_call(frames.pop())
+            if not frames:
+                return operand
+
+    def __parse_prefix(self) -> tuple:
+        """
+        {'('<type-specifier>')'}[<unary-operator>] before a primary
+        expression, as ('(' of the first cast, type tokens, unary operator)
+        """
+        paren = None
+        types = []
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None:
@@ -244,283 +422,180 @@ class C0ASTParser(object):
 
             if token.tok_type != TokenType.LEFT_PARENTHESES:
                 break
-            ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+            self.__next_token()
 
-            token = self.__peek_token(suppress_exception=True)
-            if token is None:
+            type_token = self.__peek_token(suppress_exception=True)
+            if type_token is None:
                 raise InvalidExpression(self.__prev_token().ed_pos)
-            if token.tok_type not in TokenType.types:
+            if type_token.tok_type not in TokenType.types:
+                # '(' of a primary expression
                 self.__unread_token()
                 break
-            ast.add_child(self.__parse_type_specifier())
-            ast.add_child(self.__assert_token(')',
-                                              TokenType.RIGHT_PARENTHESES))
-
-        ast.add_child(self.__parse_unary_expression())
-        return ast
-
-    def __parse_unary_expression(self) -> Ast:
-        """
-        <unary-expression> ::=
-            [<unary-operator>]<primary-expression>
-        """
-        ast = Ast(AstType.UNARY_EXPRESSION)
-
-        token = self.__peek_token(suppress_exception=True)
-        if token is None:
-            raise InvalidExpression(self.__prev_token().ed_pos)
+            self.__next_token()
+            self.__expect_token(')', TokenType.RIGHT_PARENTHESES)
+            if paren is None:
+                paren = token
+            types.append(type_token)
 
+        # `token` is the next token
+        op = None
         if token.tok_type in [TokenType.ADD, TokenType.SUB]:
-            ast.add_child(self.__parse_unary_operator())
-        ast.add_child(self.__parse_primary_expression())
-        return ast
-
-    def __parse_primary_expression(self) -> Ast:
-        """
-        <primary-expression> ::=
-            '('<expression>')'
-            |<identifier>
-            |<integer-literal>
-            |<char-literal>
-            |<floating-literal>
-            |<function-call>
-        """
-        # debug(f'@[parsing] primary expression')
-        ast = Ast(AstType.PRIMARY_EXPRESSION)
-
-        token = self.__peek_token(suppress_exception=True)
-        if token is None:
-            raise InvalidExpression(self.__prev_token().ed_pos)
-
-        if token.tok_type == TokenType.LEFT_PARENTHESES:
-            ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-            ast.add_child(self.__parse_expression())
-            ast.add_child(self.__assert_token(')',
-                                              TokenType.RIGHT_PARENTHESES))
-        elif token.tok_type == TokenType.INTEGER_LITERAL:
-            ast.add_child(self.__parse_integer_literal())
-        elif token.tok_type == TokenType.CHAR_LITERAL:
-            ast.add_child(self.__parse_char_literal())
-        elif token.tok_type == TokenType.FLOAT_LITERAL:
-            ast.add_child(self.__parse_float_literal())
-        elif token.tok_type == TokenType.IDENTIFIER:
             self.__next_token()
-            token = self.__peek_token(suppress_exception=True)
-            if token is None:
-                raise MissingSemicolon(self.__prev_token().ed_pos)
-
-            self.__unread_token()
-            if token.tok_type == TokenType.LEFT_PARENTHESES:
-                ast.add_child(self.__parse_function_call())
-            else:
-                ast.add_child(self.__parse_identifier())
-        return ast
-
-    def __parse_unary_operator(self) -> Ast:
-        """
-        <unary-operator>          ::= '+' | '-'
-        """
-        ast = Ast(AstType.UNARY_OPERATOR)
-
-        token = self.__next_token()
-        if token.tok_type not in [TokenType.ADD, TokenType.SUB]:
-            raise ExpectedSymbol(token.st_pos, '+ or -')
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
-
-    def __parse_additive_operator(self) -> Ast:
-        """
-        <additive-operator>       ::= '+' | '-'
-        """
-        ast = Ast(AstType.ADDITIVE_OPERATOR)
+            op = token
+        return paren, types, op
 
-        token = self.__next_token()
-        if token.tok_type not in [TokenType.ADD, TokenType.SUB]:
-            raise ExpectedSymbol(token.st_pos, '+ or -')
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+    def __apply_prefix(self, prefix: tuple, operand) -> Expression:
+        paren, types, op = prefix
+        if op is not None:
+            operand = self.build.unary(op, operand)
+        if types:
+            operand = self.build.cast(paren, types, operand)
+        return operand
 
-    def __parse_multiplicative_operator(self) -> Ast:
+    def __fold(self, operands: list, operators: list, precedence: int):
         """
-        <multiplicative-operator> ::= '*' | '/'
+        Fold the operators at the end of `operators` binding at least as
+        tight as `precedence` with their operands
         """
-        ast = Ast(AstType.MULTIPLICATIVE_OPERATOR)
+        while operators and operators[-1][1] >= precedence:
+            op, _ = operators.pop()
+            right = operands.pop()
+            operands[-1] = self.build.binary_op(op, operands[-1], right)
 
-        token = self.__next_token()
-        if token.tok_type not in [TokenType.MUL, TokenType.DIV]:
-            raise ExpectedSymbol(token.st_pos, '* or /')
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+    def __close_call(self, frame) -> Expression:
+        close = self.__expect_token(')', TokenType.RIGHT_PARENTHESES)
+        call = self.build.call(frame.name, frame.paren, frame.args, close)
+        return self.__apply_prefix(frame.prefix, call)
 
     def __parse_relational_operator(self) -> Ast:
         """
         <relational-operator>     ::= '<' | '<=' | '>' | '>=' | '!=' | '=='
         """
-        ast = Ast(AstType.RELATIONAL_OPERATOR)
+        children = []
 
         token = self.__next_token()
         if token.tok_type not in TokenType.relations:
             raise ExpectedSymbol(
                 token.st_pos, "'<' | '<=' | '>' | '>=' | '!=' | '=='")
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+        children.append(self.build.token(token))
+        return self.build.node(AstType.RELATIONAL_OPERATOR, children)
 
     def __parse_assignment_operator(self) -> Ast:
         """
         <assignment-operator>     ::= '='
         """
-        ast = Ast(AstType.ASSIGNMENT_OPERATOR)
-        ast.add_child(self.__assert_token('=', TokenType.ASSIGN))
-        return ast
+        children = []
+        children.append(self.__assert_token('=', TokenType.ASSIGN))
+        return self.build.node(AstType.ASSIGNMENT_OPERATOR, children)
 
     def __parse_integer_literal(self) -> Ast:
-        ast = Ast(AstType.INTEGER_LITERAL)
+        children = []
 
         token = self.__next_token()
         if token.tok_type != TokenType.INTEGER_LITERAL:
             raise ExpectedInt32(token.st_pos)
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+        children.append(self.build.token(token))
+        return self.build.node(AstType.INTEGER_LITERAL, children)
 
     def __parse_char_literal(self) -> Ast:
-        ast = Ast(AstType.CHAR_LITERAL)
+        children = []
 
         token = self.__next_token()
         if token.tok_type != TokenType.CHAR_LITERAL:
             raise ExpectedCharLiteral(token.st_pos)
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
-
-    def __parse_float_literal(self) -> Ast:
-        ast = Ast(AstType.FLOAT_LITERAL)
-
-        token = self.__next_token()
-        if token.tok_type != TokenType.FLOAT_LITERAL:
-            raise ExpectedFloatLiteral(token.st_pos)
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
+        children.append(self.build.token(token))
+        return self.build.node(AstType.CHAR_LITERAL, children)
 
     def __parse_str_literal(self) -> Ast:
-        ast = Ast(AstType.STR_LITERAL)
+        children = []
 
         token = self.__next_token()
         if token.tok_type != TokenType.STR_LITERAL:
             raise ExpectedStrLiteral(token.st_pos)
-        ast.add_child(Ast(AstType.TOKEN, token))
-        return ast
-
-    def __parse_function_call(self) -> Ast:
-        """
-        <function-call> ::=
-            <identifier> '(' [<expression-list>] ')'
-        """
-        ast = Ast(AstType.FUNCTION_CALL)
-
-        ast.add_child(self.__parse_identifier())
-        ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-
-        token = self.__peek_token(suppress_exception=True)
-        if token is None:
-            raise ExpectedSymbol(self.__prev_token().ed_pos, ')')
-        if token.tok_type != TokenType.RIGHT_PARENTHESES:
-            ast.add_child(self.__parse_expression_list())
-
-        ast.add_child(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
-        return ast
-
-    def __parse_expression_list(self) -> Ast:
-        """
-        <expression-list> ::=
-            <expression>{','<expression>}
-        """
-        ast = Ast(AstType.EXPRESSION_LIST)
-
-        ast.add_child(self.__parse_expression())
-        while True:
-            token = self.__peek_token(suppress_exception=True)
-            if token is None or token.tok_type != TokenType.COMMA:
-                break
-            ast.add_child(self.__assert_token(',', TokenType.COMMA))
-            ast.add_child(self.__parse_expression())
-        return ast
+        children.append(self.build.token(token))
+        return self.build.node(AstType.STR_LITERAL, children)
 
     def __parse_parameter_clause(self) -> Ast:
         """
         <parameter-clause> ::=
             '(' [<parameter-declaration-list>] ')'
         """
-        ast = Ast(AstType.PARAMETER_CLAUSE)
+        children = []
 
-        ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+        children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
             raise ExpectedSymbol(self.__prev_token().ed_pos, ')')
         if token.tok_type != TokenType.RIGHT_PARENTHESES:
-            ast.add_child(self.__parse_parameter_declaration_list())
+            children.append(self.__parse_parameter_declaration_list())
 
-        ast.add_child(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
-        return ast
+        children.append(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
+        return self.build.node(AstType.PARAMETER_CLAUSE, children)
 
     def __parse_parameter_declaration_list(self) -> Ast:
         """
         <parameter-declaration-list> ::=
             <parameter-declaration>{','<parameter-declaration>}
         """
-        ast = Ast(AstType.PARAMETER_DECLARATION_LIST)
+        children = []
 
-        ast.add_child(self.__parse_parameter_declaration())
+        children.append(self.__parse_parameter_declaration())
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None or token.tok_type != TokenType.COMMA:
                 break
-            ast.add_child(self.__assert_token(',', TokenType.COMMA))
-            ast.add_child(self.__parse_parameter_declaration())
-        return ast
+            children.append(self.__assert_token(',', TokenType.COMMA))
+            children.append(self.__parse_parameter_declaration())
+        return self.build.node(AstType.PARAMETER_DECLARATION_LIST, children)
 
     def __parse_parameter_declaration(self) -> Ast:
         """
         <parameter-declaration> ::=
             [<const-qualifier>]<type-specifier><identifier>
         """
-        ast = Ast(AstType.PARAMETER_DECLARATION)
+        children = []
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
             raise ExpectedTypeSpecifier(self.__prev_token().ed_pos)
         if token.tok_type == TokenType.CONST:
-            ast.add_child(self.__parse_const_qualifier())
+            children.append(self.__parse_const_qualifier())
 
-        ast.add_child(self.__parse_type_specifier())
-        ast.add_child(self.__parse_identifier())
-        return ast
+        children.append(self.__parse_type_specifier())
+        children.append(self.__parse_identifier())
+        return self.build.node(AstType.PARAMETER_DECLARATION, children)
 
-    def __parse_compound_statement(self) -> Ast:
+    # Statements nest in statements, the parsers of those that hold
+    # statements are generators run by `trampoline`, so that nesting does
+    # not nest Python frames
+
+    def __parse_compound_statement(self) -> typing.Generator:
         """
         <compound-statement> ::=
             '{' {<variable-declaration>} <statement-seq> '}'
         """
-        ast = Ast(AstType.COMPOUND_STATEMENT)
+        children = []
 
-        ast.add_child(self.__assert_token('{', TokenType.LEFT_BRACE))
+        children.append(self.__assert_token('{', TokenType.LEFT_BRACE))
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None:
                 raise ExpectedSymbol(self.__prev_token().ed_pos, '}')
             if token.tok_type not in TokenType.types + [TokenType.CONST]:
                 break
-            ast.add_child(self.__parse_variable_declaration())
+            children.append(self.__parse_variable_declaration())
 
-        ast.add_child(self.__parse_statement_seq())
-        ast.add_child(self.__assert_token('}', TokenType.RIGHT_BRACE))
-        return ast
+        children.append((yield self.__parse_statement_seq()))
+        children.append(self.__assert_token('}', TokenType.RIGHT_BRACE))
+        return self.build.node(AstType.COMPOUND_STATEMENT, children)
 
-    def __parse_statement_seq(self) -> Ast:
+    def __parse_statement_seq(self) -> typing.Generator:
         """
         <statement-seq> ::=
             {<statement>}
         """
-        ast = Ast(AstType.STATEMENT_SEQ)
+        children = []
 
         while True:
             token = self.__peek_token(suppress_exception=True)
@@ -534,12 +609,12 @@ class C0ASTParser(object):
                                     TokenType.SCAN,
                                     TokenType.IDENTIFIER,
                                     TokenType.SEMICOLON]:
-                ast.add_child(self.__parse_statement())
+                children.append((yield self.__parse_statement()))
             else:
                 break
-        return ast
+        return self.build.node(AstType.STATEMENT_SEQ, children)
 
-    def __parse_statement(self) -> Ast:
+    def __parse_statement(self) -> typing.Generator:
         """
         <statement> ::=
             <compound-statement>
@@ -552,23 +627,23 @@ class C0ASTParser(object):
             |<function-call>';'
             |';'
         """
-        ast = Ast(AstType.STATEMENT)
+        children = []
 
         token = self.__peek_token()
         if token.tok_type == TokenType.LEFT_BRACE:
-            ast.add_child(self.__parse_compound_statement())
+            children.append((yield self.__parse_compound_statement()))
         elif token.tok_type in [TokenType.IF, TokenType.SWITCH]:
-            ast.add_child(self.__parse_condition_statement())
+            children.append((yield self.__parse_condition_statement()))
         elif token.tok_type in [TokenType.WHILE, TokenType.DO, TokenType.FOR]:
-            ast.add_child(self.__parse_loop_statement())
+            children.append((yield self.__parse_loop_statement()))
         elif token.tok_type in [TokenType.BREAK, TokenType.CONTINUE, TokenType.RETURN]:
-            ast.add_child(self.__parse_jump_statement())
+            children.append(self.__parse_jump_statement())
         elif token.tok_type == TokenType.PRINT:
-            ast.add_child(self.__parse_print_statement())
+            children.append(self.__parse_print_statement())
         elif token.tok_type == TokenType.SCAN:
-            ast.add_child(self.__parse_scan_statement())
+            children.append(self.__parse_scan_statement())
         elif token.tok_type == TokenType.SEMICOLON:
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
         elif token.tok_type == TokenType.IDENTIFIER:
             self.__next_token()
             token = self.__next_token(suppress_exception=True)
@@ -580,53 +655,53 @@ class C0ASTParser(object):
             self.__unread_token()
             self.__unread_token()
             if token.tok_type == TokenType.ASSIGN:
-                ast.add_child(self.__parse_assignment_expression())
-                ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+                children.append(self.__parse_assignment_expression())
+                children.append(self.__assert_token(';', TokenType.SEMICOLON))
             elif token.tok_type == TokenType.LEFT_PARENTHESES:
-                ast.add_child(self.__parse_function_call())
-                ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+                children.append(self.__parse_function_call())
+                children.append(self.__assert_token(';', TokenType.SEMICOLON))
         else:
             raise InvalidStatement(token.st_pos)
-        return ast
+        return self.build.node(AstType.STATEMENT, children)
 
-    def __parse_condition_statement(self) -> Ast:
+    def __parse_condition_statement(self) -> typing.Generator:
         """
         <condition-statement> ::=
             'if' '(' <condition> ')' <statement> ['else' <statement>]
             |'switch' '(' <expression> ')' '{' {<labeled-statement>} '}'
         """
-        ast = Ast(AstType.CONDITION_STATEMENT)
+        children = []
 
         token = self.__peek_token()
         if token.tok_type == TokenType.IF:
             try:
                 # 'if' '(' <condition> ')' <statement>
-                ast.add_child(self.__assert_token('if', TokenType.IF))
-                ast.add_child(self.__assert_token(
+                children.append(self.__assert_token('if', TokenType.IF))
+                children.append(self.__assert_token(
                     '(', TokenType.LEFT_PARENTHESES))
-                ast.add_child(self.__parse_condition())
-                ast.add_child(self.__assert_token(
+                children.append(self.__parse_condition())
+                children.append(self.__assert_token(
                     ')', TokenType.RIGHT_PARENTHESES))
-                ast.add_child(self.__parse_statement())
+                children.append((yield self.__parse_statement()))
 
                 # ['else' <statement>]
                 token = self.__peek_token(suppress_exception=True)
                 if token is not None and (token.tok_type == TokenType.ELSE):
-                    ast.add_child(self.__assert_token('else', TokenType.ELSE))
-                    ast.add_child(self.__parse_statement())
+                    children.append(self.__assert_token('else', TokenType.ELSE))
+                    children.append((yield self.__parse_statement()))
             except TokenIndexOutOfRange as e:
                 print(e, file=sys.stderr)
                 raise InvalidIfStatement(self.__prev_token().ed_pos)
         elif token.tok_type == TokenType.SWITCH:
             # 'switch' '(' <expression> ')' '{' {<labeled-statement>} '}'
             try:
-                ast.add_child(self.__assert_token('switch', TokenType.SWITCH))
-                ast.add_child(self.__assert_token(
+                children.append(self.__assert_token('switch', TokenType.SWITCH))
+                children.append(self.__assert_token(
                     '(', TokenType.LEFT_PARENTHESES))
-                ast.add_child(self.__parse_expression())
-                ast.add_child(self.__assert_token(
+                children.append(self.__parse_expression())
+                children.append(self.__assert_token(
                     ')', TokenType.RIGHT_PARENTHESES))
-                ast.add_child(self.__assert_token('{', TokenType.LEFT_BRACE))
+                children.append(self.__assert_token('{', TokenType.LEFT_BRACE))
 
                 # {<labeled-statement>}
                 while True:
@@ -635,45 +710,45 @@ class C0ASTParser(object):
                         raise ExpectedSymbol(self.__prev_token().ed_pos, '}')
                     if token.tok_type not in [TokenType.CASE, TokenType.DEFAULT]:
                         break
-                    ast.add_child(self.__parse_labeled_statement())
+                    children.append((yield self.__parse_labeled_statement()))
 
-                ast.add_child(self.__assert_token('}', TokenType.RIGHT_BRACE))
+                children.append(self.__assert_token('}', TokenType.RIGHT_BRACE))
 
             except TokenIndexOutOfRange as e:
                 print(e, file=sys.stderr)
                 raise InvalidSwitchStatement(self.__prev_token().ed_pos)
         else:
             raise ExpectedSymbol(token.st_pos, 'if or switch')
-        return ast
+        return self.build.node(AstType.CONDITION_STATEMENT, children)
 
     def __parse_condition(self) -> Ast:
         """
         <condition> ::=
              <expression>[<relational-operator><expression>]
         """
-        ast = Ast(AstType.CONDITION)
+        children = []
 
         # <expression>
-        ast.add_child(self.__parse_expression())
+        children.append(self.__parse_expression())
 
         # [<relational-operator><expression>]
         token = self.__peek_token(suppress_exception=True)
         if token is not None and token.tok_type in TokenType.relations:
-            ast.add_child(self.__parse_relational_operator())
-            ast.add_child(self.__parse_expression())
-        return ast
+            children.append(self.__parse_relational_operator())
+            children.append(self.__parse_expression())
+        return self.build.node(AstType.CONDITION, children)
 
-    def __parse_labeled_statement(self) -> Ast:
+    def __parse_labeled_statement(self) -> typing.Generator:
         """
         <labeled-statement> ::=
             'case' (<integer-literal>|<char-literal>) ':' <statement>
             |'default' ':' <statement>
         """
-        ast = Ast(AstType.LABELED_STATEMENT)
+        children = []
 
         token = self.__peek_token()
         if token.tok_type == TokenType.CASE:
-            ast.add_child(self.__assert_token('case', TokenType.CASE))
+            children.append(self.__assert_token('case', TokenType.CASE))
 
             token = self.__peek_token(suppress_exception=True)
             if token is None:
@@ -683,104 +758,107 @@ class C0ASTParser(object):
                 raise ExpectedSymbol(
                     token.st_pos, 'char-literal or integer-literal')
             if token.tok_type == TokenType.INTEGER_LITERAL:
-                ast.add_child(self.__parse_integer_literal())
+                children.append(self.__parse_integer_literal())
             else:
-                ast.add_child(self.__parse_char_literal())
+                children.append(self.__parse_char_literal())
 
-            ast.add_child(self.__assert_token(':', TokenType.COLON))
-            ast.add_child(self.__parse_statement())
+            children.append(self.__assert_token(':', TokenType.COLON))
+            children.append((yield self.__parse_statement()))
         elif token.tok_type == TokenType.DEFAULT:
-            ast.add_child(self.__assert_token('default', TokenType.DEFAULT))
-            ast.add_child(self.__assert_token(':', TokenType.COLON))
-            ast.add_child(self.__parse_statement())
+            children.append(self.__assert_token('default', TokenType.DEFAULT))
+            children.append(self.__assert_token(':', TokenType.COLON))
+            children.append((yield self.__parse_statement()))
         else:
             raise ExpectedSymbol(token.st_pos, '`case` or `default`')
-        return ast
+        return self.build.node(AstType.LABELED_STATEMENT, children)
 
     def __assert_token(self, symbol: str, tok_type: TokenType) -> Ast:
+        return self.build.token(self.__expect_token(symbol, tok_type))
+
+    def __expect_token(self, symbol: str, tok_type: TokenType) -> Token:
         token = self.__next_token(suppress_exception=True)
         if token is None:
             raise ExpectedSymbol(self.__prev_token().ed_pos, symbol)
         if token.tok_type != tok_type:
             raise ExpectedSymbol(self.__prev_token().st_pos, symbol)
-        return Ast(AstType.TOKEN, token)
+        return token
 
-    def __parse_loop_statement(self) -> Ast:
+    def __parse_loop_statement(self) -> typing.Generator:
         """
         <loop-statement> ::=
             'while' '(' <condition> ')' <statement>
             |'do' <statement> 'while' '(' <condition> ')' ';'
             |'for' '('<for-init-statement> [<condition>]';' [<for-update-expression>]')' <statement>
         """
-        ast = Ast(AstType.LOOP_STATEMENT)
+        children = []
 
         token = self.__peek_token()
         if token.tok_type == TokenType.WHILE:
             # 'while' '(' <condition> ')' <statement>
-            ast.add_child(self.__assert_token('while', TokenType.WHILE))
-            ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-            ast.add_child(self.__parse_condition())
-            ast.add_child(self.__assert_token(')',
+            children.append(self.__assert_token('while', TokenType.WHILE))
+            children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+            children.append(self.__parse_condition())
+            children.append(self.__assert_token(')',
                                               TokenType.RIGHT_PARENTHESES))
-            ast.add_child(self.__parse_statement())
+            children.append((yield self.__parse_statement()))
         elif token.tok_type == TokenType.DO:
             # 'do' <statement> 'while' '(' <condition> ')' ';'
-            ast.add_child(self.__assert_token('do', TokenType.DO))
-            ast.add_child(self.__parse_statement())
-            ast.add_child(self.__assert_token('while', TokenType.WHILE))
-            ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-            ast.add_child(self.__parse_condition())
-            ast.add_child(self.__assert_token(')',
+            children.append(self.__assert_token('do', TokenType.DO))
+            children.append((yield self.__parse_statement()))
+            children.append(self.__assert_token('while', TokenType.WHILE))
+            children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+            children.append(self.__parse_condition())
+            children.append(self.__assert_token(')',
                                               TokenType.RIGHT_PARENTHESES))
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
         elif token.tok_type == TokenType.FOR:
             # 'for' '('<for-init-statement> [<condition>]';' [<for-update-expression>]')' <statement>
-            ast.add_child(self.__assert_token('for', TokenType.FOR))
-            ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-            ast.add_child(self.__parse_for_init_statement())
+            children.append(self.__assert_token('for', TokenType.FOR))
+            children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+            children.append(self.__parse_for_init_statement())
 
             # [<condition>] ';'
             token = self.__peek_token(suppress_exception=True)
             if token is None:
                 raise ExpectedSymbol(self.__prev_token().ed_pos, ';')
             if token.tok_type != TokenType.SEMICOLON:
-                ast.add_child(self.__parse_condition())
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+                children.append(self.__parse_condition())
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
 
             # [<for-update-expression>]')' <statement>
             token = self.__peek_token(suppress_exception=True)
             if token is None:
                 raise ExpectedSymbol(self.__prev_token().ed_pos, ')')
             if token.tok_type != TokenType.RIGHT_PARENTHESES:
-                ast.add_child(self.__parse_for_update_expression())
-            ast.add_child(self.__assert_token(')',
+                children.append(self.__parse_for_update_expression())
+            children.append(self.__assert_token(')',
                                               TokenType.RIGHT_PARENTHESES))
-            ast.add_child(self.__parse_statement())
+            children.append((yield self.__parse_statement()))
 
-        return ast
+        return self.build.node(AstType.LOOP_STATEMENT, children)
 
     def __parse_for_init_statement(self) -> Ast:
         """
         <for-init-statement> ::=
             [<assignment-expression>{','<assignment-expression>}]';'
         """
-        ast = Ast(AstType.FOR_INIT_STATEMENT)
+        children = []
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
             raise ExpectedSymbol(self.__prev_token().ed_pos, ';')
 
         if token.tok_type != TokenType.SEMICOLON:
-            ast.add_child(self.__parse_assignment_expression())
+            children.append(self.__parse_assignment_expression())
             while True:
                 token = self.__peek_token(suppress_exception=True)
                 if token is None or token.tok_type != TokenType.COMMA:
                     break
-                ast.add_child(self.__assert_token(',', TokenType.COMMA))
-                ast.add_child(self.__parse_assignment_expression())
+                children.append(self.__assert_token(',', TokenType.COMMA))
+                children.append(self.__parse_assignment_expression())
 
-        ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
-        return ast
+        children.append(self.__assert_token(';', TokenType.SEMICOLON))
+        return self.build.node(AstType.FOR_INIT_STATEMENT, children)
 
     def __parse_assignment_expression_or_function_call(self) -> Ast:
         self.__assert_token('identifier', TokenType.IDENTIFIER)
@@ -800,17 +878,17 @@ class C0ASTParser(object):
         <for-update-expression> ::=
             (<assignment-expression>|<function-call>){','(<assignment-expression>|<function-call>)}
         """
-        ast = Ast(AstType.FOR_UPDATE_STATEMENT)
+        children = []
 
-        ast.add_child(self.__parse_assignment_expression_or_function_call())
+        children.append(self.__parse_assignment_expression_or_function_call())
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None or token.tok_type != TokenType.COMMA:
                 break
-            ast.add_child(self.__assert_token(',', TokenType.COMMA))
-            ast.add_child(
+            children.append(self.__assert_token(',', TokenType.COMMA))
+            children.append(
                 self.__parse_assignment_expression_or_function_call())
-        return ast
+        return self.build.node(AstType.FOR_UPDATE_STATEMENT, children)
 
     def __parse_jump_statement(self) -> Ast:
         """
@@ -819,106 +897,106 @@ class C0ASTParser(object):
             |'continue' ';'
             |<return-statement>
         """
-        ast = Ast(AstType.JUMP_STATEMENT)
+        children = []
 
         token = self.__peek_token()
         if token.tok_type == TokenType.BREAK:
-            ast.add_child(self.__assert_token('break', TokenType.BREAK))
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+            children.append(self.__assert_token('break', TokenType.BREAK))
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
         elif token.tok_type == TokenType.CONTINUE:
-            ast.add_child(self.__assert_token('continue', TokenType.CONTINUE))
-            ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+            children.append(self.__assert_token('continue', TokenType.CONTINUE))
+            children.append(self.__assert_token(';', TokenType.SEMICOLON))
         else:
-            ast.add_child(self.__parse_return_statement())
+            children.append(self.__parse_return_statement())
 
-        return ast
+        return self.build.node(AstType.JUMP_STATEMENT, children)
 
     def __parse_return_statement(self) -> Ast:
         """
         <return-statement> ::= 'return' [<expression>] ';'
         """
-        ast = Ast(AstType.RETURN_STATEMENT)
+        children = []
 
-        ast.add_child(self.__assert_token('return', TokenType.RETURN))
+        children.append(self.__assert_token('return', TokenType.RETURN))
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
             raise ExpectedSymbol(self.__prev_token().ed_pos, ';')
 
         if token.tok_type != TokenType.SEMICOLON:
-            ast.add_child(self.__parse_expression())
-        ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
-        return ast
+            children.append(self.__parse_expression())
+        children.append(self.__assert_token(';', TokenType.SEMICOLON))
+        return self.build.node(AstType.RETURN_STATEMENT, children)
 
     def __parse_scan_statement(self) -> Ast:
         """
         <scan-statement> ::=
             'scan' '(' <identifier> ')' ';'
         """
-        ast = Ast(AstType.SCAN_STATEMENT)
+        children = []
 
-        ast.add_child(self.__assert_token('scan', TokenType.SCAN))
-        ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
-        ast.add_child(self.__parse_identifier())
-        ast.add_child(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
-        ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+        children.append(self.__assert_token('scan', TokenType.SCAN))
+        children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+        children.append(self.__parse_identifier())
+        children.append(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
+        children.append(self.__assert_token(';', TokenType.SEMICOLON))
 
-        return ast
+        return self.build.node(AstType.SCAN_STATEMENT, children)
 
     def __parse_assignment_expression(self) -> Ast:
         """
         <assignment-expression> ::=
             <identifier><assignment-operator><expression>
         """
-        ast = Ast(AstType.ASSIGNMENT_EXPRESSION)
-        ast.add_child(self.__parse_identifier())
-        ast.add_child(self.__parse_assignment_operator())
-        ast.add_child(self.__parse_expression())
-        return ast
+        children = []
+        children.append(self.__parse_identifier())
+        children.append(self.__parse_assignment_operator())
+        children.append(self.__parse_expression())
+        return self.build.node(AstType.ASSIGNMENT_EXPRESSION, children)
 
     def __parse_print_statement(self) -> Ast:
         """
         <print-statement> ::=
             'print' '(' [<printable-list>] ')' ';'
         """
-        ast = Ast(AstType.PRINT_STATEMENT)
+        children = []
 
-        ast.add_child(self.__assert_token('print', TokenType.PRINT))
-        ast.add_child(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
+        children.append(self.__assert_token('print', TokenType.PRINT))
+        children.append(self.__assert_token('(', TokenType.LEFT_PARENTHESES))
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
             raise ExpectedSymbol(self.__prev_token().ed_pos, ')')
         if token.tok_type != TokenType.RIGHT_PARENTHESES:
-            ast.add_child(self.__parse_printable_list())
+            children.append(self.__parse_printable_list())
 
-        ast.add_child(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
-        ast.add_child(self.__assert_token(';', TokenType.SEMICOLON))
+        children.append(self.__assert_token(')', TokenType.RIGHT_PARENTHESES))
+        children.append(self.__assert_token(';', TokenType.SEMICOLON))
 
-        return ast
+        return self.build.node(AstType.PRINT_STATEMENT, children)
 
     def __parse_printable_list(self) -> Ast:
         """
         <printable-list>  ::=
             <printable> {',' <printable>}
         """
-        ast = Ast(AstType.PRINTABLE_LIST)
+        children = []
 
-        ast.add_child(self.__parse_printable())
+        children.append(self.__parse_printable())
         while True:
             token = self.__peek_token(suppress_exception=True)
             if token is None or token.tok_type != TokenType.COMMA:
                 break
-            ast.add_child(self.__assert_token(',', TokenType.COMMA))
-            ast.add_child(self.__parse_printable())
-        return ast
+            children.append(self.__assert_token(',', TokenType.COMMA))
+            children.append(self.__parse_printable())
+        return self.build.node(AstType.PRINTABLE_LIST, children)
 
     def __parse_printable(self) -> Ast:
         """
         <printable> ::=
             <expression> | <string-literal>
         """
-        ast = Ast(AstType.PRINTABLE)
+        children = []
 
         token = self.__peek_token(suppress_exception=True)
         if token is None:
@@ -926,22 +1004,18 @@ class C0ASTParser(object):
                                  'string-literal or identifier')
 
         if token.tok_type == TokenType.STR_LITERAL:
-            ast.add_child(self.__parse_str_literal())
+            children.append(self.__parse_str_literal())
         else:
-            ast.add_child(self.__parse_expression())
-        return ast
-
-    def __eof(self):
-        return self.tok_idx == len(self.tokens) - 1
+            children.append(self.__parse_expression())
+        return self.build.node(AstType.PRINTABLE, children)
 
     def __next_token(self, suppress_exception: bool = False) -> typing.Union[Token, None]:
         token = self.__peek_token(suppress_exception=suppress_exception)
         self.tok_idx += 1
-        debug(f'[next token] {token}')
         return token
 
     def __peek_token(self, suppress_exception: bool = False) -> typing.Union[Token, None]:
-        if self.tok_idx == len(self.tokens):
+        if not self.tokens.available(self.tok_idx):
             if suppress_exception:
                 return None
             else:
@@ -952,17 +1026,10 @@ class C0ASTParser(object):
         if self.tok_idx == 0:
             raise TokenIndexOutOfRange('Cannot unread token beyond 0')
         self.tok_idx -= 1
-        debug(f'[unread token] {self.tokens[self.tok_idx]}')
 
     def __current_pos(self) -> tuple:
         return self.tokens[self.tok_idx].st_pos
 
-    def __rollback_idx(self, idx: int):
-        if idx < 0 or idx >= len(self.tokens):
-            raise TokenIndexOutOfRange(
-                f'Cannot rollback to token index {idx}, which is out of range')
-        self.tok_idx = idx
-
     def __prev_token(self) -> Token:
         if self.tok_idx <= 1:
             raise TokenIndexOutOfRange(
@@ -0,0 +1,109 @@
+import sys
+import time
+import typing
+from tokenizer import Token
+
+
+class ParserTrace(object):
+    """
+    Hooks `C0ASTParser` calls when given one as `trace`: on entering and
+    leaving every `__parse_<rule>` method, with `rule` its name, and on
+    every token read or unread. They all do nothing here, subclasses pick
+    what they need.
+
+    A parser without a trace calls no hook at all, the traced methods are
+    only installed on the instance of a traced parser
+    """
+
+    def enter(self, rule: str):
+        pass
+
+    def exit(self, rule: str):
+        pass
+
+    def next_token(self, token: typing.Union[Token, None]):
+        pass
+
+    def unread_token(self, token: Token):
+        pass
+
+
+class TokenPrinter(ParserTrace):
+    """
+    Print every token read and unread
+    """
+
+    def __init__(self, file=sys.stdout):
+        self.file = file
+
+    def next_token(self, token: typing.Union[Token, None]):
+        print(f'[next token] {token}', file=self.file)
+
+    def unread_token(self, token: Token):
+        print(f'[unread token] {token}', file=self.file)
+
+
+class RuleCounters(object):
+    """
+    Calls of a rule, seconds spent in it but in the rules it calls, and
+    tokens unread in it, which is how the parser backtracks
+    """
+    __slots__ = ('calls', 'seconds', 'unread')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.unread = 0
+
+
+class ParserCounters(ParserTrace):
+    def __init__(self):
+        """
+        Count the tokens read and unread by a parser, and the calls, time
+        and unread tokens of every rule, over all the parsers traced with
+        it. `report` formats them
+        """
+        self.tokens = 0
+        self.unread = 0
+        self.rules: typing.Dict[str, RuleCounters] = {}
+        # [rule, start, seconds of the rules it called] of the rules entered
+        self.stack: typing.List[list] = []
+
+    def enter(self, rule: str):
+        self.stack.append([rule, time.perf_counter(), 0.0])
+
+    def exit(self, rule: str):
+        _, st, callees = self.stack.pop()
+        seconds = time.perf_counter() - st
+        counters = self.rules.get(rule)
+        if counters is None:
+            counters = self.rules[rule] = RuleCounters()
+        counters.calls += 1
+        counters.seconds += seconds - callees
+        if self.stack:
+            self.stack[-1][2] += seconds
+
+    def next_token(self, token: typing.Union[Token, None]):
+        self.tokens += 1
+
+    def unread_token(self, token: Token):
+        self.unread += 1
+        if self.stack:
+            rule = self.stack[-1][0]
+            counters = self.rules.get(rule)
+            if counters is None:
+                counters = self.rules[rule] = RuleCounters()
+            counters.unread += 1
+
+    def report(self) -> str:
+        """
+        Table of the rules, the slowest first
+        """
+        lines = [f'tokens read {self.tokens}, unread {self.unread}',
+                 f'{"rule":<40}{"calls":>10}{"self ms":>12}{"unread":>10}']
+        for rule, counters in sorted(self.rules.items(),
+                                     key=lambda item: -item[1].seconds):
+            lines.append(f'{rule:<40}{counters.calls:>10}'
+                         f'{counters.seconds * 1000:>12.3f}'
+                         f'{counters.unread:>10}')
+        return '\n'.join(lines)
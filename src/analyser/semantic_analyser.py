@@ -1,29 +1,56 @@
 from analyser.parser import C0ASTParser, AstType
-from analyser.ast import Ast
+from analyser.ast import (Ast, expression_kinds, Expression,
+                          BinaryOp, Unary, Cast, Literal, Var, Call)
+from analyser.arena import ArenaNode
+from analyser.parallel_parser import parse_parallel
+from analyser.parser_trace import ParserTrace
+from analyser.trampoline import trampoline
+from analyser.visitor import Visitor, visits
 from analyser.symbol_table import SymbolTable, SymbolAttrs
-from tokenizer import Token, TokenType
+from tokenizer import NameTable, Token, TokenBuffer, TokenType
 from elf.pcode import PCode
 from elf.elf import ELF, Constant
 from exception.analyser_exceptions import *
-from typing import List, Tuple, Any
-
-
-def assert_ast_type(ast: Ast, assertion_type: str):
-    if ast.type != assertion_type:
-        ast.draw()
-        assert False, f'Expected ast of type {assertion_type}, but received {ast.type}'
-
-
-def get_pos(ast: Ast):
-    if ast.token is not None:
-        return ast.token.st_pos
-    return get_pos(ast.first_child())
-
-
-class Analyser(object):
-    def __init__(self, tokens: List[Token]):
-        self.c0_ast = C0ASTParser(tokens).parse()
-        self.symbol_table = SymbolTable()
+from typing import Generator, Iterable, List, Tuple, Any, Union
+
+
+def get_pos(ast: Union[Ast, Expression, ArenaNode, Token]) -> tuple:
+    """
+    (row, col) of the first token of a node, or of a token. Nodes keep
+    their first token, so it is only computed when an error is reported
+    """
+    return ast.st_pos
+
+
+class Analyser(Visitor):
+    def __init__(self, tokens: Iterable[Token], names: NameTable,
+                 builder=None, workers: int = 1, debug: bool = False,
+                 trace: ParserTrace = None):
+        """
+        tokens: the program, None for an analyser only compiling the
+            functions passed to `generate_functions`
+        names: the table of the tokenizer of `tokens`, symbols are looked
+            up by the name ids of the tokens, which are ids in it
+        builder: what the parser builds nodes with, see `C0ASTParser`
+        workers: processes functions are parsed in by `parse_parallel`,
+            into an `AstArena` whatever `builder` is, None for all CPUs
+        debug: check the kind of every node analysed, see `Visitor`
+        trace: hooks the parser calls, see `ParserTrace`, only with one
+            worker
+        """
+        super().__init__(debug)
+        if isinstance(tokens, TokenBuffer) and tokens.names is not names:
+            raise ValueError('names must be the table of the tokens')
+        if trace is not None and workers != 1:
+            raise ValueError('cannot trace the parsers of several workers')
+        if tokens is None:
+            self.c0_ast = None
+        elif workers == 1:
+            self.c0_ast = C0ASTParser(tokens, builder, trace=trace).parse()
+        else:
+            self.c0_ast = parse_parallel(tokens, workers)
+        self.names = names
+        self.symbol_table = SymbolTable(self.names)
         self.elf = ELF()
         self.generated = False
 
@@ -33,6 +60,19 @@ class Analyser(object):
             self.generated = True
         return self.elf
 
+    def generate_functions(self, functions: Iterable[Ast],
+                           symbol_table: SymbolTable, elf: ELF) -> ELF:
+        """
+        Compile the function definitions `functions` as if they followed
+        the functions of `elf` in a program whose global scope is
+        `symbol_table`, both are updated
+        """
+        self.symbol_table = symbol_table
+        self.elf = elf
+        for function in functions:
+            self.__analyse_function_definition(function)
+        return elf
+
     def add_inst(self, inst_type: str, *ops, at_idx: int = None):
         instructions = self.elf.current_instructions()
         if at_idx is None:
@@ -43,31 +83,27 @@ class Analyser(object):
     def __generate(self):
         self.__analyse_c0(self.c0_ast)
 
+    @visits(AstType.C0)
     def __analyse_c0(self, ast: Ast):
         """
         <C0-program> ::=
             {<variable-declaration>}{<function-definition>}
         """
-        assert_ast_type(ast, AstType.C0)
-
         self.symbol_table.enter_level()
         for child in ast.children:
-            if child.type == AstType.VARIABLE_DECLARATION:
-                self.__analyse_variable_declaration(child)
-            else:
-                self.__analyse_function_definition(child)
+            self.visit(child)
 
-        if 'main' not in self.symbol_table or not self.symbol_table.is_function('main'):
+        main_id = self.names.intern('main')
+        if main_id not in self.symbol_table or not self.symbol_table.is_function(main_id):
             raise MissingMain(get_pos(ast))
 
+    @visits(AstType.VARIABLE_DECLARATION)
     def __analyse_variable_declaration(self, ast: Ast):
         """
         <variable-declaration> ::=
             [<const-qualifier>]<type-specifier><init-declarator-list>';'
         """
-        assert_ast_type(ast, AstType.VARIABLE_DECLARATION)
-
-        constness = (ast.first_child().type == AstType.CONST_QUALIFIER)
+        constness = (ast.first_child().kind == AstType.CONST_QUALIFIER)
         idx = 1 if constness else 0
         type_ = self.__analyse_type_specifier(ast.children[idx])
         if type_ == TokenType.VOID:
@@ -79,31 +115,30 @@ class Analyser(object):
         }
         self.__analyse_init_declarator_list(ast.children[-2], type_info)
 
+    @visits(AstType.FUNCTION_DEFINITION)
     def __analyse_function_definition(self, ast: Ast):
         """
         <function-definition> ::=
             <type-specifier><identifier><parameter-clause><compound-statement>
         """
-        assert_ast_type(ast, AstType.FUNCTION_DEFINITION)
-
         return_type = self.__analyse_type_specifier(ast.first_child())
-        func_name = self.__analyse_identifier(ast.children[1])
-        idx = self.elf.add_constant(Constant.STR, func_name)
+        name_id = self.__analyse_identifier(ast.children[1])
+        idx = self.elf.add_constant(Constant.STR, self.names.name(name_id))
 
-        if func_name in self.symbol_table.current_level():
-            raise DuplicateSymbol(get_pos(ast.children[1]), func_name)
-        self.symbol_table.add_symbol(func_name, {SymbolAttrs.IS_FUNC: True})
+        if name_id in self.symbol_table.current_level():
+            raise DuplicateSymbol(get_pos(ast.children[1]), self.names.name(name_id))
+        self.symbol_table.add_symbol(name_id, {SymbolAttrs.IS_FUNC: True})
 
         # put parameters and function body in a same new scope
         self.symbol_table.enter_level(new_stack=True)
 
         # [type_of_param_0, ..., type_of_param_k]
         params_info = self.__analyse_parameter_clause(ast.children[2])
-        self.elf.add_function(return_type, func_name, idx, params_info)
+        self.elf.add_function(return_type, self.names.name(name_id), name_id, idx, params_info)
 
         # {'return': count_of_return_statement, ..., 'if': count_of_if_statement}
-        statements_info = self.__analyse_compound_statement(
-            ast.children[3], enter_level=False)
+        statements_info = trampoline(self.__analyse_compound_statement(
+            ast.children[3], enter_level=False))
 
         if 'return' not in statements_info and return_type != TokenType.VOID:
             # print(statements_info)
@@ -121,51 +156,50 @@ class Analyser(object):
             self.add_inst(PCode.IPUSH, 0)
             self.add_inst(PCode.IRET)
 
+    @visits(AstType.TYPE_SPECIFIER)
     def __analyse_type_specifier(self, ast: Ast) -> str:
         """
         <type-specifier>         ::= <simple-type-specifier>
         Return `TokenType` of corresponding type
         """
-        assert_ast_type(ast, AstType.TYPE_SPECIFIER)
         return self.__analyse_simple_type_specifier(ast.first_child())
 
     @staticmethod
+    @visits(AstType.SIMPLE_TYPE_SPECIFIER)
     def __analyse_simple_type_specifier(ast: Ast):
         """
         <simple-type-specifier>  ::= 'void'|'int'|'char'|'double'
         """
-        assert_ast_type(ast, AstType.SIMPLE_TYPE_SPECIFIER)
-
         type_ = ast.first_child().token.tok_type
         assert type_ in TokenType.types, 'Type error, it should be detected before analysing'
         return type_
 
+    @visits(AstType.INIT_DECLARATOR_LIST)
     def __analyse_init_declarator_list(self, ast: Ast, type_info: dict):
         """
         <init-declarator-list> ::=
             <init-declarator>{','<init-declarator>}
         """
-        assert_ast_type(ast, AstType.INIT_DECLARATOR_LIST)
-
         for child in ast.children:
-            if child.type == AstType.INIT_DECLARATOR:
+            if child.kind == AstType.INIT_DECLARATOR:
                 self.__analyse_init_declarator(child, type_info)
 
-    def convert_from_type_to_type(self, to_type: str, from_type: str, to_pos: tuple, from_pos: tuple,
+    def convert_from_type_to_type(self, to_type: str, from_type: str, to_node, from_node,
                                   at_idx: int = None):
         """
         Convert value at the top of stack from `from_type` to `to_type`.
-        Also help to check whether the types involved are supported.
+        Also help to check whether the types involved are supported, errors
+        are reported at the node or token `to_node` or `from_node`.
         """
         if from_type == TokenType.VOID:
-            raise VoidTypeCalculationNotSupported(from_pos)
+            raise VoidTypeCalculationNotSupported(get_pos(from_node))
         elif from_type not in TokenType.types:
-            raise UnknownVariableType(to_pos, to_type)
+            raise UnknownVariableType(get_pos(to_node), to_type)
 
         if to_type == TokenType.VOID:
-            raise VoidTypeCalculationNotSupported(to_pos)
+            raise VoidTypeCalculationNotSupported(get_pos(to_node))
         elif to_type not in TokenType.types:
-            raise UnknownVariableType(to_pos, to_type)
+            raise UnknownVariableType(get_pos(to_node), to_type)
 
         if from_type == to_type:
             return
@@ -197,22 +231,20 @@ class Analyser(object):
                     self.add_inst(PCode.D2I)
                     self.add_inst(PCode.I2C)
 
+    @visits(AstType.INIT_DECLARATOR)
     def __analyse_init_declarator(self, ast: Ast, type_info: dict):
         """
         <init-declarator> ::=
             <identifier>[<initializer>]
         """
-        assert_ast_type(ast, AstType.INIT_DECLARATOR)
-
-        symbol_name = self.__analyse_identifier(ast.first_child())
-        if symbol_name in self.symbol_table.current_level():
-            raise DuplicateSymbol(get_pos(ast.first_child()), symbol_name)
-        self.symbol_table.add_symbol(symbol_name, type_info.copy())
+        name_id = self.__analyse_identifier(ast.first_child())
+        if name_id in self.symbol_table.current_level():
+            raise DuplicateSymbol(get_pos(ast.first_child()), self.names.name(name_id))
+        self.symbol_table.add_symbol(name_id, type_info.copy())
 
-        symbol_type = self.symbol_table.get_type(symbol_name)
-        symbol_size = self.symbol_table.get_size(symbol_name)
-        symbol_offset = self.symbol_table.get_offset(symbol_name)
-        symbol_pos = get_pos(ast.first_child())
+        symbol_type = self.symbol_table.get_type(name_id)
+        symbol_size = self.symbol_table.get_size(name_id)
+        symbol_offset = self.symbol_table.get_offset(name_id)
 
         # allocate space on stack for variable
         self.add_inst(PCode.SNEW, symbol_size)
@@ -229,8 +261,8 @@ class Analyser(object):
             if type_ != symbol_type:
                 self.convert_from_type_to_type(to_type=symbol_type,
                                                from_type=type_,
-                                               to_pos=symbol_pos,
-                                               from_pos=get_pos(ast.children[1]))
+                                               to_node=ast.first_child(),
+                                               from_node=ast.children[1])
             # store (new) value
             if symbol_type in [TokenType.INT, TokenType.CHAR]:
                 self.add_inst(PCode.ISTORE)
@@ -239,6 +271,7 @@ class Analyser(object):
             else:
                 raise UnknownVariableType(get_pos(ast.children[1]), type_)
 
+    @visits(AstType.INITIALIZER)
     def __analyse_initializer(self, ast: Ast) -> Tuple[str, Any]:
         """
         <initializer> ::=
@@ -248,15 +281,13 @@ class Analyser(object):
                 value can be None if not accessible at compiling time
                 value_type is not VOID
         """
-        assert_ast_type(ast, AstType.INITIALIZER)
-
         expr = ast.children[1]
-        type_, value = self.__analyse_expression(expr)
+        type_, value = trampoline(self.__analyse_expression(expr))
         if type_ == TokenType.VOID:
             raise VoidTypeCalculationNotSupported(get_pos(expr))
         return type_, value
 
-    def __analyse_expression(self, ast: Ast) -> Tuple[str, Any]:
+    def __analyse_expression(self, ast: Expression) -> Tuple[str, Any]:
         """
         <expression> ::=
             <additive-expression>
@@ -264,248 +295,154 @@ class Analyser(object):
         Return: pair of (value_type, value)
                 value can be None if not accessible at compiling time,
                 value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable,
+                `CHAR` iff expression is consisted of single char-literal or char-variable or casted,
                 `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
+        The analysers of nested expressions are generators, the pair is
+        then the result of `trampoline` on the returned one. The analyser
+        is the handler of the kind of `ast` in `dispatch`
         """
-        assert_ast_type(ast, AstType.EXPRESSION)
-
-        add_expr = ast.first_child()
-        expr_type, _ = self.__analyse_additive_expression(add_expr)
-        return expr_type, None
+        return self.dispatch[ast.kind](self, ast)
 
-    def __analyse_additive_expression(self, ast: Ast) -> Tuple[str, Any]:
+    @visits(AstType.BINARY_OP)
+    def __analyse_binary_op(self, ast: BinaryOp) -> Generator:
         """
-        <additive-expression> ::=
-            <multiplicative-expression>{<additive-operator><multiplicative-expression>}
-        After return, if value_type is not `VOID` left the value be on the top of current stack
-        Return: pair of (value_type, value)
-                value can be None if not accessible at compiling time,
-                value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable,
-                `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
+        <left> ('+'|'-'|'*'|'/') <right>
+        `char` operands are promoted to `int`, `int` operands to `double`
+        if the other one is `double`
         """
-        assert_ast_type(ast, AstType.ADDITIVE_EXPRESSION)
-
-        mul_expr = ast.first_child()
-        l_type, _ = self.__analyse_multiplicative_expression(mul_expr)
+        l_type, _ = yield self.__analyse_expression(ast.left)
         instruction_idx = self.elf.next_inst_idx()
-
-        for op, mul_expr in zip(ast.children[1::2], ast.children[2::2]):
-            op = self.__analyse_additive_operator(op)
-            r_type, _ = self.__analyse_multiplicative_expression(mul_expr)
-
-            if l_type == TokenType.VOID or r_type == TokenType.VOID:
-                raise VoidTypeCalculationNotSupported(get_pos(mul_expr))
-            if l_type == TokenType.CHAR:
-                l_type = TokenType.INT
-            if r_type == TokenType.CHAR:
-                r_type = TokenType.INT
-
-            # make l_type and r_type fit
-            if l_type != r_type:
-                # `int` op `double`
-                if l_type == TokenType.INT:
-                    l_type = TokenType.DOUBLE
-                    self.add_inst(PCode.I2D, at_idx=instruction_idx)
-                # `double` op `int`
-                elif l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.I2D)
-
-            # decide inst based on `op` and `l_type`
-            if op == TokenType.ADD:
-                if l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.DADD)
-                else:
-                    self.add_inst(PCode.IADD)
+        r_type, _ = yield self.__analyse_expression(ast.right)
+
+        if l_type == TokenType.VOID or r_type == TokenType.VOID:
+            raise VoidTypeCalculationNotSupported(get_pos(ast.right))
+        if l_type == TokenType.CHAR:
+            l_type = TokenType.INT
+        if r_type == TokenType.CHAR:
+            r_type = TokenType.INT
+
+        # make l_type and r_type fit
+        if l_type != r_type:
+            # `int` op `double`
+            if l_type == TokenType.INT:
+                l_type = TokenType.DOUBLE
+                self.add_inst(PCode.I2D, at_idx=instruction_idx)
+            # `double` op `int`
+            elif l_type == TokenType.DOUBLE:
+                self.add_inst(PCode.I2D)
+
+        # decide inst based on `op` and `l_type`
+        op = ast.op.tok_type
+        if op == TokenType.ADD:
+            if l_type == TokenType.DOUBLE:
+                self.add_inst(PCode.DADD)
             else:
-                if l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.DSUB)
-                else:
-                    self.add_inst(PCode.ISUB)
-            instruction_idx = self.elf.next_inst_idx()
-
-        return l_type, None
-
-    def __analyse_multiplicative_expression(self, ast: Ast) -> Tuple[str, Any]:
-        """
-        <multiplicative-expression> ::=
-            <cast-expression>{<multiplicative-operator><cast-expression>}
-        After return, if value_type is not `VOID` left the value be on the top of current stack
-        Return: pair of (value_type, value)
-                value can be None if not accessible at compiling time,
-                value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable or casted,
-                `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
-        """
-        assert_ast_type(ast, AstType.MULTIPLICATIVE_EXPRESSION)
-
-        cast_expr = ast.first_child()
-        l_type, _ = self.__analyse_cast_expression(cast_expr)
-        instruction_idx = self.elf.next_inst_idx()
-
-        for op, cast_expr in zip(ast.children[1::2], ast.children[2::2]):
-            op = self.__analyse_multiplicative_operator(op)
-            r_type, _ = self.__analyse_cast_expression(cast_expr)
-
-            if l_type == TokenType.VOID or r_type == TokenType.VOID:
-                raise VoidTypeCalculationNotSupported(get_pos(cast_expr))
-            if l_type == TokenType.CHAR:
-                l_type = TokenType.INT
-            if r_type == TokenType.CHAR:
-                r_type = TokenType.INT
-
-            # make l_type and r_type fit
-            if l_type != r_type:
-                # `int` op `double`
-                if l_type == TokenType.INT:
-                    l_type = TokenType.DOUBLE
-                    self.add_inst(PCode.I2D, at_idx=instruction_idx)
-                # `double` op `int`
-                elif l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.I2D)
-
-            # decide inst based on `op` and `l_type`
-            if op == TokenType.MUL:
-                if l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.DMUL)
-                else:
-                    self.add_inst(PCode.IMUL)
+                self.add_inst(PCode.IADD)
+        elif op == TokenType.SUB:
+            if l_type == TokenType.DOUBLE:
+                self.add_inst(PCode.DSUB)
             else:
-                if l_type == TokenType.DOUBLE:
-                    self.add_inst(PCode.DDIV)
-                else:
-                    self.add_inst(PCode.IDIV)
-            instruction_idx = self.elf.next_inst_idx()
-
+                self.add_inst(PCode.ISUB)
+        elif op == TokenType.MUL:
+            if l_type == TokenType.DOUBLE:
+                self.add_inst(PCode.DMUL)
+            else:
+                self.add_inst(PCode.IMUL)
+        else:
+            assert op == TokenType.DIV
+            if l_type == TokenType.DOUBLE:
+                self.add_inst(PCode.DDIV)
+            else:
+                self.add_inst(PCode.IDIV)
         return l_type, None
 
-    def __analyse_cast_expression(self, ast: Ast) -> Tuple[str, Any]:
+    @visits(AstType.CAST)
+    def __analyse_cast(self, ast: Cast) -> Generator:
         """
         <cast-expression> ::=
             {'('<type-specifier>')'}<unary-expression>
-        After return, if value_type is not `VOID` left the value be on the top of current stack
-        Return: pair of (value_type, value)
-                value can be None if not accessible at compiling time,
-                value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable or casted,
-                `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
         """
-        assert_ast_type(ast, AstType.CAST_EXPRESSION)
+        from_type, _ = yield self.__analyse_expression(ast.operand)
+        from_node = ast.operand
 
-        unary_expr = ast.children[-1]
-        from_type, _ = self.__analyse_unary_expression(unary_expr)
-        from_pos = get_pos(unary_expr)
-
-        types = [x for x in ast.children if x.type == AstType.TYPE_SPECIFIER]
-        types.reverse()
-
-        for type_specifier in types:
-            to_pos = get_pos(type_specifier)
-            to_type = self.__analyse_type_specifier(type_specifier)
+        for type_token in reversed(ast.types):
+            to_type = type_token.tok_type
             self.convert_from_type_to_type(to_type=to_type,
                                            from_type=from_type,
-                                           to_pos=to_pos,
-                                           from_pos=from_pos)
-            from_pos = to_pos
+                                           to_node=type_token,
+                                           from_node=from_node)
+            from_node = type_token
             from_type = to_type
 
         return from_type, None
 
-    def __analyse_unary_expression(self, ast: Ast) -> Tuple[str, Any]:
+    @visits(AstType.UNARY)
+    def __analyse_unary(self, ast: Unary) -> Generator:
         """
         <unary-expression> ::=
             [<unary-operator>]<primary-expression>
-        After return, if value_type is not `VOID` left the value be on the top of current stack
-        Return: pair of (value_type, value)
-                value can be None if not accessible at compiling time,
-                value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable,
-                `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
         """
-        assert_ast_type(ast, AstType.UNARY_EXPRESSION)
-
-        primary_expr = ast.children[-1]
-        type_, _ = self.__analyse_primary_expression(primary_expr)
+        type_, _ = yield self.__analyse_expression(ast.operand)
 
-        if len(ast.children) == 2:
-            if type_ == TokenType.VOID:
-                raise VoidTypeCalculationNotSupported(get_pos(primary_expr))
+        if type_ == TokenType.VOID:
+            raise VoidTypeCalculationNotSupported(get_pos(ast.operand))
 
-            # `char` must be converted to `int` before any calculation
-            if type_ == TokenType.CHAR:
-                type_ = TokenType.INT
+        # `char` must be converted to `int` before any calculation
+        if type_ == TokenType.CHAR:
+            type_ = TokenType.INT
 
-            op = self.__analyse_unary_operator(ast.first_child())
-            if op == TokenType.SUB:
-                if type_ == TokenType.DOUBLE:
-                    self.add_inst(PCode.DNEG)
-                else:
-                    # INT or CHAR
-                    self.add_inst(PCode.INEG)
+        op = ast.op.tok_type
+        if op == TokenType.SUB:
+            if type_ == TokenType.DOUBLE:
+                self.add_inst(PCode.DNEG)
             else:
-                assert op == TokenType.ADD
+                # INT or CHAR
+                self.add_inst(PCode.INEG)
+        else:
+            assert op == TokenType.ADD
         return type_, None
 
-    def __analyse_primary_expression(self, ast: Ast) -> Tuple[str, Any]:
+    @visits(AstType.VAR)
+    def __analyse_var(self, ast: Var) -> Tuple[str, Any]:
+        name_id = ast.token.name_id
+        if name_id not in self.symbol_table:
+            raise UndefinedSymbol(ast.token.st_pos, self.names.name(name_id))
+        if self.symbol_table.is_function(name_id):
+            raise FunctionTypeCalculationNotSupported(
+                ast.token.st_pos, self.names.name(name_id))
+        symbol_offset = self.symbol_table.get_offset(name_id)
+        symbol_type = self.symbol_table.get_type(name_id)
+        self.add_inst(PCode.LOADA, *symbol_offset)
+        if symbol_type in [TokenType.INT, TokenType.CHAR]:
+            self.add_inst(PCode.ILOAD)
+        elif symbol_type == TokenType.DOUBLE:
+            self.add_inst(PCode.DLOAD)
+        return symbol_type, None
+
+    @visits(AstType.LITERAL)
+    def __analyse_literal(self, ast: Literal) -> Tuple[str, Any]:
         """
-        <primary-expression> ::=
-            '('<expression>')'
-            |<identifier>
-            |<integer-literal>
-            |<char-literal>
-            |<floating-literal>
-            |<function-call>
-        After return, if value_type is not `VOID` left the value be on the top of current stack
-        Return: pair of (value_type, value)
-                value can be None if not accessible at compiling time,
-                value_type is `VOID` iff expression is consisted of single void function call,
-                `CHAR` iff expression is consisted of single char-literal or char-variable,
-                `INT` or `DOUBLE` (`CHAR` promoted to `INT`) for any other case
+        <integer-literal> | <char-literal> | <floating-literal>
         """
-        assert_ast_type(ast, AstType.PRIMARY_EXPRESSION)
-
-        child_type = ast.first_child().type
-        if child_type == AstType.TOKEN:
-            return self.__analyse_expression(ast.children[1])
-
-        elif child_type == AstType.IDENTIFIER:
-            symbol_name = self.__analyse_identifier(ast.first_child())
-            if symbol_name not in self.symbol_table:
-                raise UndefinedSymbol(get_pos(ast.first_child()), symbol_name)
-            if self.symbol_table.is_function(symbol_name):
-                raise FunctionTypeCalculationNotSupported(
-                    get_pos(ast.first_child()), symbol_name)
-            symbol_offset = self.symbol_table.get_offset(symbol_name)
-            symbol_type = self.symbol_table.get_type(symbol_name)
-            self.add_inst(PCode.LOADA, *symbol_offset)
-            if symbol_type in [TokenType.INT, TokenType.CHAR]:
-                self.add_inst(PCode.ILOAD)
-            elif symbol_type == TokenType.DOUBLE:
-                self.add_inst(PCode.DLOAD)
-            return self.symbol_table.get_type(symbol_name), None
-
-        elif child_type == AstType.INTEGER_LITERAL:
-            value = self.__analyse_integer_literal(ast.first_child())
+        token = ast.token
+        value = token.value
+        if token.tok_type == TokenType.INTEGER_LITERAL:
             self.add_inst(PCode.IPUSH, value)
             return TokenType.INT, value
 
-        elif child_type == AstType.CHAR_LITERAL:
-            value = self.__analyse_char_literal(ast.first_child())
+        elif token.tok_type == TokenType.CHAR_LITERAL:
             value = ord(value)
             self.add_inst(PCode.BIPUSH, value)
             return TokenType.CHAR, value
 
-        elif child_type == AstType.FLOAT_LITERAL:
-            value = self.__analyse_float_literal(ast.first_child())
+        else:
+            assert token.tok_type == TokenType.FLOAT_LITERAL
             idx = self.elf.add_constant(Constant.DOUBLE, value)
             self.add_inst(PCode.LOADC, idx)
             return TokenType.DOUBLE, value
 
-        else:
-            assert child_type == AstType.FUNCTION_CALL, 'Unexpected error, invalid primary_expr'
-            return self.__analyse_function_call(ast.first_child())
-
-    def __analyse_function_call(self, ast: Ast) -> Tuple[str, Any]:
+    @visits(AstType.CALL)
+    def __analyse_function_call(self, ast: Call) -> Generator:
         """
         <function-call> ::=
             <identifier> '(' [<expression-list>] ')'
@@ -513,87 +450,76 @@ class Analyser(object):
                 value can be None if not accessible at compiling time,
                 value_type is `INT` or `DOUBLE` or `VOID` (`CHAR` promoted to `INT`)
         """
-        assert_ast_type(ast, AstType.FUNCTION_CALL)
-
-        func_name = self.__analyse_identifier(ast.first_child())
-        if func_name in self.symbol_table:
-            if not self.symbol_table.is_function(func_name):
-                raise NotCallingFunction(get_pos(ast.first_child()), func_name)
+        name_id = ast.name.name_id
+        if name_id in self.symbol_table:
+            if not self.symbol_table.is_function(name_id):
+                raise NotCallingFunction(ast.name.st_pos, self.names.name(name_id))
         else:
-            raise FunctionNotDefined(get_pos(ast.first_child()), func_name)
+            raise FunctionNotDefined(ast.name.st_pos, self.names.name(name_id))
 
         # prepare parameters, put values on stack-top from left to right
-        params_info = self.elf.function_params_info(func_name)
-        arg_count = 0
-        if ast.children[2].type == AstType.EXPRESSION_LIST:
-            arg_count = self.__analyse_expression_list(
-                ast.children[2], params_info)
+        params_info = self.elf.function_params_info(name_id)
+        arg_count = yield self.__analyse_expression_list(ast.args, params_info)
 
-        param_count = self.elf.function_param_count(func_name)
+        param_count = self.elf.function_param_count(name_id)
         if arg_count != param_count:
             raise ArgumentsNumberNotMatchException(
-                get_pos(ast.children[1]), param_count, arg_count)
+                ast.paren.st_pos, param_count, arg_count)
 
-        func_id = self.elf.function_index(func_name)
-        self.add_inst(PCode.CALL, func_id)
-        return self.elf.function_return_type(func_name), None
+        func_idx = self.elf.function_index(name_id)
+        self.add_inst(PCode.CALL, func_idx)
+        return self.elf.function_return_type(name_id), None
 
-    def __analyse_expression_list(self, ast: Ast, params_info: List[str]) -> int:
+    def __analyse_expression_list(self, arguments: List[Expression], params_info: List[str]) -> Generator:
         """
         <expression-list> ::=
             <expression>{','<expression>}
         params_info: List of types of parameters
         Return number of argument passed to callee
         """
-        assert_ast_type(ast, AstType.EXPRESSION_LIST)
-
-        arguments = [x for x in ast.children if x.type == AstType.EXPRESSION]
         for param_type, arg in zip(params_info, arguments):
-            arg_type, _ = self.__analyse_expression(arg)
+            arg_type, _ = yield self.__analyse_expression(arg)
             if arg_type != param_type:
                 self.convert_from_type_to_type(to_type=param_type,
                                                from_type=arg_type,
-                                               to_pos=get_pos(arg),
-                                               from_pos=get_pos(arg))
+                                               to_node=arg,
+                                               from_node=arg)
         return len(arguments)
 
+    @visits(AstType.PARAMETER_CLAUSE)
     def __analyse_parameter_clause(self, ast: Ast) -> list:
         """
         <parameter-clause> ::=
             '(' [<parameter-declaration-list>] ')'
         Return types of parameters defined
         """
-        assert_ast_type(ast, AstType.PARAMETER_CLAUSE)
-
-        if ast.children[1].type == AstType.PARAMETER_DECLARATION_LIST:
+        if ast.children[1].kind == AstType.PARAMETER_DECLARATION_LIST:
             return self.__analyse_parameter_declaration_list(ast.children[1])
         return []
 
+    @visits(AstType.PARAMETER_DECLARATION_LIST)
     def __analyse_parameter_declaration_list(self, ast: Ast) -> list:
         """
         <parameter-declaration-list> ::=
             <parameter-declaration>{','<parameter-declaration>}
         Return types of parameters defined
         """
-        assert_ast_type(ast, AstType.PARAMETER_DECLARATION_LIST)
-
         # parameters: value in reversed order, last param at stack-top
-        params = [x for x in ast.children if x.type ==
+        params = [x for x in ast.children if x.kind ==
                   AstType.PARAMETER_DECLARATION]
         params_info: List[str] = []
         for param in params:
             params_info.append(self.__analyse_parameter_declaration(param))
         return params_info
 
+    @visits(AstType.PARAMETER_DECLARATION)
     def __analyse_parameter_declaration(self, ast: Ast) -> str:
         """
         <parameter-declaration> ::=
             [<const-qualifier>]<type-specifier><identifier>
         Return type of parameter
         """
-        assert_ast_type(ast, AstType.PARAMETER_DECLARATION)
-
-        constness = (ast.first_child().type == AstType.CONST_QUALIFIER)
+        constness = (ast.first_child().kind == AstType.CONST_QUALIFIER)
         idx = 1 if constness else 0
 
         type_ = self.__analyse_type_specifier(ast.children[idx])
@@ -606,48 +532,51 @@ class Analyser(object):
 
         # declare params just like declare local variable, the only
         # difference is parameters are already initialized
-        symbol_name = self.__analyse_identifier(ast.children[-1])
+        name_id = self.__analyse_identifier(ast.children[-1])
 
         # this will update the offset correctly automatically
-        self.symbol_table.add_symbol(symbol_name, type_info)
+        self.symbol_table.add_symbol(name_id, type_info)
 
         return type_
 
-    def __analyse_compound_statement(self, ast: Ast, enter_level: bool = True) -> dict:
+    # Like their parsers, the analysers of statements holding statements are
+    # generators run by `trampoline`, `__analyse_statement` returns either
+    # one of them or the statics of a simple statement
+
+    @visits(AstType.COMPOUND_STATEMENT)
+    def __analyse_compound_statement(self, ast: Ast, enter_level: bool = True) -> Generator:
         """
         <compound-statement> ::=
             '{' {<variable-declaration>} <statement-seq> '}'
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.COMPOUND_STATEMENT)
-
         # `False` only if this is a function body
         if enter_level:
             self.symbol_table.enter_level()
 
         variable_declarations = [
-            x for x in ast.children if x.type == AstType.VARIABLE_DECLARATION]
+            x for x in ast.children if x.kind == AstType.VARIABLE_DECLARATION]
         for var_decl in variable_declarations:
             self.__analyse_variable_declaration(var_decl)
-        info = self.__analyse_statement_seq(ast.children[-2])
+        info = yield self.__analyse_statement_seq(ast.children[-2])
 
         self.symbol_table.exit_level()
         return info
 
-    def __analyse_statement_seq(self, ast: Ast) -> dict:
+    @visits(AstType.STATEMENT_SEQ)
+    def __analyse_statement_seq(self, ast: Ast) -> Generator:
         """
         <statement-seq> ::=
             {<statement>}
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.STATEMENT_SEQ)
-
         info = {}
         for statement in ast.children:
-            statement_info = self.__analyse_statement(statement)
+            statement_info = yield self.__analyse_statement(statement)
             info = {**info, **statement_info}
         return info
 
+    @visits(AstType.STATEMENT)
     def __analyse_statement(self, ast: Ast) -> dict:
         """
         <statement> ::=
@@ -662,48 +591,23 @@ class Analyser(object):
             |';'
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.STATEMENT)
-
-        child_type = ast.first_child().type
-        if child_type == AstType.COMPOUND_STATEMENT:
-            return self.__analyse_compound_statement(ast.first_child())
-
-        elif child_type == AstType.CONDITION_STATEMENT:
-            return self.__analyse_condition_statement(ast.first_child())
-
-        elif child_type == AstType.LOOP_STATEMENT:
-            return self.__analyse_loop_statement(ast.first_child())
-
-        elif child_type == AstType.JUMP_STATEMENT:
-            return self.__analyse_jump_statement(ast.first_child())
-
-        elif child_type == AstType.PRINT_STATEMENT:
-            self.__analyse_print_statement(ast.first_child())
-            return {'print': 1}
-
-        elif child_type == AstType.SCAN_STATEMENT:
-            self.__analyse_scan_statement(ast.first_child())
-            return {'scan': 1}
-
-        elif child_type == AstType.ASSIGNMENT_EXPRESSION:
-            self.__analyse_assignment_expression(ast.first_child())
-
-        elif child_type == AstType.FUNCTION_CALL:
-            self.__analyse_function_call(ast.first_child())
-
-        else:
-            assert child_type == AstType.TOKEN, f'Expected `;`, got {child_type}'
+        child = ast.first_child()
+        child_kind = child.kind
+        if child_kind == AstType.CALL:
+            trampoline(self.__analyse_function_call(child))
+        elif child_kind != AstType.TOKEN:
+            # the statements return their statics
+            return self.dispatch[child_kind](self, child)
         return {}
 
-    def __analyse_condition_statement(self, ast: Ast) -> dict:
+    @visits(AstType.CONDITION_STATEMENT)
+    def __analyse_condition_statement(self, ast: Ast) -> Generator:
         """
         <condition-statement> ::=
             'if' '(' <condition> ')' <statement> ['else' <statement>]
             |'switch' '(' <expression> ')' '{' {<labeled-statement>} '}'
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.CONDITION_STATEMENT)
-
         # NOTE: only handle `if`
         statements_info = {}
         first_token = ast.first_child().token
@@ -714,8 +618,8 @@ class Analyser(object):
             j_instruction = self.__analyse_condition(condition)
             j_instruction_idx = self.elf.next_inst_idx()
             self.add_inst(j_instruction, 0)
-            statements_info = {**statements_info,
-                               **self.__analyse_statement(if_stat)}
+            if_info = yield self.__analyse_statement(if_stat)
+            statements_info = {**statements_info, **if_info}
 
             # if-else
             if ast.children[-2].token.tok_type == TokenType.ELSE:
@@ -724,8 +628,8 @@ class Analyser(object):
 
                 else_stat = ast.children[-1]
                 else_start_instruction_index = self.elf.next_inst_idx()
-                statements_info = {**statements_info,
-                                   **self.__analyse_statement(else_stat)}
+                else_info = yield self.__analyse_statement(else_stat)
+                statements_info = {**statements_info, **else_info}
                 instruction_index_after_else = self.elf.next_inst_idx()
 
                 j_offset = else_start_instruction_index
@@ -741,6 +645,7 @@ class Analyser(object):
         else:
             raise NotSupportedFeature(get_pos(ast), 'switch statement')
 
+    @visits(AstType.CONDITION)
     def __analyse_condition(self, ast: Ast) -> str:
         """
         <condition> ::=
@@ -750,9 +655,7 @@ class Analyser(object):
         Return: corresponding `jump` instruction needed, `JE` for `!=`, `JL` for `>=`
             i.e. the jump instruction that perform jumping when condition is `False`
         """
-        assert_ast_type(ast, AstType.CONDITION)
-
-        l_type, _ = self.__analyse_expression(ast.first_child())
+        l_type, _ = trampoline(self.__analyse_expression(ast.first_child()))
         if l_type == TokenType.VOID:
             raise VoidTypeCalculationNotSupported(get_pos(ast.first_child()))
         instruction_idx = self.elf.next_inst_idx()
@@ -763,7 +666,7 @@ class Analyser(object):
             return PCode.JE
         else:
             cmp_op = self.__analyse_relational_operator(ast.children[1])
-            r_type, _ = self.__analyse_expression(ast.children[-1])
+            r_type, _ = trampoline(self.__analyse_expression(ast.children[-1]))
             if r_type == TokenType.VOID:
                 raise VoidTypeCalculationNotSupported(
                     get_pos(ast.children[-1]))
@@ -800,18 +703,19 @@ class Analyser(object):
                 assert cmp_op == TokenType.GEQ
                 return PCode.JL
 
+    @visits(AstType.LABELED_STATEMENT)
     def __analyse_labeled_statement(self, ast: Ast):
         """
         <labeled-statement> ::=
             'case' (<integer-literal>|<char-literal>) ':' <statement>
             |'default' ':' <statement>
         """
-        assert_ast_type(ast, AstType.LABELED_STATEMENT)
         print(self)  # to remove the static-warning, nonsense
         raise NotSupportedFeature(get_pos(ast), 'case and default')
         pass
 
-    def __analyse_loop_statement(self, ast: Ast) -> dict:
+    @visits(AstType.LOOP_STATEMENT)
+    def __analyse_loop_statement(self, ast: Ast) -> Generator:
         """
         <loop-statement> ::=
             'while' '(' <condition> ')' <statement>
@@ -819,8 +723,6 @@ class Analyser(object):
             |'for' '('<for-init-statement> [<condition>]';' [<for-update-expression>]')' <statement>
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.LOOP_STATEMENT)
-
         # NOTE: only need to complete `while` loop
         first_token = ast.first_child().token.tok_type
         if first_token == TokenType.WHILE:
@@ -832,7 +734,7 @@ class Analyser(object):
             jmp_instruction_index = self.elf.next_inst_idx()
             self.add_inst(jmp_instruction, 0)
 
-            statements_info = self.__analyse_statement(statement)
+            statements_info = yield self.__analyse_statement(statement)
             self.add_inst(PCode.JMP, instruction_index_of_condition)
             instruction_index_after_while = self.elf.next_inst_idx()
             offset = instruction_index_after_while
@@ -843,28 +745,27 @@ class Analyser(object):
         else:
             raise NotSupportedFeature(get_pos(ast), 'for')
 
+    @visits(AstType.FOR_INIT_STATEMENT)
     def __analyse_for_init_statement(self, ast: Ast):
         """
         <for-init-statement> ::=
             [<assignment-expression>{','<assignment-expression>}]';'
         """
-        assert_ast_type(ast, AstType.FOR_INIT_STATEMENT)
-
         # NOTE: not base part
         print(self)  # to remove the static-warning, nonsense
         raise NotSupportedFeature(get_pos(ast), 'for-init')
 
+    @visits(AstType.FOR_UPDATE_STATEMENT)
     def __analyse_for_update_expression(self, ast: Ast):
         """
         <for-update-expression> ::=
             (<assignment-expression>|<function-call>){','(<assignment-expression>|<function-call>)}
         """
-        assert_ast_type(ast, AstType.FOR_UPDATE_STATEMENT)
-
         # NOTE: not base part
         print(self)  # to remove the static-warning, nonsense
         raise NotSupportedFeature(get_pos(ast), 'for-update')
 
+    @visits(AstType.JUMP_STATEMENT)
     def __analyse_jump_statement(self, ast: Ast) -> dict:
         """
         <jump-statement> ::=
@@ -873,38 +774,35 @@ class Analyser(object):
             |<return-statement>
         Return statement statics, e.g. how many `return`s, `while`s
         """
-        assert_ast_type(ast, AstType.JUMP_STATEMENT)
-
         # NOTE: base part only contains <return-statement>
-        child_type = ast.first_child().type
-        if child_type == Token:
+        child_kind = ast.first_child().kind
+        if child_kind == AstType.TOKEN:
             raise NotSupportedFeature(get_pos(ast), 'break and continue')
         else:
             self.__analyse_return_statement(ast.first_child())
             return {'return': 1}
 
+    @visits(AstType.RETURN_STATEMENT)
     def __analyse_return_statement(self, ast: Ast):
         """
         <return-statement> ::= 'return' [<expression>] ';'
         """
-        assert_ast_type(ast, AstType.RETURN_STATEMENT)
-
         return_type = self.elf.current_function().return_type
 
         if return_type == TokenType.VOID:
-            if ast.children[1].type == AstType.EXPRESSION:
-                expr_type, _ = self.__analyse_expression(ast.children[1])
+            if ast.children[1].kind in expression_kinds:
+                expr_type, _ = trampoline(self.__analyse_expression(ast.children[1]))
                 if expr_type != TokenType.VOID:
                     raise ReturnValueForVoidFunction(get_pos(ast.children[1]))
             self.add_inst(PCode.RET)
         else:
-            if ast.children[1].type != AstType.EXPRESSION:
+            if not ast.children[1].kind in expression_kinds:
                 raise NoReturnValueForNotVoidFunction(get_pos(ast))
-            expr_type, _ = self.__analyse_expression(ast.children[1])
+            expr_type, _ = trampoline(self.__analyse_expression(ast.children[1]))
             self.convert_from_type_to_type(to_type=return_type,
                                            from_type=expr_type,
-                                           to_pos=get_pos(ast),
-                                           from_pos=get_pos(ast))
+                                           to_node=ast,
+                                           from_node=ast)
             if return_type == TokenType.DOUBLE:
                 self.add_inst(PCode.DRET)
             elif return_type == TokenType.INT:
@@ -912,24 +810,24 @@ class Analyser(object):
             else:
                 self.add_inst(PCode.IRET)
 
-    def __analyse_scan_statement(self, ast: Ast):
+    @visits(AstType.SCAN_STATEMENT)
+    def __analyse_scan_statement(self, ast: Ast) -> dict:
         """
         <scan-statement> ::=
             'scan' '(' <identifier> ')' ';'
+        Return statement statics
         """
-        assert_ast_type(ast, AstType.SCAN_STATEMENT)
-
-        symbol_name = self.__analyse_identifier(ast.children[2])
-        constness = self.symbol_table.is_const(symbol_name)
+        name_id = self.__analyse_identifier(ast.children[2])
+        constness = self.symbol_table.is_const(name_id)
 
         if constness:
             raise AssignToConstant(get_pos(ast.children[2]))
-        elif self.symbol_table.is_function(symbol_name):
+        elif self.symbol_table.is_function(name_id):
             raise FunctionTypeCalculationNotSupported(
-                get_pos(ast.children[2]), symbol_name)
+                get_pos(ast.children[2]), self.names.name(name_id))
         else:
-            type_ = self.symbol_table.get_type(symbol_name)
-            offset = self.symbol_table.get_offset(symbol_name)
+            type_ = self.symbol_table.get_type(name_id)
+            offset = self.symbol_table.get_offset(name_id)
             self.add_inst(PCode.LOADA, *offset)
 
             if type_ == TokenType.INT:
@@ -948,71 +846,72 @@ class Analyser(object):
                 raise VoidTypeCalculationNotSupported(get_pos(ast.children[2]))
             else:
                 raise UnknownVariableType(get_pos(ast.children[2]), type_)
+        return {'scan': 1}
 
-    def __analyse_assignment_expression(self, ast: Ast):
+    @visits(AstType.ASSIGNMENT_EXPRESSION)
+    def __analyse_assignment_expression(self, ast: Ast) -> dict:
         """
         <assignment-expression> ::=
             <identifier><assignment-operator><expression>
+        Return statement statics
         """
-        assert_ast_type(ast, AstType.ASSIGNMENT_EXPRESSION)
-
-        symbol_name = self.__analyse_identifier(ast.first_child())
-        if self.symbol_table.is_const(symbol_name):
+        name_id = self.__analyse_identifier(ast.first_child())
+        if self.symbol_table.is_const(name_id):
             raise AssignToConstant(get_pos(ast.first_child()))
-        elif self.symbol_table.is_function(symbol_name):
+        elif self.symbol_table.is_function(name_id):
             raise FunctionTypeCalculationNotSupported(
-                get_pos(ast.first_child()), symbol_name)
+                get_pos(ast.first_child()), self.names.name(name_id))
 
-        symbol_type = self.symbol_table.get_type(symbol_name)
-        symbol_offset = self.symbol_table.get_offset(symbol_name)
+        symbol_type = self.symbol_table.get_type(name_id)
+        symbol_offset = self.symbol_table.get_offset(name_id)
         self.add_inst(PCode.LOADA, *symbol_offset)
 
-        type_, _ = self.__analyse_expression(ast.children[-1])
+        type_, _ = trampoline(self.__analyse_expression(ast.children[-1]))
         self.convert_from_type_to_type(to_type=symbol_type,
                                        from_type=type_,
-                                       from_pos=get_pos(ast.children[-1]),
-                                       to_pos=get_pos(ast.first_child()))
+                                       from_node=ast.children[-1],
+                                       to_node=ast.first_child())
         if symbol_type == TokenType.DOUBLE:
             self.add_inst(PCode.DSTORE)
         else:
             self.add_inst(PCode.ISTORE)
+        return {}
 
-    def __analyse_print_statement(self, ast: Ast):
+    @visits(AstType.PRINT_STATEMENT)
+    def __analyse_print_statement(self, ast: Ast) -> dict:
         """
         <print-statement> ::=
             'print' '(' [<printable-list>] ')' ';'
+        Return statement statics
         """
-        assert_ast_type(ast, AstType.PRINT_STATEMENT)
-
-        if ast.children[2].type == AstType.PRINTABLE_LIST:
+        if ast.children[2].kind == AstType.PRINTABLE_LIST:
             self.__analyse_printable_list(ast.children[2])
         self.add_inst(PCode.PRINTL)
+        return {'print': 1}
 
+    @visits(AstType.PRINTABLE_LIST)
     def __analyse_printable_list(self, ast: Ast):
         """
         <printable-list>  ::=
             <printable> {',' <printable>}
         """
-        assert_ast_type(ast, AstType.PRINTABLE_LIST)
-
         self.__analyse_printable(ast.first_child())
         for child in ast.children[1:]:
-            if child.type != AstType.PRINTABLE:
+            if child.kind != AstType.PRINTABLE:
                 continue
             self.add_inst(PCode.BIPUSH, 32)
             self.add_inst(PCode.CPRINT)
             self.__analyse_printable(child)
 
+    @visits(AstType.PRINTABLE)
     def __analyse_printable(self, ast: Ast):
         """
         <printable> ::=
             <expression> | <string-literal>
         """
-        assert_ast_type(ast, AstType.PRINTABLE)
-
         child = ast.first_child()
-        if child.type == AstType.EXPRESSION:
-            type_, _ = self.__analyse_expression(child)
+        if child.kind in expression_kinds:
+            type_, _ = trampoline(self.__analyse_expression(child))
             if type_ == TokenType.VOID:
                 raise VoidTypeCalculationNotSupported(get_pos(child))
             elif type_ == TokenType.INT:
@@ -1025,83 +924,48 @@ class Analyser(object):
             self.__analyse_str_literal(child)
             self.add_inst(PCode.SPRINT)
 
-    @staticmethod
-    def __analyse_identifier(ast: Ast):
+    @visits(AstType.IDENTIFIER)
+    def __analyse_identifier(self, ast: Ast) -> int:
         """
-        Return symbol name of the identifier
+        Return the id of the symbol name of the identifier
         """
-        assert_ast_type(ast, AstType.IDENTIFIER)
-        return ast.first_child().token.value
-
-    @staticmethod
-    def __analyse_unary_operator(ast: Ast):
-        """
-        <unary-operator>          ::= '+' | '-'
-        Return type of op, which is one of `TokenType` member
-        """
-        assert_ast_type(ast, AstType.UNARY_OPERATOR)
-        return ast.first_child().token.tok_type
-
-    @staticmethod
-    def __analyse_additive_operator(ast: Ast) -> str:
-        """
-        <additive-operator>       ::= '+' | '-'
-        Return type of op, which is one of `TokenType` member
-        """
-        assert_ast_type(ast, AstType.ADDITIVE_OPERATOR)
-        return ast.first_child().token.tok_type
-
-    @staticmethod
-    def __analyse_multiplicative_operator(ast: Ast) -> str:
-        """
-        <multiplicative-operator> ::= '*' | '/'
-        Return type of op, which is one of `TokenType` member
-        """
-        assert_ast_type(ast, AstType.MULTIPLICATIVE_OPERATOR)
-        return ast.first_child().token.tok_type
+        return ast.first_child().token.name_id
 
     @staticmethod
+    @visits(AstType.RELATIONAL_OPERATOR)
     def __analyse_relational_operator(ast: Ast) -> str:
         """
         <relational-operator>     ::= '<' | '<=' | '>' | '>=' | '!=' | '=='
         Return type of op, which is one of `TokenType` member
         """
-        assert_ast_type(ast, AstType.RELATIONAL_OPERATOR)
         return ast.first_child().token.tok_type
 
     @staticmethod
+    @visits(AstType.ASSIGNMENT_OPERATOR)
     def __analyse_assignment_operator(ast: Ast) -> str:
         """
         <assignment-operator>     ::= '='
         Return type of op, which is one of `TokenType` member
         """
-        assert_ast_type(ast, AstType.ASSIGNMENT_OPERATOR)
         return ast.first_child().token.tok_type
 
     @staticmethod
+    @visits(AstType.INTEGER_LITERAL)
     def __analyse_integer_literal(ast: Ast) -> int:
         """
         Return value of the literal
         """
-        assert_ast_type(ast, AstType.INTEGER_LITERAL)
         return ast.first_child().token.value
 
     @staticmethod
+    @visits(AstType.CHAR_LITERAL)
     def __analyse_char_literal(ast: Ast) -> str:
         """
         Return value of the literal
         """
-        assert_ast_type(ast, AstType.CHAR_LITERAL)
-        return ast.first_child().token.value
-
-    @staticmethod
-    def __analyse_float_literal(ast: Ast) -> float:
-        """
-        Return value of the literal
-        """
-        assert_ast_type(ast, AstType.FLOAT_LITERAL)
         return ast.first_child().token.value
 
+    @visits(AstType.STR_LITERAL)
     def __analyse_str_literal(self, ast: Ast):
         """
         Return value of the literal
@@ -1109,8 +973,6 @@ class Analyser(object):
         Add `str_literal` to constant table, and generate instructions to
         put the address of `str_literal` on stack-top
         """
-        assert_ast_type(ast, AstType.STR_LITERAL)
-
         value = ast.first_child().token.value
         idx = self.elf.add_constant(Constant.STR, value)
         self.add_inst(PCode.LOADC, idx)
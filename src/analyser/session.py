@@ -0,0 +1,329 @@
+import typing
+from analyser.ast import Ast, AstType
+from analyser.parser import C0ASTParser
+from analyser.semantic_analyser import Analyser
+from analyser.symbol_table import SymbolTable, SymbolAttrs
+from elf.elf import ELF, Constant, Function
+from elf.pcode import PCode
+from exception.c0_exception import C0Exception
+from tokenizer import Token, Tokenizer, TokenType
+
+
+class FullCompileNeeded(Exception):
+    """
+    Raised by `CompileSession` when an edit cannot be compiled function by
+    function and the whole source is compiled again
+    """
+
+
+def constant_keys(function: Function, constants: typing.List[Constant]) -> tuple:
+    """
+    (type, value) of the constants `function` uses in the order they are
+    added by the analyser: its name, then the ones its `LOADC`s load
+    """
+    keys = [constants[function.name_idx]]
+    for instruction in function.instructions:
+        if instruction.operator == PCode.LOADC:
+            keys.append(constants[instruction.operands[0]])
+    return tuple((const.type_, const.value) for const in keys)
+
+
+def function_spans(tokens: typing.List[Token], st: int):
+    """
+    (st, ed) token indexes of the function definitions from `tokens[st]`,
+    which starts one, to the end, each ending at a '}' of the top level.
+    None if braces do not match or tokens follow the last '}'
+    """
+    spans = []
+    depth = 0
+    for idx in range(st, len(tokens)):
+        tok_type = tokens[idx].tok_type
+        if tok_type == TokenType.LEFT_BRACE:
+            depth += 1
+        elif tok_type == TokenType.RIGHT_BRACE:
+            depth -= 1
+            if depth == 0:
+                spans.append((st, idx + 1))
+                st = idx + 1
+            elif depth < 0:
+                return None
+    return spans if st == len(tokens) else None
+
+
+class CompiledFunction(object):
+    """
+    What `CompileSession` keeps of a function definition: its tokens
+    [st, ed), its AST, the identifiers in it and its `constant_keys`
+    """
+    __slots__ = ('st', 'ed', 'ast', 'identifiers', 'constants')
+
+    def __init__(self, st: int, ed: int, ast: Ast, tokens: typing.List[Token],
+                 function: Function, constants: typing.List[Constant]):
+        self.st = st
+        self.ed = ed
+        self.ast = ast
+        self.identifiers = frozenset(
+            token.literal for token in tokens[st:ed]
+            if token.tok_type == TokenType.IDENTIFIER)
+        self.constants = constant_keys(function, constants)
+
+
+class CompileSession(object):
+    def __init__(self, source: str):
+        """
+        Compiler of a source edited over time. The tokens, and the AST and
+        instructions of every function are kept, so that `edit` only
+        parses and compiles again the functions whose tokens changed, and
+        the functions after them using a name whose signature changed.
+        The `ELF` is the one of compiling the edited source from scratch.
+
+        Edits of the variable declarations, and edits leading to an error,
+        compile the whole source again, which raises the exception of
+        `Analyser`
+        """
+        self.tokenizer = Tokenizer(source)
+        self.elf: typing.Union[ELF, None] = None
+        # None until compiled without error
+        self.functions: typing.Union[typing.List[CompiledFunction], None] = None
+        # symbols of the global variables and the stack size they take
+        self.globals: typing.Dict[int, dict] = {}
+        self.globals_size = 0
+        # names of the functions compiled by the last `compile` or `edit`
+        self.recompiled: typing.List[str] = []
+
+    def compile(self) -> ELF:
+        if self.functions is None:
+            self.__compile_all()
+        return self.elf
+
+    def edit(self, edit_range: tuple, new_text: str) -> ELF:
+        """
+        Replace the source between offsets `edit_range` = (st, ed) with
+        `new_text` and compile it
+        """
+        functions, self.functions = self.functions, None
+        self.tokenizer.retokenize(edit_range, new_text)
+        if functions is not None:
+            try:
+                self.__compile_edit(functions)
+                return self.elf
+            except (FullCompileNeeded, C0Exception):
+                # compiled again below, to raise the exception at the
+                # earliest position
+                self.functions = None
+        self.__compile_all()
+        return self.elf
+
+    def __compile_all(self):
+        tokens = self.tokenizer.tokens
+        if tokens is None:
+            tokens = self.tokenizer.retokenize((0, 0), '')
+        names = self.tokenizer.names
+        analyser = Analyser(tokens, names)
+        elf = analyser.generate()
+
+        # functions start after the `;` of the last declaration
+        st = 0
+        for idx, token in enumerate(tokens):
+            if token.tok_type == TokenType.LEFT_BRACE:
+                break
+            if token.tok_type == TokenType.SEMICOLON:
+                st = idx + 1
+        spans = function_spans(tokens, st)
+        asts = [child for child in analyser.c0_ast.children
+                if child.kind == AstType.FUNCTION_DEFINITION]
+        assert spans is not None and len(spans) == len(asts), \
+            'Unexpected error, functions not found in the tokens'
+
+        global_scope = analyser.symbol_table.global_level()
+        self.globals = {name_id: attrs for name_id, attrs
+                        in global_scope.symbols.items()
+                        if not attrs[SymbolAttrs.IS_FUNC]}
+        self.globals_size = global_scope.next_offset
+        self.elf = elf
+        self.functions = [
+            CompiledFunction(st, ed, ast, tokens, function, elf.constants)
+            for (st, ed), ast, function in zip(spans, asts, elf.functions)]
+        self.recompiled = [function.name for function in elf.functions]
+
+    def __compile_edit(self, functions: typing.List[CompiledFunction]):
+        """
+        Compile the edit `Tokenizer.retokenized` describes, given the
+        functions of the source before it. Raise `FullCompileNeeded` if it
+        is not done function by function, and the exceptions of the
+        compiler on any error
+        """
+        tokens = self.tokenizer.tokens
+        first, old_end, new_end = self.tokenizer.retokenized
+        delta = new_end - old_end
+        self.recompiled = []
+        if first == old_end == new_end:
+            self.functions = functions
+            return
+        if not functions or first < functions[0].st:
+            raise FullCompileNeeded('declarations edited')
+
+        # functions [lo, hi) are replaced, the first one is the one holding
+        # token `first`, the last one the one ending at the first '}' of the
+        # top level after the changed tokens that ended a function before
+        lo, hi = 0, len(functions)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if functions[mid].ed <= first:
+                lo = mid + 1
+            else:
+                hi = mid
+        st = functions[lo].st if lo < len(functions) else first
+        spans = []
+        depth = 0
+        hi = lo
+        for idx in range(st, len(tokens)):
+            tok_type = tokens[idx].tok_type
+            if tok_type == TokenType.LEFT_BRACE:
+                depth += 1
+            elif tok_type == TokenType.RIGHT_BRACE:
+                depth -= 1
+                if depth < 0:
+                    raise FullCompileNeeded('unmatched braces')
+                if depth > 0:
+                    continue
+                spans.append((st, idx + 1))
+                st = idx + 1
+                if st < new_end:
+                    continue
+                while hi < len(functions) and functions[hi].ed < st - delta:
+                    hi += 1
+                if hi < len(functions) and functions[hi].ed == st - delta:
+                    hi += 1
+                    break
+        else:
+            if st != len(tokens):
+                raise FullCompileNeeded('tokens after the last function')
+            hi = len(functions)
+
+        window_st = spans[0][0] if spans else st
+        asts = C0ASTParser(tokens[window_st:st], functions_only=True) \
+            .parse().children
+        if len(asts) != len(spans):
+            raise FullCompileNeeded('functions not found in the tokens')
+
+        names = self.tokenizer.names
+        elf = self.__elf_before(lo)
+        Analyser(None, names).generate_functions(
+            asts, self.__global_scope(elf.functions), elf)
+        compiled = elf.functions[lo:]
+        replaced = self.elf.functions[lo:hi]
+        constants = self.elf.constants
+        window = [CompiledFunction(st, ed, ast, tokens, function, constants)
+                  for (st, ed), ast, function in zip(spans, asts, compiled)]
+
+        # names defined before or after the edit, with another signature
+        def signatures(defined: typing.List[Function]) -> dict:
+            return {function.name: (function.return_type,
+                                    tuple(function.param_info))
+                    for function in defined}
+
+        old_signatures = signatures(replaced)
+        new_signatures = signatures(compiled)
+        changed = {name for name in old_signatures.keys() | new_signatures.keys()
+                   if old_signatures.get(name) != new_signatures.get(name)}
+        constants_changed = \
+            [key for function in functions[lo:hi] for key in function.constants] != \
+            [key for function in window for key in function.constants]
+
+        old_ids = [function.name_id for function in replaced]
+        new_ids = [function.name_id for function in compiled]
+        self.elf.functions[lo:hi] = compiled
+        if old_ids != new_ids:
+            self.elf.function_ids = {function.name_id: idx for idx, function
+                                     in enumerate(self.elf.functions)}
+        self.functions = functions[:lo] + window
+        self.recompiled = [function.name for function in compiled]
+
+        # the functions after the edit are compiled again if they use a name
+        # whose signature changed, otherwise only their calls are renumbered
+        function_ids = self.elf.function_ids
+        for function in functions[hi:]:
+            function.st += delta
+            function.ed += delta
+            idx = len(self.functions)
+            self.functions.append(function)
+            name = self.elf.functions[idx].name
+            if name in changed or changed & function.identifiers:
+                elf = self.__elf_before(idx)
+                Analyser(None, names).generate_functions(
+                    [function.ast], self.__global_scope(elf.functions), elf)
+                self.elf.functions[idx] = elf.functions[idx]
+                old_keys = function.constants
+                function.constants = constant_keys(elf.functions[idx], constants)
+                constants_changed |= old_keys != function.constants
+                self.recompiled.append(name)
+            elif old_ids != new_ids:
+                for instruction in self.elf.functions[idx].instructions:
+                    if instruction.operator != PCode.CALL:
+                        continue
+                    callee = instruction.operands[0]
+                    if callee >= hi:
+                        instruction.update(callee - hi + lo + len(new_ids))
+                    elif callee >= lo:
+                        instruction.update(function_ids[old_ids[callee - lo]])
+
+        if names.intern('main') not in function_ids:
+            raise FullCompileNeeded('main removed')
+        if constants_changed:
+            self.__renumber_constants()
+
+    def __elf_before(self, count: int) -> ELF:
+        """
+        `ELF` with the first `count` functions compiled, sharing their
+        instructions and the constants
+        """
+        elf = ELF()
+        elf.instructions = self.elf.instructions
+        elf.constants = self.elf.constants
+        elf.functions = self.elf.functions[:count]
+        elf.function_ids = {function.name_id: idx for idx, function
+                            in enumerate(elf.functions)}
+        return elf
+
+    def __global_scope(self, functions: typing.List[Function]) -> SymbolTable:
+        """
+        Global scope of the program where `functions` are defined so far
+        """
+        symbol_table = SymbolTable(self.tokenizer.names)
+        symbol_table.enter_level()
+        # added in the order they are declared, they take the same offsets
+        for name_id, attrs in self.globals.items():
+            symbol_table.add_symbol(name_id, dict(attrs))
+        assert symbol_table.current_level().next_offset == self.globals_size, \
+            'Unexpected error, global variables moved'
+        for function in functions:
+            symbol_table.add_symbol(function.name_id, {SymbolAttrs.IS_FUNC: True})
+        return symbol_table
+
+    def __renumber_constants(self):
+        """
+        Number the constants in the order the analyser adds them, dropping
+        the ones no longer used, as if compiled from scratch
+        """
+        old_constants = self.elf.constants
+        indexes = {}
+        constants = []
+
+        def renumber(idx: int) -> int:
+            const = old_constants[idx]
+            key = (const.type_, const.value)
+            if key not in indexes:
+                indexes[key] = len(constants)
+                constants.append(const)
+            return indexes[key]
+
+        for instruction in self.elf.instructions:
+            if instruction.operator == PCode.LOADC:
+                instruction.update(renumber(instruction.operands[0]))
+        for function in self.elf.functions:
+            function.name_idx = renumber(function.name_idx)
+            for instruction in function.instructions:
+                if instruction.operator == PCode.LOADC:
+                    instruction.update(renumber(instruction.operands[0]))
+        self.elf.constants = constants
@@ -1,6 +1,6 @@
 from typing import Dict, List, Tuple
 from exception.symbol_table_exceptions import *
-from tokenizer import TokenType
+from tokenizer import NameTable, TokenType
 
 
 class SymbolAttrs(object):
@@ -33,156 +33,154 @@ def get_type_size(attrs: dict) -> int:
 
 
 class ScopeLevelSymbolTable(object):
-    def __init__(self, base_offset: int, stack_level):
-        self.symbols: Dict[str, dict] = {}
+    def __init__(self, base_offset: int, stack_level, names: NameTable):
+        # keyed by the id of the name in `names`
+        self.symbols: Dict[int, dict] = {}
         self.next_offset = base_offset
         self.function_level = stack_level
+        self.names = names
 
-    def add_symbol(self, symbol_name: str, attrs: dict):
+    def add_symbol(self, name_id: int, attrs: dict):
         """
         This function will modify the offset automatically
-        :param symbol_name: name of symbol to be inserted
+        :param name_id: id of the name of symbol to be inserted
         :param attrs: attributes of symbol, keys must be member of `SymbolAttr`
         """
         attrs[SymbolAttrs.IS_FUNC] = attrs.get(SymbolAttrs.IS_FUNC, False)
 
         if not attrs[SymbolAttrs.IS_FUNC]:
             if SymbolAttrs.TYPE not in attrs:
-                raise SymbolWithoutType(symbol_name)
+                raise SymbolWithoutType(self.names.name(name_id))
 
             attrs[SymbolAttrs.SIZE] = get_type_size(attrs)
             attrs[SymbolAttrs.OFFSET] = self.next_offset
 
             self.next_offset += attrs[SymbolAttrs.SIZE]
-        self.symbols[symbol_name] = attrs
+        self.symbols[name_id] = attrs
 
-    def update_symbol(self, symbol_name: str, key: str, value):
-        self.symbols[symbol_name][key] = value
+    def update_symbol(self, name_id: int, key: str, value):
+        self.symbols[name_id][key] = value
 
-    def get_symbol_attr(self, symbol_name: str, key: str):
-        if key == SymbolAttrs.OFFSET and self.symbols[symbol_name][SymbolAttrs.IS_FUNC]:
-            raise FunctionTypeHasNoOffsetAttribute(symbol_name)
-        return self.symbols[symbol_name][key]
+    def get_symbol_attr(self, name_id: int, key: str):
+        if key == SymbolAttrs.OFFSET and self.symbols[name_id][SymbolAttrs.IS_FUNC]:
+            raise FunctionTypeHasNoOffsetAttribute(self.names.name(name_id))
+        return self.symbols[name_id][key]
 
-    def get_symbol_info(self, symbol_name: str) -> dict:
-        return self.symbols[symbol_name]
+    def get_symbol_info(self, name_id: int) -> dict:
+        return self.symbols[name_id]
 
-    def initialized(self, symbol_name: str) -> bool:
-        return SymbolAttrs.TYPE in self.symbols[symbol_name]
+    def initialized(self, name_id: int) -> bool:
+        return SymbolAttrs.TYPE in self.symbols[name_id]
 
-    def __contains__(self, symbol_name: str) -> bool:
-        return symbol_name in self.symbols
+    def __contains__(self, name_id: int) -> bool:
+        return name_id in self.symbols
 
     def __str__(self):
         output = 'LevelSymbolTable {\n'
-        for symbol, attrs in self.symbols.items():
-            output += f'{symbol}: {attrs}\n'
+        for name_id, attrs in self.symbols.items():
+            output += f'{self.names.name(name_id)}: {attrs}\n'
         output += '}'
         return output
 
 
 class SymbolTable(object):
-    def __init__(self):
-        # [cur_level, prev_level, ..., global_level]
-        self.level_tables: List[ScopeLevelSymbolTable] = []
+    def __init__(self, names: NameTable = None):
+        """
+        Symbols are identified by the id of their name in `names`, which the
+        names are looked up in only for messages.
 
-    def __assert_contains(self, symbol_name: str):
-        for table in self.level_tables:
-            if symbol_name in table:
-                return
-        raise SymbolNotFound(symbol_name)
+        Every name maps to the stack of the levels declaring it, the
+        innermost last, so looking a symbol up does not depend on how deep
+        the levels are nested. The symbols of a level are the names popped
+        when exiting it.
+        """
+        # [global_level, ..., cur_level]
+        self.levels: List[ScopeLevelSymbolTable] = []
+        self.bindings: Dict[int, List[ScopeLevelSymbolTable]] = {}
+        self.names = NameTable() if names is None else names
 
-    def add_symbol(self, symbol_name: str, attrs: dict = None):
+    def __level_of(self, name_id: int) -> ScopeLevelSymbolTable:
+        """
+        Innermost level declaring `name_id`
+        """
+        levels = self.bindings.get(name_id)
+        if not levels:
+            raise SymbolNotFound(self.names.name(name_id))
+        return levels[-1]
+
+    def add_symbol(self, name_id: int, attrs: dict = None):
         """
         This function will modify the offset automatically
-        :param symbol_name: name of symbol to be inserted
+        :param name_id: id of the name of symbol to be inserted
         :param attrs: attributes of symbol, keys must be member of `SymbolAttr`
         """
         if attrs is None:
             attrs = {}
-        self.current_level().add_symbol(symbol_name, attrs)
-        # print(f'After add {symbol_name}, symbol_table is:\n{self}')
-
-    def update_symbol(self, symbol_name: str, key: str, value):
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.update_symbol(symbol_name, key, value)
-
-    def get_symbol_attr(self, symbol_name: str, key: str):
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_attr(symbol_name, key)
-
-    def is_const(self, symbol_name: str) -> bool:
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_attr(symbol_name, SymbolAttrs.CONSTNESS)
-
-    def get_offset(self, symbol_name: str) -> Tuple[int, int]:
+        level = self.current_level()
+        if name_id not in level:
+            self.bindings.setdefault(name_id, []).append(level)
+        level.add_symbol(name_id, attrs)
+
+    def update_symbol(self, name_id: int, key: str, value):
+        return self.__level_of(name_id).update_symbol(name_id, key, value)
+
+    def get_symbol_attr(self, name_id: int, key: str):
+        return self.__level_of(name_id).get_symbol_attr(name_id, key)
+
+    def is_const(self, name_id: int) -> bool:
+        return self.__level_of(name_id).get_symbol_attr(name_id, SymbolAttrs.CONSTNESS)
+
+    def get_offset(self, name_id: int) -> Tuple[int, int]:
         """
         :return tuple of (level_difference, stack_offset)
         """
-        self.__assert_contains(symbol_name)
-        for idx, table in enumerate(self.level_tables):
-            if symbol_name in table:
-                stack_diff = self.current_level().function_level - table.function_level
-                return stack_diff, table.get_symbol_attr(symbol_name, SymbolAttrs.OFFSET)
-
-    def get_size(self, symbol_name: str):
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_attr(symbol_name, SymbolAttrs.SIZE)
-
-    def get_type(self, symbol_name: str):
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_attr(symbol_name, SymbolAttrs.TYPE)
-
-    def get_symbol_info(self, symbol_name: str) -> dict:
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_info(symbol_name)
-
-    def is_function(self, symbol_name: str) -> bool:
-        self.__assert_contains(symbol_name)
-        for table in self.level_tables:
-            if symbol_name in table:
-                return table.get_symbol_attr(symbol_name, SymbolAttrs.IS_FUNC)
+        table = self.__level_of(name_id)
+        stack_diff = self.current_level().function_level - table.function_level
+        return stack_diff, table.get_symbol_attr(name_id, SymbolAttrs.OFFSET)
+
+    def get_size(self, name_id: int):
+        return self.__level_of(name_id).get_symbol_attr(name_id, SymbolAttrs.SIZE)
+
+    def get_type(self, name_id: int):
+        return self.__level_of(name_id).get_symbol_attr(name_id, SymbolAttrs.TYPE)
+
+    def get_symbol_info(self, name_id: int) -> dict:
+        return self.__level_of(name_id).get_symbol_info(name_id)
+
+    def is_function(self, name_id: int) -> bool:
+        return self.__level_of(name_id).get_symbol_attr(name_id, SymbolAttrs.IS_FUNC)
 
     def current_level(self) -> ScopeLevelSymbolTable:
-        return self.level_tables[0]
+        return self.levels[-1]
+
+    def global_level(self) -> ScopeLevelSymbolTable:
+        return self.levels[0]
 
     def enter_level(self, new_stack: bool = False):
-        # print(f'Enter level, prev {len(self.level_tables)} tables')
-        if not self.level_tables:
+        if not self.levels:
             base_offset = 0
             stack_level = 0
         else:
             level_table = self.current_level()
             base_offset = 0 if new_stack else level_table.next_offset
             stack_level = (1 if new_stack else 0) + level_table.function_level
-        self.level_tables.insert(0,
-                                 ScopeLevelSymbolTable(base_offset, stack_level))
+        self.levels.append(ScopeLevelSymbolTable(base_offset, stack_level,
+                                                 self.names))
 
     def exit_level(self):
-        # print(f'Exit level, prev {len(self.level_tables)} tables')
-        self.level_tables.pop(0)
+        bindings = self.bindings
+        for name_id in self.levels.pop().symbols:
+            levels = bindings[name_id]
+            levels.pop()
+            if not levels:
+                del bindings[name_id]
 
-    def __contains__(self, symbol_name: str) -> bool:
-        for table in self.level_tables[::-1]:
-            if symbol_name in table:
-                return True
-        return False
+    def __contains__(self, name_id: int) -> bool:
+        return name_id in self.bindings
 
     def __str__(self):
         output = ''
-        for level, table in enumerate(reversed(self.level_tables)):
+        for level, table in enumerate(self.levels):
             level_output = str(table)
             lines = [line for line in level_output.split('\n') if line]
             output += '\n'.join(('  ' * level + line) for line in lines) + '\n'
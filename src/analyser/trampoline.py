@@ -0,0 +1,49 @@
+from types import GeneratorType
+
+
+def trampoline(call):
+    """
+    Run a recursive walk written as generators without nesting Python
+    frames, however deep the tree it walks.
+
+    `call` is a generator, a "call" whose return value is the result. A
+    generator calls another one by yielding it, `value = yield
+    self.__walk(child)`, and is resumed with its return value, or with
+    the exception it raised. Anything else yielded, or passed as `call`, is
+    already a result and is sent back as is, so a walk can return the
+    result of a leaf directly instead of a generator.
+
+    The generators waiting for a result are kept in a list, the Python
+    stack stays as deep as this function.
+    """
+    if type(call) is not GeneratorType:
+        return call
+
+    stack = [call]
+    value = None
+    error = None
+    while True:
+        try:
+            if error is None:
+                callee = stack[-1].send(value)
+            else:
+                pending, error = error, None
+                callee = stack[-1].throw(pending)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            if not stack:
+                return value
+            continue
+        except BaseException as e:
+            stack.pop()
+            if not stack:
+                raise
+            error = e
+            continue
+
+        if type(callee) is GeneratorType:
+            stack.append(callee)
+            value = None
+        else:
+            value = callee
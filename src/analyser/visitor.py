@@ -0,0 +1,91 @@
+import inspect
+import typing
+from types import MethodType
+from analyser.ast import kind_names
+from exception.parser_exceptions import AstException
+
+
+def visits(*kinds: int):
+    """
+    Decorator registering a method of a `Visitor` as the handler of the
+    nodes of `kinds`, it is called with the node as first argument
+    """
+    def register(method):
+        function = getattr(method, '__func__', method)
+        function.visited_kinds = kinds
+        return method
+    return register
+
+
+def assert_ast_type(ast, assertion_kind: int):
+    if ast.kind != assertion_kind:
+        ast.draw()
+        assert False, f'Expected ast of type {kind_names[assertion_kind]}, but received {ast.type}'
+
+
+def unexpected(visitor, node):
+    raise AstException(f'{type(visitor).__name__} cannot visit '
+                       f'{kind_names[node.kind]} nodes')
+
+
+class Visitor(object):
+    """
+    Walk of an AST dispatching on node kinds. Methods decorated with
+    `visits` are collected per class into `handlers`, kind -> method name,
+    subclasses inheriting and overriding those of their bases, and resolved
+    once into `dispatch`, a list of functions indexed by kind. `visit(node)`
+    is then one index and one call. Kinds without a handler raise
+    `AstException`.
+
+    The functions are not bound to instances, which would keep every
+    visitor alive until the cycle collector runs.
+
+    In `debug` mode every handler checks the kind of its node first, called
+    through `dispatch` or directly, otherwise nodes are trusted to be of the
+    kind their parent expects, as the parser builds them
+    """
+    handlers: typing.Dict[int, str] = {}
+    dispatch: typing.List[typing.Callable] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = dict(cls.handlers)
+        for name, method in vars(cls).items():
+            function = getattr(method, '__func__', method)
+            for kind in getattr(function, 'visited_kinds', ()):
+                handlers[kind] = name
+        cls.handlers = handlers
+        cls.dispatch = [unexpected] * (max(kind_names) + 1)
+        for kind, name in handlers.items():
+            cls.dispatch[kind] = cls.__handler(name)
+
+    @classmethod
+    def __handler(cls, name: str) -> typing.Callable:
+        """
+        Function of method `name` taking the visitor and the node
+        """
+        method = inspect.getattr_static(cls, name)
+        if isinstance(method, staticmethod):
+            function = method.__func__
+            return lambda visitor, node: function(node)
+        return getattr(cls, name)
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        if debug:
+            self.dispatch = list(self.dispatch)
+            for kind, name in self.handlers.items():
+                checked = self.__checked(self.dispatch[kind], kind)
+                self.dispatch[kind] = checked
+                # shadows the method for direct calls too
+                setattr(self, name, MethodType(checked, self))
+
+    def visit(self, node):
+        return self.dispatch[node.kind](self, node)
+
+    @staticmethod
+    def __checked(handler: typing.Callable, kind: int) -> typing.Callable:
+        def checked(visitor, node, *args, **kwargs):
+            assert_ast_type(node, kind)
+            return handler(visitor, node, *args, **kwargs)
+        return checked
@@ -0,0 +1,56 @@
+"""
+Compare the throughput of `Tokenizer.next_token` (regex engine) with
+`Tokenizer.dfa_next_token` (char-by-char DFA), and of `MappedTokenizer`
+lexing the same source from a file.
+
+Run from `src/`:
+    python -m bench.bench_lexer [size_in_kb]
+"""
+import os
+import sys
+import tempfile
+import time
+from bench.generator import generate_source
+from tokenizer import Tokenizer, MappedTokenizer
+
+
+def measure(source: str, next_token) -> tuple:
+    """
+    Return (token_count, seconds) of tokenizing `source` with `next_token`,
+    which is an unbound method of `Tokenizer`
+    """
+    tokenizer = Tokenizer(source)
+    count = 0
+    st = time.perf_counter()
+    while next_token(tokenizer) is not None:
+        count += 1
+    return count, time.perf_counter() - st
+
+
+def main(size_kb: int):
+    source = generate_source(size_kb * 1024)
+    print(f'source: {len(source) / 1024 / 1024:.2f} MB')
+    results = {}
+    for name, method in [('dfa', Tokenizer.dfa_next_token),
+                         ('regex', Tokenizer.next_token)]:
+        count, seconds = measure(source, method)
+        results[name] = count / seconds
+        print(f'{name:>6}: {count} tokens in {seconds:.3f}s, '
+              f'{results[name]:,.0f} tokens/s')
+    print(f'speedup: {results["regex"] / results["dfa"]:.1f}x')
+
+    with tempfile.NamedTemporaryFile('w', suffix='.c0', delete=False) as file:
+        file.write(source)
+    try:
+        st = time.perf_counter()
+        with MappedTokenizer(file.name) as tokenizer:
+            count = sum(1 for _ in tokenizer.iter_tokens())
+        seconds = time.perf_counter() - st
+    finally:
+        os.remove(file.name)
+    print(f'{"mmap":>6}: {count} tokens in {seconds:.3f}s, '
+          f'{count / seconds:,.0f} tokens/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024)
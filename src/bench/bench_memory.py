@@ -0,0 +1,36 @@
+"""
+Compare the memory held by a list of `Token` with a `TokenBuffer` of the
+same tokens, measured with `tracemalloc`.
+
+Run from `src/`:
+    python -m bench.bench_memory [size_in_kb]
+"""
+import sys
+import time
+import tracemalloc
+from bench.generator import generate_source
+from tokenizer import Tokenizer, TokenBuffer
+
+
+def measure(source: str, collect):
+    tracemalloc.start()
+    st = time.perf_counter()
+    tokens = collect(Tokenizer(source).iter_tokens())
+    seconds = time.perf_counter() - st
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(tokens), held, peak, seconds
+
+
+def main(size_kb: int):
+    source = generate_source(size_kb * 1024)
+    print(f'source: {len(source) / 2 ** 20:.2f} MB')
+    for name, collect in [('list', list), ('buffer', TokenBuffer)]:
+        count, held, peak, seconds = measure(source, collect)
+        print(f'{name:>6}: {count} tokens, held {held / 2 ** 20:.2f} MB '
+              f'({held / count:.1f} B/token), peak {peak / 2 ** 20:.2f} MB, '
+              f'{seconds:.3f}s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024)
@@ -0,0 +1,93 @@
+"""
+Parse and analysis time of programs nested `depth` levels deep, one shape
+of nesting per program, against the recursion limit of Python.
+
+Run from `src/`:
+    python -m bench.bench_nesting [depth]
+"""
+import sys
+import time
+from analyser import Analyser
+from tokenizer import Tokenizer
+
+
+def parentheses(depth: int) -> str:
+    return f'int main() {{ return {"(" * depth}1{")" * depth}; }}'
+
+
+def calls(depth: int) -> str:
+    return (f'int f(int a) {{ return a; }}\n'
+            f'int main() {{ return {"f(" * depth}1{")" * depth}; }}')
+
+
+def right_nested(depth: int) -> str:
+    # `1-(1-(1-...))`
+    return f'int main() {{ return {"1-(" * depth}1{")" * depth}; }}'
+
+
+def left_chain(depth: int) -> str:
+    return f'int main() {{ return 1{"-1" * depth}; }}'
+
+
+def unary_nested(depth: int) -> str:
+    # `-(-(-...))`, a unary operator only applies to a primary expression
+    return f'int main() {{ return {"-(" * depth}1{")" * depth}; }}'
+
+
+def braces(depth: int) -> str:
+    return f'int main() {{ {"{" * depth}{"}" * depth} return 0; }}'
+
+
+def scopes(depth: int) -> str:
+    # every level declares a variable and reads the one of the outermost
+    return (f'int main() {{ int a = 1; {"{ int b = a; " * depth}'
+            f'{"}" * depth} return a; }}')
+
+
+def if_chain(depth: int) -> str:
+    return (f'int main() {{ int a = 1; {"if (a) " * depth}a = 0; '
+            f'return a; }}')
+
+
+def else_if_chain(depth: int) -> str:
+    return (f'int main() {{ int a = 1; if (a == 0) a = 0; '
+            f'{"else if (a) a = 0; " * depth}return a; }}')
+
+
+def while_nest(depth: int) -> str:
+    return (f'int main() {{ int a = 0; {"while (a) " * depth}a = 0; '
+            f'return a; }}')
+
+
+shapes = {
+    'parens': parentheses,
+    'calls': calls,
+    'right': right_nested,
+    'left': left_chain,
+    'unary': unary_nested,
+    'braces': braces,
+    'scopes': scopes,
+    'if': if_chain,
+    'else-if': else_if_chain,
+    'while': while_nest,
+}
+
+
+def main(depth: int):
+    print(f'depth {depth}, recursion limit {sys.getrecursionlimit()}')
+    for name, program in shapes.items():
+        tokenizer = Tokenizer(program(depth))
+        tokens = tokenizer.all_tokens()
+        st = time.perf_counter()
+        try:
+            Analyser(tokens, tokenizer.names).generate()
+        except RecursionError:
+            print(f'{name:>10}: RecursionError')
+            continue
+        seconds = time.perf_counter() - st
+        print(f'{name:>10}: {len(tokens):>8} tokens, {seconds:.3f}s, '
+              f'{len(tokens) / seconds:,.0f} tokens/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
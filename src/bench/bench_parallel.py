@@ -0,0 +1,54 @@
+"""
+Scaling of `tokenize_parallel` and `parse_parallel` with the number of
+worker processes, against the serial `Tokenizer` and `C0ASTParser`.
+
+Run from `src/`:
+    python -m bench.bench_parallel [size_in_kb] [max_workers]
+"""
+import os
+import sys
+import time
+from analyser.arena import AstArena
+from analyser.parallel_parser import parse_parallel
+from analyser.parser import C0ASTParser
+from bench.generator import generate_source
+from tokenizer import Tokenizer, tokenize_parallel
+
+
+def main(size_kb: int, max_workers: int):
+    source = generate_source(size_kb * 1024)
+    print(f'source: {len(source) / 2 ** 20:.2f} MB, '
+          f'{os.cpu_count()} cpu(s)')
+
+    st = time.perf_counter()
+    count = len(Tokenizer(source).all_tokens())
+    serial = time.perf_counter() - st
+    print(f'serial: {count} tokens in {serial:.3f}s')
+
+    workers = 1
+    while workers <= max_workers:
+        st = time.perf_counter()
+        tokens = tokenize_parallel(source, workers=workers, min_size=0)
+        seconds = time.perf_counter() - st
+        assert len(tokens) == count
+        print(f'{workers:>6}: {seconds:.3f}s, speedup {serial / seconds:.2f}x')
+        workers *= 2
+
+    st = time.perf_counter()
+    count = len(C0ASTParser(tokens, AstArena()).parse().arena)
+    serial = time.perf_counter() - st
+    print(f'serial: {count} nodes in {serial:.3f}s')
+
+    workers = 2
+    while workers <= max_workers:
+        st = time.perf_counter()
+        ast = parse_parallel(tokens, workers=workers, min_size=0)
+        seconds = time.perf_counter() - st
+        assert len(ast.arena) == count
+        print(f'{workers:>6}: {seconds:.3f}s, speedup {serial / seconds:.2f}x')
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4096,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1)
@@ -0,0 +1,60 @@
+"""
+Time, nodes allocated, memory held by the tree, as objects and in an
+`AstArena`, of `C0ASTParser` on every shape of program of
+`bench.generator`. See `bench.bench_nesting` for deep nesting.
+
+Run from `src/`:
+    python -m bench.bench_parser [size_in_kb]
+"""
+import sys
+import time
+import tracemalloc
+from analyser.arena import AstArena
+from analyser.parser import C0ASTParser
+from bench.generator import generate_program, shapes
+from tokenizer import Tokenizer
+
+
+def count_nodes(ast) -> int:
+    count = 0
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+
+def held_memory(tokens, builder=None) -> int:
+    """
+    Memory still held once parsed, traced apart as tracing slows parsing
+    """
+    tracemalloc.start()
+    ast = C0ASTParser(tokens, builder).parse()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ast
+    return size
+
+
+def main(size_kb: int):
+    for name in shapes:
+        tokens = Tokenizer(generate_program(size_kb * 1024, name)).all_tokens()
+        st = time.perf_counter()
+        ast = C0ASTParser(tokens).parse()
+        seconds = time.perf_counter() - st
+        nodes = count_nodes(ast)
+        del ast
+
+        size = held_memory(tokens)
+        arena = AstArena()
+        arena_size = held_memory(tokens, arena)
+
+        print(f'{name:>10}: {len(tokens):>8} tokens, {nodes:>8} nodes '
+              f'({nodes / len(tokens):.2f}/token, {size / nodes:.0f} B/node, '
+              f'arena {arena_size / len(arena):.0f} B/node), '
+              f'{seconds:.3f}s, {len(tokens) / seconds:,.0f} tokens/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
@@ -0,0 +1,38 @@
+"""
+Latency of `Tokenizer.retokenize` for small edits, against tokenizing the
+whole edited source again.
+
+Run from `src/`:
+    python -m bench.bench_retokenize [size_in_kb] [edits]
+"""
+import random
+import sys
+import time
+from bench.generator import generate_source
+from tokenizer import Tokenizer
+
+
+def main(size_kb: int, edits: int):
+    source = generate_source(size_kb * 1024)
+    print(f'source: {len(source) / 2 ** 20:.2f} MB')
+
+    st = time.perf_counter()
+    count = len(Tokenizer(source).all_tokens())
+    print(f'  full: {count} tokens in {time.perf_counter() - st:.3f}s')
+
+    tokenizer = Tokenizer(source)
+    tokenizer.retokenize((0, 0), '')
+    rnd = random.Random(0)
+    st = time.perf_counter()
+    for _ in range(edits):
+        # type a space at the end of a random line
+        offset = tokenizer.text.find('\n', rnd.randrange(len(source)))
+        tokenizer.retokenize((offset, offset), ' ')
+    seconds = time.perf_counter() - st
+    print(f' edits: {edits} in {seconds:.3f}s, '
+          f'{seconds / edits * 1000:.2f}ms per edit')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
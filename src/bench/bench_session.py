@@ -0,0 +1,45 @@
+"""
+Latency of `CompileSession.edit` for edits of one function body, against
+compiling the whole edited source again.
+
+Run from `src/`:
+    python -m bench.bench_session [size_in_kb] [edits]
+"""
+import random
+import sys
+import time
+from analyser import Analyser, CompileSession
+from bench.generator import generate_program
+from tokenizer import Tokenizer
+
+
+def main(size_kb: int, edits: int):
+    source = generate_program(size_kb * 1024)
+    print(f'source: {len(source) / 2 ** 20:.2f} MB')
+
+    st = time.perf_counter()
+    tokenizer = Tokenizer(source)
+    elf = Analyser(tokenizer.all_tokens(), tokenizer.names).generate()
+    print(f'  full: {len(elf.functions)} functions in '
+          f'{time.perf_counter() - st:.3f}s')
+
+    session = CompileSession(source)
+    session.compile()
+    rnd = random.Random(0)
+    recompiled = 0
+    st = time.perf_counter()
+    for _ in range(edits):
+        # change the literal `int h = 0x7f;` of a random function
+        offset = session.tokenizer.text.find(
+            '0x7', rnd.randrange(len(source) - 1024)) + 3
+        session.edit((offset, offset + 1), rnd.choice('0123456789abcdef'))
+        recompiled += len(session.recompiled)
+    seconds = time.perf_counter() - st
+    print(f' edits: {edits} in {seconds:.3f}s, '
+          f'{seconds / edits * 1000:.2f}ms per edit, '
+          f'{recompiled / edits:.1f} functions compiled per edit')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
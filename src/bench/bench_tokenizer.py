@@ -0,0 +1,133 @@
+"""
+Throughput and peak memory of `Tokenizer.all_tokens` on every shape of
+program of `bench.generator`, checked against JSON baselines.
+
+Run from `src/`:
+    python -m bench.bench_tokenizer             # report
+    python -m bench.bench_tokenizer --save      # record the baselines
+    python -m bench.bench_tokenizer --check     # exit 1 on a regression
+
+A check runs at the size of the baselines and fails when tokens/s drops,
+or peak memory grows, by more than the tolerance, or when the number of
+tokens differs. Timings depend on the machine, so baselines are kept out
+of the repository, in `bench/baselines/`: record them with `--save` on the
+machine that checks them, before the change to check.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from bench.generator import generate_program, shapes
+from tokenizer import Tokenizer
+
+baseline_path = os.path.join(os.path.dirname(__file__), 'baselines',
+                             'tokenizer.json')
+
+
+def measure(source: str, repeat: int) -> dict:
+    """
+    Best time of `repeat` runs, then peak memory of one more run traced by
+    `tracemalloc`, which slows down the run it traces
+    """
+    best = float('inf')
+    count = 0
+    for _ in range(repeat):
+        st = time.perf_counter()
+        count = len(Tokenizer(source).all_tokens())
+        best = min(best, time.perf_counter() - st)
+
+    tracemalloc.start()
+    tokens = Tokenizer(source).all_tokens()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+
+    size = len(source.encode('utf-8'))
+    return {
+        'tokens': count,
+        'tokens_per_s': count / best,
+        'mb_per_s': size / 2 ** 20 / best,
+        'peak_mb': peak / 2 ** 20,
+    }
+
+
+def run(size_kb: int, names: list, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        source = generate_program(size_kb * 1024, name)
+        results[name] = result = measure(source, repeat)
+        print(f'{name:>10}: {result["tokens"]:>8} tokens, '
+              f'{result["tokens_per_s"]:>10,.0f} tokens/s, '
+              f'{result["mb_per_s"]:6.2f} MB/s, '
+              f'peak {result["peak_mb"]:7.2f} MB')
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Descriptions of the regressions of `results` against `baseline`
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline['results'].get(name)
+        if expected is None:
+            continue
+        if result['tokens'] != expected['tokens']:
+            regressions.append(f'{name}: {result["tokens"]} tokens, '
+                               f'baseline has {expected["tokens"]}')
+        if result['tokens_per_s'] < expected['tokens_per_s'] * (1 - tolerance):
+            regressions.append(f'{name}: {result["tokens_per_s"]:,.0f} '
+                               f'tokens/s, baseline has '
+                               f'{expected["tokens_per_s"]:,.0f}')
+        if result['peak_mb'] > expected['peak_mb'] * (1 + tolerance):
+            regressions.append(f'{name}: peak {result["peak_mb"]:.2f} MB, '
+                               f'baseline has {expected["peak_mb"]:.2f}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--size', type=int, default=256,
+                        help='size of each program in KB')
+    parser.add_argument('--shapes', nargs='+', choices=list(shapes),
+                        default=list(shapes))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=baseline_path)
+    parser.add_argument('--tolerance', type=float, default=0.3)
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--save', action='store_true')
+    action.add_argument('--check', action='store_true')
+    args = parser.parse_args()
+
+    if args.check:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            sys.exit(f'No baseline at {args.baseline}, record one with --save')
+        args.size = baseline['size_kb']
+
+    results = run(args.size, args.shapes, args.repeat)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump({'size_kb': args.size,
+                       'python': platform.python_version(),
+                       'results': results}, file, indent=2)
+            file.write('\n')
+        print(f'baseline saved to {args.baseline}')
+    elif args.check:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'regression: {regression}')
+        if regressions:
+            sys.exit(1)
+        print('no regression')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Synthetic C0 programs of a given size and shape, for the benchmarks.
+
+Every shape is a valid C0 program, which the analyser compiles: units,
+one function each, are repeated until the program reaches the requested
+size, then a `main` is appended. Programs are deterministic for a seed.
+
+    mixed       declarations, expressions, literals and comments
+    literal     mostly integer, float, char and string literals
+    comment     mostly block and line comments
+    identifier  mostly long identifiers, in declarations and assignments
+    nested      blocks and parentheses nested `depth` levels deep
+"""
+import random
+import string
+
+sample = '''/*
+ * generated function, comments are skipped by the lexer
+ */
+int func{n}(int a, double b, char c) {{
+    double r = a * b / (c + 1.5e-3);
+    int h = 0x7f;
+    // line comment
+    if (a <= {n}) {{
+        print("value of func{n}\\n", r, 'x', '\\x41');
+    }}
+    while (h != 0) h = h - 1;
+    return (int)r + h;
+}}
+'''
+
+main_function = '''int main() {
+    return 0;
+}
+'''
+
+escapes = ['\\n', '\\t', '\\\\', "\\'", '\\"', '\\x41', '\\x7e']
+
+
+def mixed_unit(n: int, rnd: random.Random, depth: int) -> str:
+    return sample.format(n=n)
+
+
+def literal_unit(n: int, rnd: random.Random, depth: int) -> str:
+    def literal():
+        kind = rnd.randrange(5)
+        if kind == 0:
+            return str(rnd.randrange(2 ** 31))
+        if kind == 1:
+            return hex(rnd.randrange(2 ** 31))
+        if kind == 2:
+            return f'{rnd.randrange(10 ** 6)}.{rnd.randrange(10 ** 3)}' \
+                   f'e{rnd.choice("+-")}{rnd.randrange(30)}'
+        if kind == 3:
+            return f"'{rnd.choice(escapes + list('abcxyz09'))}'"
+        chars = [rnd.choice(escapes + list(string.ascii_letters + ' '))
+                 for _ in range(rnd.randrange(1, 24))]
+        return '"' + ''.join(chars) + '"'
+
+    lines = [f'void lit{n}() {{']
+    for _ in range(8):
+        lines.append(f'    print({", ".join(literal() for _ in range(6))});')
+    lines.append('}\n')
+    return '\n'.join(lines)
+
+
+def comment_unit(n: int, rnd: random.Random, depth: int) -> str:
+    def words(count: int) -> str:
+        return ' '.join(''.join(rnd.choice(string.ascii_lowercase)
+                                for _ in range(rnd.randrange(2, 9)))
+                        for _ in range(count))
+
+    lines = ['/*']
+    lines.extend(f' * {words(10)}' for _ in range(6))
+    lines.append(' */')
+    lines.append(f'int com{n}(int a) {{')
+    for _ in range(4):
+        lines.append(f'    // {words(8)}')
+        lines.append(f'    a = a + 1; /* {words(6)} */')
+    lines.append('    return a;')
+    lines.append('}\n')
+    return '\n'.join(lines)
+
+
+def identifier_unit(n: int, rnd: random.Random, depth: int) -> str:
+    names = [''.join(rnd.choice(string.ascii_letters)
+                     for _ in range(rnd.randrange(6, 16))) + f'{n}k{k}'
+             for k in range(8)]
+    declarators = ', '.join(f'{name} = {names[0]}' for name in names[2:])
+    lines = [f'int ident{n}(int {names[0]}, int {names[1]}) {{',
+             f'    int {declarators};']
+    for _ in range(12):
+        target, *operands = rnd.sample(names, 4)
+        lines.append(f'    {target} = {operands[0]} + {operands[1]} '
+                     f'* {operands[2]};')
+    lines.append(f'    return {names[-1]};')
+    lines.append('}\n')
+    return '\n'.join(lines)
+
+
+def nested_unit(n: int, rnd: random.Random, depth: int) -> str:
+    lines = [f'int nest{n}(int a) {{']
+    indent = '    '
+    for level in range(depth):
+        keyword = 'if' if level % 2 == 0 else 'while'
+        lines.append(f'{indent}{keyword} (a > {level}) {{')
+        indent += '    '
+    lines.append(f'{indent}a = {"(" * depth}a{" - 1)" * depth};')
+    for level in range(depth):
+        indent = indent[4:]
+        lines.append(f'{indent}}}')
+    lines.append('    return a;')
+    lines.append('}\n')
+    return '\n'.join(lines)
+
+
+shapes = {
+    'mixed': mixed_unit,
+    'literal': literal_unit,
+    'comment': comment_unit,
+    'identifier': identifier_unit,
+    'nested': nested_unit,
+}
+
+
+def generate_program(size: int, shape: str = 'mixed', seed: int = 0,
+                     depth: int = 32) -> str:
+    """
+    A C0 program of `shape` of at least `size` chars
+    """
+    unit = shapes[shape]
+    rnd = random.Random(seed)
+    parts = []
+    total = 0
+    n = 0
+    while total < size:
+        part = unit(n, rnd, depth)
+        parts.append(part)
+        total += len(part)
+        n += 1
+    parts.append(main_function)
+    return ''.join(parts)
+
+
+def generate_source(size: int) -> str:
+    return generate_program(size, 'mixed')
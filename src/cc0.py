@@ -1,8 +1,8 @@
 #! /usr/bin/python3
 import sys
 from typing import List, Dict
-from tokenizer import Tokenizer
-from analyser import Analyser
+from tokenizer import Tokenizer, TokenCache, tokenize_parallel
+from analyser import Analyser, ParserCounters
 from exception.parser_exceptions import ParserException
 from exception.analyser_exceptions import AnalyserException
 from exception.symbol_table_exceptions import SymbolTableException
@@ -14,6 +14,17 @@ def print_error_msg_and_exit(msg):
     exit(1)
 
 
+def read_source_line(file, row: int) -> str:
+    """
+    Read line `row` of `file` again, the tokenizer does not keep the source
+    """
+    file.seek(0)
+    for idx, line in enumerate(file):
+        if idx == row:
+            return line if line.endswith('\n') else line + '\n'
+    return '\n'
+
+
 if __name__ == '__main__':
     help_info = '''Usage:
       cc0 [options] input [-o file]
@@ -24,15 +35,19 @@ if __name__ == '__main__':
       -c        将输入的 c0 源代码翻译为二进制目标文件
       -h        显示关于编译器使用的帮助
       -o file   输出到指定的文件 file, 默认输出到 out 文件
+      -t dir    将词法分析的结果缓存在目录 dir 中
+      -j n      用 n 个进程并行地进行词法分析和语法分析
       -a        输出抽象语法树到标准输出
       -A        输出详细的抽象语法树到标准输出
+      -p        输出语法分析读取与回退的记号数, 以及每条文法规则的调用次数与耗时到标准错误
+                不能与大于 1 的 -j 同时使用
     '''
 
     args: List[str] = sys.argv[1:]
     options: Dict[str, int] = {}
     for idx, arg in enumerate(args):
         if arg.startswith('-'):
-            if arg not in ['-s', '-c', '-h', '-o', '-a', '-A']:
+            if arg not in ['-s', '-c', '-h', '-o', '-t', '-j', '-a', '-A', '-p']:
                 print_error_msg_and_exit(f'Invalid option {arg}')
             options[arg] = idx
 
@@ -64,13 +79,40 @@ if __name__ == '__main__':
     if out_file is sys.stdout:
         out_file = open('./out', mode)
 
+    token_cache = None
+    if '-t' in args:
+        cache_dir_index = options['-t'] + 1
+        if cache_dir_index == len(args):
+            print_error_msg_and_exit('Missing value of -t option')
+        try:
+            token_cache = TokenCache(args[cache_dir_index])
+        except OSError:
+            print_error_msg_and_exit(
+                f'Cannot use cache directory {args[cache_dir_index]}')
+
+    workers = 1
+    if '-j' in args:
+        workers_index = options['-j'] + 1
+        if workers_index == len(args):
+            print_error_msg_and_exit('Missing value of -j option')
+        try:
+            workers = int(args[workers_index])
+        except ValueError:
+            workers = 0
+        if workers < 1:
+            print_error_msg_and_exit(
+                f'Invalid value of -j option {args[workers_index]}')
+    if workers > 1 and '-p' in args:
+        # the parser of each worker runs in its own process
+        print_error_msg_and_exit('Please specify `-p` or `-j` above 1, not both')
+
     # for typing convenience, not necessarily `sys.stdin`
     in_file = sys.stdin
     i = 0
     while i < len(args):
         arg = args[i]
         if arg.startswith('-'):
-            if arg == '-o':
+            if arg in ['-o', '-t', '-j']:
                 i += 1
             i += 1
             continue
@@ -82,10 +124,20 @@ if __name__ == '__main__':
     if in_file is sys.stdin:
         print_error_msg_and_exit(f'No input file')
 
-    tokenizer = Tokenizer(in_file.read())
     try:
-        tokens = tokenizer.all_tokens()
-        analyser = Analyser(tokens)
+        if token_cache is None and workers > 1:
+            tokens = tokenize_parallel(in_file.read(), workers)
+            names = tokens.names
+        elif token_cache is None:
+            # tokenized as the parser reads them
+            tokenizer = Tokenizer.from_file(in_file)
+            tokens = tokenizer.iter_tokens()
+            names = tokenizer.names
+        else:
+            tokens = token_cache.tokenize(in_file.read())
+            names = tokens.names
+        counters = ParserCounters() if '-p' in args else None
+        analyser = Analyser(tokens, names, workers=workers, trace=counters)
         # analyser.c0_ast.draw()
         elf = analyser.generate()
         if '-s' in args:
@@ -93,13 +145,16 @@ if __name__ == '__main__':
         elif '-c' in args:
             out_file.write(elf.generate_o0())
 
+        if counters is not None:
+            print(counters.report(), file=sys.stderr)
+
         if '-A' in args:
             analyser.c0_ast.draw(draw_full_ast=True)
         elif '-a' in args:
             analyser.c0_ast.draw(draw_full_ast=False)
     except (TokenizerException, ParserException, AnalyserException) as e:
         print(e)
-        print('Source code: ' + tokenizer.source[e.row], end='')
+        print('Source code: ' + read_source_line(in_file, e.row), end='')
         print('\033[91mError at     ' + ' ' * e.col + '^\033[0m')
         raise e
     except SymbolTableException as e:
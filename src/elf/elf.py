@@ -26,8 +26,10 @@ class Constant(object):
 
 
 class Function(object):
-    def __init__(self, name: str, return_type: str, name_idx: int, params_info: List[str], instructions: List[PCode]):
+    def __init__(self, name: str, return_type: str, name_idx: int, params_info: List[str], instructions: List[PCode],
+                 name_id: int = None):
         self.name = name
+        self.name_id = name_id
         self.name_idx = name_idx
         self.return_type = return_type
         self.instructions = instructions
@@ -47,6 +49,8 @@ class ELF(object):
         self.instructions: List[PCode] = []
         self.constants: List[Constant] = []
         self.functions: List[Function] = []
+        # name id of function => index in `self.functions`
+        self.function_ids: Dict[int, int] = {}
         self.start = ...
 
     def add_constant(self, type_: str, value):
@@ -70,46 +74,40 @@ class ELF(object):
             return len(self.functions[-1].instructions)
         return len(self.instructions)
 
-    def add_function(self, return_type: str, func_name: str, name_idx: int, params_info: List[str]):
+    def add_function(self, return_type: str, func_name: str, name_id: int, name_idx: int, params_info: List[str]):
+        """
+        Functions are looked up by `name_id`, the id of `func_name` in the
+        `NameTable` of the analyser
+        """
         assert not self.has_function(
-            func_name), 'Please check function not contained first'
+            name_id), 'Please check function not contained first'
+        self.function_ids[name_id] = len(self.functions)
         self.functions.append(
             Function(name=func_name, return_type=return_type, name_idx=name_idx, params_info=params_info,
-                     instructions=[]))
+                     instructions=[], name_id=name_id))
 
-    def has_function(self, func_name: str) -> bool:
-        for func in self.functions:
-            if func.name == func_name:
-                return True
-        return False
+    def has_function(self, name_id: int) -> bool:
+        return name_id in self.function_ids
 
-    def function_params_info(self, func_name: str) -> List[str]:
+    def function_params_info(self, name_id: int) -> List[str]:
         assert self.has_function(
-            func_name), 'Please check function contained first'
-        for idx, func in enumerate(self.functions):
-            if func.name == func_name:
-                return func.param_info
+            name_id), 'Please check function contained first'
+        return self.functions[self.function_ids[name_id]].param_info
 
-    def function_index(self, func_name: str) -> int:
+    def function_index(self, name_id: int) -> int:
         assert self.has_function(
-            func_name), 'Please check function contained first'
-        for idx, func in enumerate(self.functions):
-            if func.name == func_name:
-                return idx
+            name_id), 'Please check function contained first'
+        return self.function_ids[name_id]
 
-    def function_param_count(self, func_name: str) -> int:
+    def function_param_count(self, name_id: int) -> int:
         assert self.has_function(
-            func_name), 'Please check function contained first'
-        for func in self.functions:
-            if func.name == func_name:
-                return len(func.param_info)
+            name_id), 'Please check function contained first'
+        return len(self.functions[self.function_ids[name_id]].param_info)
 
-    def function_return_type(self, func_name: str) -> str:
+    def function_return_type(self, name_id: int) -> str:
         assert self.has_function(
-            func_name), 'Please check function contained first'
-        for function in self.functions:
-            if function.name == func_name:
-                return function.return_type
+            name_id), 'Please check function contained first'
+        return self.functions[self.function_ids[name_id]].return_type
 
     def current_instructions(self):
         if self.functions:
@@ -1,4 +1,7 @@
-class AnalyserException(Exception):
+from exception.c0_exception import C0Exception
+
+
+class AnalyserException(C0Exception):
     def __init__(self, pos: tuple, msg: str):
         super().__init__(
             f'AnalyserException at (row, col) = {pos[0] + 1, pos[1] + 1}: \033[91m{msg}\033[0m')
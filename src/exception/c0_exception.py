@@ -0,0 +1,4 @@
+class C0Exception(Exception):
+    """
+    Base of the errors the compiler reports in a C0 program
+    """
@@ -1,7 +1,8 @@
 from tokenizer.token import Token
+from exception.c0_exception import C0Exception
 
 
-class ParserException(Exception):
+class ParserException(C0Exception):
     def __init__(self, pos: tuple, msg: str):
         super().__init__(
             f'ParserException at (row, col) = {pos[0] + 1, pos[1] + 1}: \033[91m{msg}\033[0m')
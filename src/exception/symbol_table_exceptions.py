@@ -1,4 +1,7 @@
-class SymbolTableException(Exception):
+from exception.c0_exception import C0Exception
+
+
+class SymbolTableException(C0Exception):
     def __init__(self, msg: str):
         super().__init__(msg)
 
@@ -40,3 +40,8 @@ class CharOverflow(TokenizerException):
 class Integer32Overflow(TokenizerException):
     def __init__(self, row, col, integer: int):
         super().__init__(row, col, f'integer {integer} out of range')
+
+
+class InvalidLiteral(TokenizerException):
+    def __init__(self, row, col, literal: str):
+        super().__init__(row, col, f'literal {literal} has no value')
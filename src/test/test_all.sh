@@ -1,3 +1,3 @@
 export PYTHONPATH=$PYTHONPATH:..
 
-python -m unittest test_tokenizer
\ No newline at end of file
+python -m unittest test_tokenizer test_parser
\ No newline at end of file
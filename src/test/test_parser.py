@@ -0,0 +1,394 @@
+import contextlib
+import io
+import pickle
+import unittest
+from analyser import (Analyser, AstArena, C0ASTParser, CompileSession,
+                      ParserCounters, ParserTrace, SymbolTable, Visitor,
+                      parse_parallel, visits)
+from analyser.symbol_table import SymbolAttrs
+from analyser.ast import Ast, AstType, expression_kinds
+from tokenizer import Tokenizer, tokenize_parallel
+from exception.parser_exceptions import *
+from exception.analyser_exceptions import (
+    ArgumentsNumberNotMatchException, MissingMain)
+from exception.symbol_table_exceptions import (
+    FunctionTypeHasNoOffsetAttribute, SymbolNotFound)
+from tokenizer import TokenType
+
+
+def parse_return_expression(expression: str):
+    """
+    Expression node of `return <expression>;` in `main`
+    """
+    source = f'int main() {{ return {expression}; }}'
+    ast = C0ASTParser(Tokenizer(source).all_tokens()).parse()
+    compound_statement = ast.first_child().children[-1]
+    statement = compound_statement.children[1].first_child()
+    return_statement = statement.first_child().first_child()
+    return return_statement.children[1]
+
+
+def analyse(source: str, iterator=False, **kwargs) -> Analyser:
+    """
+    `Analyser` of `source` with the names of its tokenizer
+    """
+    tokenizer = Tokenizer(source)
+    tokens = tokenizer.iter_tokens() if iterator else tokenizer.all_tokens()
+    return Analyser(tokens, tokenizer.names, **kwargs)
+
+
+class TestParser(unittest.TestCase):
+    def test_precedence(self):
+        def shape(node):
+            if node.kind == AstType.BINARY_OP:
+                return f'({shape(node.left)}{node.op.literal}{shape(node.right)})'
+            if node.kind == AstType.UNARY:
+                return f'{node.op.literal}{shape(node.operand)}'
+            if node.kind == AstType.CAST:
+                types = ''.join(f'({token.literal})' for token in node.types)
+                return f'{types}{shape(node.operand)}'
+            if node.kind == AstType.CALL:
+                return f'{node.name.literal}[{",".join(map(shape, node.args))}]'
+            return node.first.literal if node.kind == AstType.VAR \
+                else node.token.literal
+
+        for expression, expected in [
+            ('1', '1'),
+            ('1 - 2 - 3', '((1-2)-3)'),
+            ('1 + 2 * 3 - 4 / 5', '((1+(2*3))-(4/5))'),
+            ('(1 + 2) * 3', '((1+2)*3)'),
+            ('-a * +b', '(-a*+b)'),
+            ('(int)(double)-a / 2', '((int)(double)-a/2)'),
+            ('(int)(a + 1)', '(int)(a+1)'),
+            ('f(1, g() * 2) + 3', '(f[1,(g[]*2)]+3)'),
+        ]:
+            self.assertEqual(expected,
+                             shape(parse_return_expression(expression)))
+
+    def test_first_token(self):
+        # columns count from 1, `return` is at column 14
+        node = parse_return_expression('((a)) * b')
+        self.assertEqual((0, 21), node.first.st_pos)
+        self.assertEqual((0, 21), node.left.first.st_pos)
+        self.assertEqual((0, 23), node.left.token.st_pos)
+        self.assertEqual((0, 29), node.right.first.st_pos)
+
+        # spans run from the first char to past the last char of the node,
+        # parentheses and the ')' of a call included
+        source = 'int main() { int a = ((a)) * f(b, (c)); return a; }'
+        ast = C0ASTParser(Tokenizer(source).all_tokens()).parse()
+        function = ast.first_child()
+        self.assertEqual(source[source.index('int main'):],
+                         source[slice(*function.span)])
+        declarator = function.children[-1].children[1].children[1] \
+            .first_child()
+        self.assertEqual('a = ((a)) * f(b, (c))',
+                         source[slice(*declarator.span)])
+        expression = declarator.children[1].children[1]
+        self.assertEqual('((a)) * f(b, (c))', source[slice(*expression.span)])
+        self.assertEqual('f(b, (c))', source[slice(*expression.right.span)])
+        self.assertEqual((0, 22), expression.st_pos)
+
+    def test_invalid_expression(self):
+        for expression in ['1 +', '- -a', '(int)', '(1', 'a b']:
+            with self.assertRaises(ParserException, msg=expression):
+                parse_return_expression(expression)
+        with self.assertRaises(InvalidExpression):
+            parse_return_expression('2 * ;')
+
+    def test_frozen_nodes(self):
+        source = 'int g = 1; int main() { print(g * 2, "s"); return g; }'
+        stack = [C0ASTParser(Tokenizer(source).all_tokens()).parse()]
+        while stack:
+            node = stack.pop()
+            self.assertFalse(hasattr(node, '__dict__'), node.type)
+            self.assertIsInstance(node.kind, int)
+            self.assertIsInstance(node.children, tuple)
+            stack.extend(node.children)
+        self.assertEqual('<C0-root>', Ast(AstType.C0).type)
+        self.assertEqual('BINARY_OP', parse_return_expression('1 + 2').type)
+
+    def test_token_iterator(self):
+        source = '''
+        int g = 1, h;
+        int f(int a) { return a * g; }
+        int main() { h = f(2) + (3); f(h); return h; }'''
+        elf = analyse(source).generate()
+        streamed = analyse(source, iterator=True).generate()
+        self.assertEqual(elf.generate_s0(), streamed.generate_s0())
+
+        # a syntax error is found before the tokenizer reaches the next line
+        with self.assertRaises(ExpectedSymbol):
+            analyse('int main() { f(1; }\n@', iterator=True)
+
+    def test_mixed_arithmetic(self):
+        source = '''
+        double f(int a, char c) { return a / c; }
+        int main() {
+            int a = 1;
+            double d = 2.5;
+            print(a + d * (int)d - f(a, 'x') / -a);
+            return 0;
+        }'''
+        elf = analyse(source).generate()
+        main = [str(inst).split()[0] for inst in elf.functions[1].instructions]
+        self.assertEqual(['LOADA', 'ILOAD', 'I2D', 'LOADA', 'DLOAD',
+                          'LOADA', 'DLOAD', 'D2I', 'I2D', 'DMUL', 'DADD',
+                          'LOADA', 'ILOAD', 'BIPUSH', 'CALL', 'LOADA',
+                          'ILOAD', 'INEG', 'I2D', 'DDIV', 'DSUB', 'DPRINT'],
+                         main[8:-5])
+
+    def test_deep_nesting(self):
+        # far deeper than the recursion limit
+        depth = 5000
+        sources = [
+            f'int main() {{ return {"(" * depth}1{")" * depth}; }}',
+            f'int main() {{ return {"1-(" * depth}1{")" * depth}; }}',
+            f'int main() {{ return 1{"-1" * depth}; }}',
+            f'int f(int a) {{ return a; }}\n'
+            f'int main() {{ return {"f(" * depth}1{")" * depth}; }}',
+            f'int main() {{ {"{" * depth}{"}" * depth} return 0; }}',
+            f'int main() {{ int a = 1; {"if (a) " * depth}a = 0; return a; }}',
+            f'int main() {{ int a = 0; {"while (a) " * depth}a = 1; return a; }}',
+        ]
+        for source in sources:
+            analyse(source).generate()
+
+        with self.assertRaises(ExpectedSymbol):
+            analyse(f'int main() {{ return {"(" * depth}1; }}')
+
+    def test_parse_parallel(self):
+        functions = [f'int f{n}(int a) {{ if (a) {{ a = a - {n}; }} return a; }}'
+                     for n in range(12)]
+        source = 'const int n = 1;\n' + '\n'.join(functions) + \
+            '\nint main() { return f3(n); }'
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.all_tokens()
+        serial = C0ASTParser(tokens, AstArena()).parse()
+        parallel = parse_parallel(tokens, 2, min_size=0)
+        self.assertEqual(serial.arena.to_bytes(), parallel.arena.to_bytes())
+        elf = Analyser(tokens, tokenizer.names, workers=2).generate()
+        # the ids of a buffer are those of its own table
+        buffer = tokenize_parallel(source, 2, min_size=0)
+        self.assertEqual(elf.generate_s0(),
+                         Analyser(buffer, buffer.names).generate().generate_s0())
+        with self.assertRaises(ValueError):
+            Analyser(buffer, tokenizer.names)
+        self.assertEqual(
+            Analyser(tokens, tokenizer.names).generate().generate_s0(),
+            elf.generate_s0())
+
+        # programs without tokens, as `cc0 -j` tokenizes them
+        for source in ['', '/* only a comment */']:
+            buffer = tokenize_parallel(source, 2, min_size=0)
+            with self.assertRaises(MissingMain, msg=source) as raised:
+                Analyser(buffer, buffer.names, workers=2).generate()
+            self.assertEqual((0, 0),
+                             (raised.exception.row, raised.exception.col))
+
+        # the earliest error is raised, whichever run it is in
+        functions[9] = 'int g() { return 1 }'
+        functions[4] = 'int h() { return (1; }'
+        functions.append('int x;')
+        tokens = Tokenizer('\n'.join(functions)).all_tokens()
+        with self.assertRaises(ExpectedSymbol) as raised:
+            parse_parallel(tokens, 2, min_size=0)
+        self.assertEqual((4, 19), (raised.exception.row, raised.exception.col))
+
+    def test_visitor(self):
+        class Variables(Visitor):
+            # names of the variables read, in the order of the tree
+            def __init__(self):
+                super().__init__()
+                self.names = []
+
+            @visits(AstType.VAR)
+            def var(self, node):
+                self.names.append(node.token.literal)
+
+            @visits(AstType.BINARY_OP)
+            def binary_op(self, node):
+                self.visit(node.left)
+                self.visit(node.right)
+
+        variables = Variables()
+        variables.visit(parse_return_expression('a * b - c'))
+        self.assertEqual(['a', 'b', 'c'], variables.names)
+        with self.assertRaises(AstException):
+            variables.visit(parse_return_expression('-a'))
+
+        # kinds are only checked in debug mode
+        source = 'int g; int main() { g = 1; return g; }'
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.all_tokens()
+        elf = Analyser(tokens, tokenizer.names, debug=True).generate()
+        self.assertEqual(
+            Analyser(tokens, tokenizer.names).generate().generate_s0(),
+            elf.generate_s0())
+        declaration = C0ASTParser(tokens).parse().first_child()
+        analyser = Analyser(None, tokenizer.names, debug=True)
+        with self.assertRaises(AssertionError), \
+                contextlib.redirect_stdout(io.StringIO()):
+            analyser.generate_functions([declaration], analyser.symbol_table,
+                                        analyser.elf)
+
+    def test_trace(self):
+        class Rules(ParserTrace):
+            def __init__(self):
+                self.events = []
+
+            def enter(self, rule: str):
+                self.events.append(rule)
+
+            def exit(self, rule: str):
+                self.events.append('/' + rule)
+
+        source = 'int g = 1; int main() { g = 2; print(g); return g; }'
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.all_tokens()
+        rules = Rules()
+        counters = ParserCounters()
+        traced = Analyser(tokens, tokenizer.names, trace=rules).generate()
+        with self.assertRaises(ValueError):
+            Analyser(tokens, tokenizer.names, workers=2, trace=rules)
+        Analyser(tokens, tokenizer.names, trace=counters).generate()
+        self.assertEqual(
+            Analyser(tokens, tokenizer.names).generate().generate_s0(),
+            traced.generate_s0())
+
+        # every rule entered is left, generators of statements included
+        self.assertEqual(['c0', 'variable_declaration'], rules.events[:2])
+        self.assertEqual('/c0', rules.events[-1])
+        self.assertEqual(rules.events.count('statement'),
+                         rules.events.count('/statement'))
+        self.assertEqual(3, counters.rules['statement'].calls)
+
+        # the declaration is read ahead to tell it from a function, and so
+        # are the statements starting with an identifier
+        self.assertEqual(3 + 3, counters.rules['c0'].unread)
+        self.assertEqual(2, counters.rules['statement'].unread)
+        self.assertEqual(len(tokens) + counters.unread, counters.tokens)
+        self.assertIn('statement', counters.report())
+
+        # rules are left on errors too
+        with self.assertRaises(ExpectedSymbol):
+            analyse('int main() { f(1; }', trace=counters)
+        self.assertEqual([], counters.stack)
+
+    def test_symbol_table(self):
+        table = SymbolTable()
+        a, b, f = (table.names.intern(name) for name in 'abf')
+        table.enter_level()
+        table.add_symbol(a, {SymbolAttrs.TYPE: TokenType.DOUBLE})
+        table.add_symbol(f, {SymbolAttrs.IS_FUNC: True})
+        table.enter_level(new_stack=True)
+        table.add_symbol(b, {SymbolAttrs.TYPE: TokenType.INT})
+        table.enter_level()
+        table.add_symbol(a, {SymbolAttrs.TYPE: TokenType.CHAR,
+                             SymbolAttrs.CONSTNESS: True})
+
+        # the innermost declaration, offsets go on from the enclosing level
+        # of the same stack
+        self.assertEqual(TokenType.CHAR, table.get_type(a))
+        self.assertTrue(table.is_const(a))
+        self.assertEqual((0, 1), table.get_offset(a))
+        with self.assertRaises(FunctionTypeHasNoOffsetAttribute):
+            table.get_offset(f)
+        self.assertTrue(table.is_function(f))
+
+        table.exit_level()
+        self.assertEqual(TokenType.DOUBLE, table.get_type(a))
+        self.assertEqual((1, 0), table.get_offset(a))
+        table.exit_level()
+        self.assertNotIn(b, table)
+        with self.assertRaises(SymbolNotFound):
+            table.get_type(b)
+        self.assertEqual((0, 0), table.get_offset(a))
+        self.assertEqual(2, table.global_level().next_offset)
+
+    def test_compile_session(self):
+        source = '''int g = 1;
+        int f(int a) { return a + g; }
+        double h(double d) { print("h"); return d * 2; }
+        int k() { return f(1); }
+        int main() { print(h(1.5)); return k(); }'''
+        session = CompileSession(source)
+        session.compile()
+
+        def edit(old: str, new: str):
+            nonlocal source
+            st = source.index(old)
+            source = source[:st] + new + source[st + len(old):]
+            elf = session.edit((st, st + len(old)), new)
+            expected = analyse(source).generate()
+            self.assertEqual(expected.generate_s0(), elf.generate_s0())
+            self.assertEqual(expected.generate_o0(), elf.generate_o0())
+            return session.recompiled
+
+        # only the edited function, then its callers if the signature changed
+        self.assertEqual(['h'], edit('d * 2', 'd * 3'))
+        self.assertEqual(['h'], edit('print("h")', 'print("h2", 0.5)'))
+        self.assertEqual(['f'], edit('a + g', 'a * g'))
+        self.assertEqual(['f', 'k'], edit('int a', 'char a'))
+        self.assertEqual(['e', 'f'], edit('int f', 'void e() {}\n int f'))
+        self.assertEqual(['main'], edit('return k', 'return\n k'))
+
+        # errors are the ones of a whole compilation, which the next edit
+        # does again
+        with self.assertRaises(ArgumentsNumberNotMatchException):
+            edit('f(1)', 'f()')
+        self.assertEqual(['e', 'f', 'h', 'k', 'main'], edit('f()', 'f(2)'))
+        self.assertEqual(['k'], edit('f(2)', 'f(3)'))
+
+        # so do edits of the declarations
+        self.assertEqual(['e', 'f', 'h', 'k', 'main'], edit('g = 1', 'g = 2'))
+
+    def test_arena(self):
+        source = '''
+        const int n = 3;
+        double f(int a, char c) { return (a) / c; }
+        int main() {
+            double d = (double)(int)2.5;
+            if (d < n) print("less", f(n, 'x') * -d);
+            scan(d);
+            return 0;
+        }'''
+
+        def walk(node):
+            if node.kind in expression_kinds:
+                shape = [node.type, node.label()]
+            else:
+                shape = [node.type, node.token and node.token.literal]
+            return shape + [walk(child) for child in node.children]
+
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.all_tokens()
+        ast = C0ASTParser(tokens).parse()
+        arena = AstArena()
+        root = pickle.loads(pickle.dumps(
+            C0ASTParser(tokens, arena).parse().arena)).root
+        self.assertEqual(walk(ast), walk(root))
+
+        # spans run from the first char to past the last char of the node
+        function = root.children[1]
+        expression = function.children[-1].children[1].first_child() \
+            .first_child().first_child().children[1]
+        self.assertEqual('(a) / c', source[slice(*expression.span)])
+        self.assertEqual((2, 42), expression.st_pos)
+        declarators = root.first_child().children[-2]
+        self.assertEqual('n = 3', source[slice(*declarators.span)])
+
+        elf = Analyser(tokens, tokenizer.names).generate()
+        arena_elf = Analyser(tokens, tokenizer.names, builder=AstArena()).generate()
+        self.assertEqual(elf.generate_s0(), arena_elf.generate_s0())
+
+        # nodes without tokens are at the start, as in the object tree
+        for source in ['', '/* only a comment */']:
+            with self.assertRaises(MissingMain, msg=source) as raised:
+                analyse(source, builder=AstArena()).generate()
+            self.assertEqual((0, 0),
+                             (raised.exception.row, raised.exception.col))
+
+
+if __name__ == '__main__':
+    unittest.main()
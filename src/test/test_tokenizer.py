@@ -1,8 +1,24 @@
+import io
+import os
+import tempfile
 import unittest
-from tokenizer import Tokenizer, CharSets
+from tokenizer import (Tokenizer, MappedTokenizer, TokenBuffer, TokenCache,
+                       TokenStream, CharSets, tokenize_parallel)
 from tokenizer.token import TokenType
 from exception.tokenizer_exceptions import *
 
+token_fields = ('literal', 'tok_type', 'value', 'st_pos', 'ed_pos', 'name_id')
+offset_fields = ('literal', 'tok_type', 'st', 'ed', 'st_pos', 'ed_pos')
+
+
+def describe_tokens(tokens, fields=token_fields) -> list:
+    """
+    Tuples of the `fields` of `tokens`, to compare tokens of different
+    tokenizers or containers
+    """
+    return [tuple(getattr(token, field) for field in fields)
+            for token in tokens]
+
 
 class TestTokenizer(unittest.TestCase):
     def __init__(self, methodName):
@@ -125,6 +141,17 @@ class TestTokenizer(unittest.TestCase):
 
         self.assertRaises(InvalidCharacter, Tokenizer('🙈').all_tokens)
 
+        for source in ['/* 🙈 **/ int', '//🙈\rint', '/*/ 🙈 */int']:
+            for tkz in [Tokenizer(source),
+                        Tokenizer.from_file(io.StringIO(source), 2)]:
+                self.assertEqual(['int'], [token.literal
+                                           for token in tkz.iter_tokens()])
+                tkz = Tokenizer(source)
+                self.assertEqual('int', tkz.dfa_next_token().literal)
+        self.assertEqual([], Tokenizer('/* not closed\nint').all_tokens())
+        self.assertEqual([], Tokenizer('/* not closed *').all_tokens())
+        self.assertRaises(InvalidCharacter, Tokenizer('/**/🙈').all_tokens)
+
     def test_char_literal(self):
         tkz = Tokenizer('''
         char a = '3';
@@ -187,3 +214,219 @@ class TestTokenizer(unittest.TestCase):
                 self.assertEqual(token.tok_type, TokenType.RIGHT_PARENTHESES)
             else:
                 self.assertEqual(token.tok_type, TokenType.SEMICOLON)
+
+    def test_literal_values(self):
+        tokens = Tokenizer('''0 2147483647 0x7F 0XaB 1. .5 1e3 2.5E-1
+        'a' '\\\\' '\\'' '\\x41' "a\\tb\\x0a\\"c" "'"''').all_tokens()
+        self.assertEqual([0, 2147483647, 0x7f, 0xab, 1., .5, 1e3, 2.5e-1,
+                          'a', '\\', '\'', 'A', 'a\tb\n"c', "'"],
+                         [token.value for token in tokens])
+
+        # decoded lazily, errors are raised on access to `value`
+        for source, exception in [('2147483648', Integer32Overflow),
+                                  ('0x100000000', Integer32Overflow),
+                                  ('.', InvalidLiteral)]:
+            token = Tokenizer(' ' + source).next_token()
+            with self.assertRaises(exception) as cm:
+                token.value
+            self.assertEqual((0, 2), (cm.exception.row, cm.exception.col))
+
+    def test_token_offsets(self):
+        source = 'int a;\n  a = 0x1F;'
+        tokens = Tokenizer(source).all_tokens()
+        self.assertEqual(['int', 'a', ';', 'a', '=', '0x1F', ';'],
+                         [source[token.st:token.ed] for token in tokens])
+        self.assertEqual([(0, 1), (0, 5), (0, 6), (1, 3), (1, 5), (1, 7),
+                          (1, 11)], [token.st_pos for token in tokens])
+        self.assertEqual((1, 4), tokens[3].ed_pos)
+        self.assertEqual((2, 0), tokens[-1].ed_pos)
+
+    def test_identifier_names(self):
+        source = 'int abc; abc = abc + xy; xy = 1;'
+        for tokenize in (lambda tkz: tkz.all_tokens(),
+                         lambda tkz: list(iter(tkz.dfa_next_token, None))):
+            tokenizer = Tokenizer(source)
+            tokens = [token for token in tokenize(tokenizer)
+                      if token.tok_type == TokenType.IDENTIFIER]
+            self.assertEqual([0, 0, 0, 1, 1],
+                             [token.name_id for token in tokens])
+            self.assertEqual(['abc', 'xy'], tokenizer.names.names)
+            self.assertIs(tokens[0].literal, tokens[2].literal)
+            self.assertIsNone(Tokenizer(source).all_tokens()[0].name_id)
+
+        tokenizer = Tokenizer(source)
+        buffer = TokenBuffer(tokenizer.iter_tokens(), tokenizer.names)
+        self.assertEqual([None, 0, None, 0], [token.name_id
+                                              for token in buffer][:4])
+        self.assertEqual(2, len(buffer.names))
+
+    def test_state_names_in_diagnostics(self):
+        for source, state in [('0x;', 'HEX_X'), ('1.5e;', 'FLOAT_EXP_ST'),
+                              ('!a', '!'), ("'ab'", 'CHAR_VAL')]:
+            with self.assertRaises(InvalidInputForState) as cm:
+                Tokenizer(source).all_tokens()
+            self.assertIn(f'for state {state}', str(cm.exception))
+
+    def test_regex_engine_matches_dfa(self):
+        def lex(source, next_token):
+            tkz = Tokenizer(source)
+            tokens = []
+            try:
+                while True:
+                    token = next_token(tkz)
+                    if token is None:
+                        return tokens
+                    tokens.append((token.literal, token.tok_type,
+                                   token.st_pos, token.ed_pos))
+            except TokenizerException as e:
+                return tokens + [(type(e), e.row, e.col)]
+
+        sources = [
+            'int a = 0x1F + 03.5e+2 * .5 / 7. ;\n\tdouble b=1e9;',
+            "char c = '\\x4a'; print(\"a\\tb\", c);/* a /* */ // end",
+            'if (a<=b) a = a>=b; else while(a!=b) a==b;',
+            'int a = 1.e;', 'int a = 0x;', 'int a = 03;', 'a ! b',
+            'a🙈', "'ab'", '"unterminated\n', '""', '/* unterminated',
+            'a $ b', "'\\q'", '"\\x4"',
+        ]
+        for source in sources:
+            self.assertEqual(lex(source, Tokenizer.dfa_next_token),
+                             lex(source, Tokenizer.next_token), source)
+
+    def test_iter_tokens_from_file(self):
+        source = '''
+        /* comment that is longer
+           than a chunk */
+        int a = 0x1F;
+        double b = 12.5e+3; // trailing
+        print("string literal\\n", 'c');
+        '''
+
+        expected = describe_tokens(Tokenizer(source).all_tokens())
+        for chunk_size in [1, 2, 7, 1024]:
+            tkz = Tokenizer.from_file(io.StringIO(source), chunk_size)
+            self.assertEqual(expected, describe_tokens(tkz.iter_tokens()))
+
+        tkz = Tokenizer.from_file(io.StringIO('int a = 0x;'), chunk_size=3)
+        self.assertRaises(InvalidInputForState, tkz.all_tokens)
+
+    def test_mapped_tokenizer(self):
+        source = '''
+        /* comment */ int a = 0x1F;
+        double b = 12.5e+3; // trailing
+        print("string literal\\n", 'c');'''
+
+        def mapped_tokens(text):
+            with tempfile.NamedTemporaryFile('w', delete=False) as file:
+                file.write(text)
+            try:
+                with MappedTokenizer(file.name) as tkz:
+                    return describe_tokens(tkz.iter_tokens())
+            finally:
+                os.remove(file.name)
+
+        self.assertEqual(describe_tokens(Tokenizer(source).all_tokens()),
+                         mapped_tokens(source))
+        self.assertEqual([], mapped_tokens(''))
+        self.assertRaises(InvalidInputForState, mapped_tokens, 'int a = 0x;')
+
+    def test_token_buffer(self):
+        source = '''int a = 0x1F;
+        double b = 12.5e+3;
+        print("str", 'c', a);'''
+
+        tokens = Tokenizer(source).all_tokens()
+        buffer = TokenBuffer(Tokenizer(source).iter_tokens())
+        self.assertEqual(len(tokens), len(buffer))
+        self.assertEqual(describe_tokens(tokens), describe_tokens(buffer))
+        self.assertEqual(
+            describe_tokens(tokens[-2:]),
+            describe_tokens([buffer[-2], buffer[len(buffer) - 1]]))
+        self.assertEqual(str(tokens[3]), str(buffer[3]))
+        self.assertRaises(IndexError, buffer.__getitem__, len(buffer))
+
+    def test_token_stream(self):
+        source = 'int a = 1 + 2 * 3;'
+        tokens = Tokenizer(source).all_tokens()
+        stream = TokenStream(Tokenizer(source).iter_tokens(), size=4)
+        self.assertEqual(0, stream.count)
+        self.assertEqual(tokens[2].literal, stream[2].literal)
+        self.assertEqual(3, stream.count)
+        self.assertEqual(tokens[0].literal, stream[0].literal)
+        self.assertEqual(tokens[5].literal, stream[5].literal)
+        # only the last 4 tokens read are kept
+        self.assertRaises(IndexError, stream.__getitem__, 1)
+        self.assertEqual(tokens[2].literal, stream[2].literal)
+        self.assertTrue(stream.available(len(tokens) - 1))
+        self.assertFalse(stream.available(len(tokens)))
+        self.assertRaises(IndexError, stream.__getitem__, len(tokens))
+
+    def test_token_cache(self):
+        sources = ['int a = 0x1F;\n', 'print("s", \'c\', 1.5e3)', 'a\nb']
+        with tempfile.TemporaryDirectory() as directory:
+            cache = TokenCache(directory)
+            for source in sources:
+                self.assertIsNone(cache.load(source))
+                expected = describe_tokens(Tokenizer(source).all_tokens())
+                self.assertEqual(expected,
+                                 describe_tokens(cache.tokenize(source)))
+                self.assertIsNotNone(cache.load(source))
+                self.assertEqual(expected,
+                                 describe_tokens(cache.tokenize(source)))
+
+            # unreadable files are misses
+            with open(cache.path(sources[0]), 'wb') as file:
+                file.write(b'garbage')
+            self.assertIsNone(cache.load(sources[0]))
+            self.assertRaises(InvalidInputForState, cache.tokenize, '0x;')
+
+            cache.max_size = 0
+            cache.evict()
+            self.assertEqual([], os.listdir(directory))
+
+    def test_tokenize_parallel(self):
+        # comments spanning the splits, and a string opening one
+        source = ''.join(f'int a{i} = {i};\n/* {i}\n\n*/ "/*"\n'
+                          for i in range(50))
+        self.assertEqual(
+            describe_tokens(Tokenizer(source).all_tokens()),
+            describe_tokens(tokenize_parallel(source, 3, min_size=0)))
+
+        source += '\nint b = 0x;\n' + source
+        with self.assertRaises(InvalidInputForState) as cm:
+            tokenize_parallel(source, 3, min_size=0)
+        self.assertEqual((201, 11), (cm.exception.row, cm.exception.col))
+
+    def test_retokenize(self):
+        source = 'int a = 1;\n/* note */\ndouble b = 2.5;\nprint(a, b);\n'
+        tkz = Tokenizer(source)
+        tokens = tkz.retokenize((0, 0), '')
+        self.assertEqual(
+            describe_tokens(Tokenizer(source).all_tokens(), offset_fields),
+            describe_tokens(tokens, offset_fields))
+        print_token = tokens[-6]
+
+        for st, ed, new_text in [(4, 5, 'abc'),          # rename
+                                 (16, 16, '*/ x /*'),    # split comment
+                                 (13, 13, '\n\n'),       # add lines
+                                 (8, 9, '0x10')]:        # change literal
+            source = source[:st] + new_text + source[ed:]
+            tokens = tkz.retokenize((st, ed), new_text)
+            self.assertEqual(
+                describe_tokens(Tokenizer(source).all_tokens(), offset_fields),
+                describe_tokens(tokens, offset_fields))
+            # the `print` token is reused by the edits above
+            self.assertIs(print_token, tokens[-6])
+        self.assertEqual([], tkz.retokenize((0, len(source)), ''))
+
+        # the edit is kept on lexical errors
+        self.assertRaises(InvalidInputForState, tkz.retokenize, (0, 0),
+                          'a = 0x;')
+        self.assertEqual(['a', '=', '0x1', ';'], [
+            token.literal for token in tkz.retokenize((6, 6), '1')])
+
+        # tokens [1, 2) are replaced by [1, 4), `=` and after are reused
+        tkz = Tokenizer('int a = 1;')
+        tkz.retokenize((0, 0), '')
+        tkz.retokenize((4, 5), 'b, c')
+        self.assertEqual((1, 2, 4), tkz.retokenized)
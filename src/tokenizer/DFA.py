@@ -1,49 +1,67 @@
 class DFA(object):
-    INIT = 'INIT'
-    IDENTIFIER = 'IDENTIFIER'
+    """
+    States of the tokenizer DFA, encoded as small integers so transitions
+    compare ints. `DFA.names[state]` is the name reported in diagnostics.
+    """
+    INIT = 0
+    IDENTIFIER = 1
 
-    HEX_X = 'HEX_X'
-    HEX = 'HEX'
-    ZERO = 'ZERO'
-    NOT_ZERO_INTEGER = 'NOT_ZERO_INTEGER'
+    HEX_X = 2
+    HEX = 3
+    ZERO = 4
+    NOT_ZERO_INTEGER = 5
 
-    FLOAT_DOT = 'FLOAT_DOT'
-    FLOAT_HEAD = 'FLOAT_HEAD'
-    FLOAT_TAIL = 'FLOAT_TAIL'
-    FLOAT_EXP_ST = 'FLOAT_EXP_ST'
-    FLOAT_EXP_ED = 'FLOAT_EXP_ED'
-    FLOAT_EXP_SIGN = 'FLOAT_EXP_SIGN'
+    FLOAT_DOT = 6
+    FLOAT_HEAD = 7
+    FLOAT_TAIL = 8
+    FLOAT_EXP_ST = 9
+    FLOAT_EXP_ED = 10
+    FLOAT_EXP_SIGN = 11
 
     # single-char op
     # ( ) { } , : ; * + -
-    SINGLE_CHAR_OP = 'SINGLE_CHAR_OP'
+    SINGLE_CHAR_OP = 12
 
     # double-char op head or single-char op
-    DIV = 'DIV'
-    EXCL = '!'
-    ASSIGN = '='
-    LESS = '<'
-    GREATER = '>'
+    DIV = 13
+    EXCL = 14
+    ASSIGN = 15
+    LESS = 16
+    GREATER = 17
 
     # double-char op
-    LEQ = '<='
-    GEQ = '>='
-    NEQ = '!='
-    EQ = '=='
-
-    # comment
-    MULTI_LINE_COMMENT_VAL_NOT_STAR = 'MULTI_LINE_COMMENT_VAL_NOT_STAR'
-    MULTI_LINE_COMMENT_VAL_STAR = 'MULTI_LINE_COMMENT_VAL_STAR'
-    MULTI_LINE_COMMENT_ED = 'MULTI_LINE_COMMENT_ED'
-    LINE_COMMENT_VAL = 'LINE_COMMENT_VAL'
-    LINE_COMMENT_ED = 'LINE_COMMENT_ED'
+    LEQ = 18
+    GEQ = 19
+    NEQ = 20
+    EQ = 21
+
+    # comment, the tokenizer skips comment bodies in bulk
+    MULTI_LINE_COMMENT_VAL_NOT_STAR = 22
+    MULTI_LINE_COMMENT_VAL_STAR = 23
+    MULTI_LINE_COMMENT_ED = 24
+    LINE_COMMENT_VAL = 25
+    LINE_COMMENT_ED = 26
 
     # char
-    CHAR_ST = 'CHAR_ST'
-    CHAR_ED = 'CHAR_ED'
-    CHAR_VAL = 'CHAR_VAL'
+    CHAR_ST = 27
+    CHAR_ED = 28
+    CHAR_VAL = 29
 
     # string
-    STR_ST = 'STR_ST'
-    STR_ED = 'STR_ED'
-    STR_VAL = 'STR_VAL'
+    STR_ST = 30
+    STR_ED = 31
+    STR_VAL = 32
+
+    names = (
+        'INIT', 'IDENTIFIER',
+        'HEX_X', 'HEX', 'ZERO', 'NOT_ZERO_INTEGER',
+        'FLOAT_DOT', 'FLOAT_HEAD', 'FLOAT_TAIL', 'FLOAT_EXP_ST',
+        'FLOAT_EXP_ED', 'FLOAT_EXP_SIGN',
+        'SINGLE_CHAR_OP',
+        'DIV', '!', '=', '<', '>',
+        '<=', '>=', '!=', '==',
+        'MULTI_LINE_COMMENT_VAL_NOT_STAR', 'MULTI_LINE_COMMENT_VAL_STAR',
+        'MULTI_LINE_COMMENT_ED', 'LINE_COMMENT_VAL', 'LINE_COMMENT_ED',
+        'CHAR_ST', 'CHAR_ED', 'CHAR_VAL',
+        'STR_ST', 'STR_ED', 'STR_VAL',
+    )
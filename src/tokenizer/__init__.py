@@ -1,3 +1,9 @@
 from .tokenizer import Tokenizer
 from .token import Token, TokenType
 from .charsets import CharSets
+from .name_table import NameTable
+from .mapped_tokenizer import MappedTokenizer
+from .token_buffer import TokenBuffer
+from .token_cache import TokenCache
+from .token_stream import TokenStream
+from .parallel_tokenizer import tokenize_parallel
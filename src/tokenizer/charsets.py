@@ -8,3 +8,42 @@ class CharSets(object):
                   '&', '|', '~', '\\', '"', '\'', '`', '$', '#', '@']
     not_base_chars = ['_', '[', ']', '.', ':', '?', '%', '^',
                       '&', '|', '~', '\\', '"', '\'', '`', '$', '#', '@']
+
+
+# bit flags of the character classes in `char_class_table`
+BLANK = 0x01
+DIGIT = 0x02
+ALPHA = 0x04
+PUNC = 0x08
+VALID = BLANK | DIGIT | ALPHA | PUNC
+BASE = 0x10
+S_CHAR = 0x20
+C_CHAR = 0x40
+HEX_DIGIT = 0x80
+
+
+def _build_char_class_table():
+    table = [0] * 128
+    hex_digit_chars = CharSets.digit_chars + list('abcdefABCDEF')
+    for flag, chars in [(BLANK, CharSets.blank_chars),
+                        (DIGIT, CharSets.digit_chars),
+                        (ALPHA, CharSets.alpha_chars),
+                        (PUNC, CharSets.punc_chars),
+                        (HEX_DIGIT, hex_digit_chars)]:
+        for c in chars:
+            table[ord(c)] |= flag
+    for code in range(128):
+        if not table[code] & VALID:
+            continue
+        c = chr(code)
+        if c not in CharSets.not_base_chars:
+            table[code] |= BASE
+        if c not in '"\\\n\r':
+            table[code] |= S_CHAR
+        if c not in '\'\\\n\r':
+            table[code] |= C_CHAR
+    return tuple(table)
+
+
+# classes of every ASCII char, indexed by `ord`. Non-ASCII chars are in none
+char_class_table = _build_char_class_table()
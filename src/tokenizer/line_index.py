@@ -0,0 +1,44 @@
+from array import array
+from bisect import bisect_right
+
+
+class LineIndex(object):
+    def __init__(self):
+        """
+        Sorted offsets of the first char of every line of a source, used to
+        turn a flat offset into a (row, col) position only when one is needed
+        """
+        self.starts = array('q', [0])
+
+    def add_lines(self, text, base: int, newline='\n'):
+        """
+        Record the start of every line beginning in `text`, which is located
+        at offset `base`. `text` may be bytes-like with `newline` b'\\n'
+        """
+        starts = self.starts
+        idx = text.find(newline)
+        while idx != -1:
+            starts.append(base + idx + 1)
+            idx = text.find(newline, idx + 1)
+
+    def pos(self, offset: int) -> tuple:
+        row = bisect_right(self.starts, offset) - 1
+        return row, offset - self.starts[row]
+
+    def replace(self, st: int, ed: int, text: str):
+        """
+        Update the index after the source between offsets `st` and `ed` is
+        replaced by `text`
+        """
+        starts = self.starts
+        # starts up to `st` follow a '\n' before the replaced range, starts
+        # after `ed` one after it
+        lo = bisect_right(starts, st)
+        hi = bisect_right(starts, ed)
+        delta = len(text) - (ed - st)
+
+        replaced = LineIndex()
+        replaced.starts = starts[:lo]
+        replaced.add_lines(text, st)
+        replaced.starts.extend(start + delta for start in starts[hi:])
+        self.starts = replaced.starts
@@ -0,0 +1,128 @@
+import mmap
+import re
+from exception.tokenizer_exceptions import InvalidCharacter
+from tokenizer.line_index import LineIndex
+from tokenizer.name_table import NameTable
+from tokenizer.token import Token, MappedToken, TokenType
+from tokenizer.tokenizer import (Tokenizer, token_regex, key_to_type,
+                                 op_to_type, literal_groups, skipped_groups,
+                                 valid_chars)
+
+bytes_token_regex = re.compile(token_regex.pattern.encode('ascii'), re.DOTALL)
+
+# keywords and operators keep their `str` literal, nothing to decode
+bytes_to_literal = {literal.encode('ascii'): literal
+                    for literal in list(key_to_type) + list(op_to_type)}
+valid_bytes = frozenset(ord(c) for c in valid_chars)
+
+
+class MappedTokenizer(object):
+    def __init__(self, path: str, names: NameTable = None):
+        """
+        Tokenize the file at `path` directly from a read-only `mmap` of it.
+
+        The file is neither decoded nor split into lines: rows are counted by
+        b'\\n' and columns by bytes, the literal of literals is decoded only
+        when a `MappedToken` is asked for it. Identifiers are decoded to be
+        interned into `names`, as in `Tokenizer`. Tokens keep referring to
+        the mapping, call `close` once they are not needed.
+
+        Like for `Tokenizer`, the source ends with a '\\n', which is virtual
+        when the file does not end with one.
+        """
+        with open(path, 'rb') as file:
+            try:
+                self.source = mmap.mmap(file.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file, which cannot be mapped
+                self.source = b''
+
+        # offset of next byte
+        self.offset = 0
+
+        self.names = NameTable() if names is None else names
+
+        self.lines = LineIndex()
+        self.lines.add_lines(self.source, 0, newline=b'\n')
+        if self.source[-1:] != b'\n':
+            self.lines.starts.append(len(self.source) + 1)
+
+    def close(self):
+        if isinstance(self.source, mmap.mmap):
+            self.source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def next_token(self):
+        """
+        Same as `Tokenizer.next_token`, over bytes. The end of the file acts
+        as the '\\n' the `Tokenizer` appends to the source.
+        """
+        source = self.source
+        offset = self.offset
+        while True:
+            if offset >= len(source):
+                self.offset = offset
+                return None
+            match = bytes_token_regex.match(source, offset)
+            if match is None:
+                self.offset = offset
+                return self.__dfa_next_token()
+
+            kind = match.lastgroup
+            st, ed = match.span()
+            if kind in skipped_groups:
+                offset = ed
+                continue
+
+            # the lookahead char is validated by the DFA before it stops
+            if ed < len(source) and source[ed] not in valid_bytes:
+                raise InvalidCharacter(*self.lines.pos(ed + 1),
+                                       chr(source[ed]))
+            self.offset = ed
+
+            if kind == 'IDENTIFIER' or kind == 'OP':
+                literal = bytes_to_literal.get(match.group())
+                if literal is not None:
+                    tok_type = key_to_type.get(literal) or op_to_type[literal]
+                    return Token(literal=literal, tok_type=tok_type,
+                                 st=st, ed=ed, lines=self.lines)
+                name_id = self.names.intern(match.group().decode('ascii'))
+                return Token(literal=self.names.names[name_id],
+                             tok_type=TokenType.IDENTIFIER, st=st, ed=ed,
+                             lines=self.lines, name_id=name_id)
+            tok_type = literal_groups[kind]
+            return MappedToken(source=source, tok_type=tok_type,
+                               st=st, ed=ed, lines=self.lines)
+
+    def iter_tokens(self):
+        while True:
+            token = self.next_token()
+            if token is None:
+                return
+            yield token
+
+    def all_tokens(self):
+        return list(self.iter_tokens())
+
+    def __dfa_next_token(self):
+        """
+        Run `Tokenizer.dfa_next_token` from `self.offset` to report the
+        lexical error there. No token spans lines, so the rest of the line is
+        decoded, as latin-1 to keep counting columns by bytes
+        """
+        end = self.source.find(b'\n', self.offset)
+        end = len(self.source) if end == -1 else end + 1
+        tokenizer = Tokenizer(self.source[self.offset:end].decode('latin-1'),
+                              names=self.names)
+        tokenizer.lines = self.lines
+        tokenizer.base = tokenizer.offset = self.offset
+
+        token = tokenizer.dfa_next_token()
+        self.offset = min(tokenizer.offset, len(self.source))
+        return token
@@ -0,0 +1,31 @@
+import typing
+
+
+class NameTable(object):
+    def __init__(self):
+        """
+        Identifiers of a compilation, each distinct name is stored once and
+        numbered densely from 0 in order of first appearance
+        """
+        self.names: typing.List[str] = []
+        self.ids: typing.Dict[str, int] = {}
+
+    def intern(self, name: str) -> int:
+        """
+        Return the id of `name`, adding it if it is new
+        """
+        name_id = self.ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.ids[name] = name_id
+        return name_id
+
+    def name(self, name_id: int) -> str:
+        return self.names[name_id]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
@@ -0,0 +1,129 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from exception.tokenizer_exceptions import TokenizerException
+from tokenizer.line_index import LineIndex
+from tokenizer.token_buffer import TokenBuffer
+from tokenizer.tokenizer import Tokenizer, token_regex, skipped_groups
+
+# smaller sources are not worth starting processes for
+min_parallel_size = 1024 * 1024
+
+
+def ends_in_open_comment(text: str, offset: int) -> bool:
+    """
+    Whether the blanks and comments the tokenizer skipped from `offset` to
+    the end of `text` end with a '/*' comment that is not closed. `text`
+    ends with '\\n', so a '/*' comment reaching its end is not closed
+    """
+    while offset < len(text):
+        match = token_regex.match(text, offset)
+        if match is None or match.lastgroup not in skipped_groups:
+            return False
+        if match.end() == len(text):
+            return match.group().startswith('/*')
+        offset = match.end()
+    return False
+
+
+def lex_chunk(text: str, base: int):
+    """
+    Tokenize `text`, a run of whole lines located at offset `base` of the
+    source, as if the tokenizer were outside any comment at its start.
+
+    Return the `TokenBuffer` columns with offsets in the whole source and
+    whether `text` ends inside a comment, or None on a lexical error
+    """
+    # `text` already ends with the '\n' appended by `Tokenizer`
+    try:
+        tokens = TokenBuffer(Tokenizer(text[:-1]).iter_tokens())
+    except TokenizerException:
+        return None
+    last_ed = tokens.ends[-1] if tokens.ends else 0
+    starts = array('q', [st + base for st in tokens.starts])
+    ends = array('q', [ed + base for ed in tokens.ends])
+    return (tokens.kinds.tobytes(), starts.tobytes(), ends.tobytes(),
+            tokens.literals, ends_in_open_comment(text, last_ed))
+
+
+def relex_range(text: str, st: int, ed: int, lines: LineIndex):
+    """
+    Tokenize `text[st:ed]` in this process, with the exceptions, positions
+    included, that the serial tokenizer raises there
+    """
+    tokenizer = Tokenizer(text[st:ed - 1])
+    tokenizer.lines = lines
+    tokenizer.base = tokenizer.offset = st
+    tokens = TokenBuffer(tokenizer.iter_tokens())
+    last_ed = tokens.ends[-1] - st if tokens.ends else 0
+    return (tokens.kinds.tobytes(), tokens.starts.tobytes(),
+            tokens.ends.tobytes(), tokens.literals,
+            ends_in_open_comment(text[st:ed], last_ed))
+
+
+def split_lines(text: str, count: int) -> list:
+    """
+    Offsets splitting `text` into at most `count` runs of whole lines. A
+    split inside a '/*' comment is only avoided when it is easy to see,
+    `tokenize_parallel` checks every split anyway
+    """
+    splits = [0]
+    for k in range(1, count):
+        target = max(len(text) * k // count, splits[-1])
+        comment_st = text.rfind('/*', splits[-1], target)
+        if comment_st != -1 and text.find('*/', comment_st + 2, target) == -1:
+            comment_ed = text.find('*/', comment_st + 2)
+            target = len(text) if comment_ed == -1 else comment_ed
+        split = text.find('\n', target) + 1
+        if split == 0 or split >= len(text):
+            break
+        if split > splits[-1]:
+            splits.append(split)
+    splits.append(len(text))
+    return splits
+
+
+def tokenize_parallel(source: str, workers: int = None,
+                      min_size: int = min_parallel_size) -> TokenBuffer:
+    """
+    Tokenize `source` in `workers` processes, the tokens are the same as
+    `Tokenizer(source).all_tokens()`, and so are the exceptions.
+
+    No token spans lines, so each run of whole lines is tokenized on its
+    own, assuming the serial tokenizer is outside comments at its start.
+    Then the runs are stitched in order: a run ending inside a '/*'
+    comment is tokenized again in this process together with the following
+    runs, until the comment is closed. A run that failed is tokenized again
+    in this process to raise the exact exception.
+    Sources shorter than `min_size` are tokenized in this process
+    """
+    workers = workers or os.cpu_count() or 1
+    text = source + '\n'
+    if workers == 1 or len(text) < min_size:
+        tokenizer = Tokenizer(source)
+        return TokenBuffer(tokenizer.iter_tokens(), tokenizer.names)
+
+    lines = LineIndex()
+    lines.add_lines(text, 0)
+    splits = split_lines(text, workers * 2)
+    with ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(
+            lex_chunk, [text[st:ed] for st, ed in zip(splits, splits[1:])],
+            splits[:-1]))
+
+    tokens = TokenBuffer()
+    tokens.lines = lines
+    idx = 0
+    while idx < len(results):
+        result = results[idx]
+        if result is None:
+            result = relex_range(text, splits[idx], splits[idx + 1], lines)
+        ed_idx = idx + 1
+        while result[-1] and ed_idx < len(results):
+            ed_idx += 1
+            result = relex_range(text, splits[idx], splits[ed_idx], lines)
+
+        kinds, starts, ends, literals, _ = result
+        tokens.extend_columns(kinds, starts, ends, literals)
+        idx = ed_idx
+    return tokens
@@ -1,4 +1,7 @@
-from exception.tokenizer_exceptions import CharOverflow, Integer32Overflow
+import functools
+import re
+from exception.tokenizer_exceptions import (CharOverflow, Integer32Overflow,
+                                            InvalidLiteral)
 
 
 class TokenType(object):
@@ -53,52 +56,157 @@ class TokenType(object):
     relations = [LESS, GREATER, LEQ, GEQ, EQ, NEQ]
 
 
+escape_regex = re.compile(r'\\(x[0-9a-fA-F]{2}|.)', re.DOTALL)
+escape_to_char = {'\\': '\\', "'": "'", '"': '"',
+                  'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def check_char_overflow(c: str, pos: tuple):
+    if ord(c) < 0 or ord(c) > 255:
+        raise CharOverflow(pos[0], pos[1], c)
+
+
+def check_int_overflow(integer: int, pos: tuple):
+    min_int = -2147483648
+    max_int = 2147483647
+    if integer < min_int or integer > max_int:
+        raise Integer32Overflow(pos[0], pos[1], integer)
+
+
+def decode_integer(literal: str) -> int:
+    if literal[1:2] in ('x', 'X'):
+        return int(literal[2:], 16)
+    return int(literal, 10)
+
+
+def decode_float(literal: str) -> float:
+    return float(literal)
+
+
+def replace_escape(match) -> str:
+    esc = match.group(1)
+    if esc[0] == 'x':
+        return chr(int(esc[1:], 16))
+    return escape_to_char[esc]
+
+
+def unescape(literal: str) -> str:
+    """
+    Value of a quoted char or str literal, with its escape sequences
+    """
+    body = literal[1:-1]
+    if '\\' not in body:
+        return body
+    return escape_regex.sub(replace_escape, body)
+
+
+decoders = {
+    TokenType.INTEGER_LITERAL: decode_integer,
+    TokenType.FLOAT_LITERAL: decode_float,
+    TokenType.CHAR_LITERAL: unescape,
+    TokenType.STR_LITERAL: unescape,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def decode_literal(literal: str, tok_type: str):
+    return decoders[tok_type](literal)
+
+
+def literal_value(literal: str, tok_type: str, pos: tuple):
+    """
+    Value of a token, `pos` is the position reported on overflow
+    """
+    if tok_type not in decoders:
+        return literal
+    try:
+        value = decode_literal(literal, tok_type)
+    except ValueError:
+        # e.g. the float literal '.'
+        raise InvalidLiteral(pos[0], pos[1], literal)
+
+    if tok_type == TokenType.INTEGER_LITERAL:
+        check_int_overflow(value, pos)
+    elif tok_type == TokenType.CHAR_LITERAL:
+        check_char_overflow(value, pos)
+    elif tok_type == TokenType.STR_LITERAL:
+        if value and max(value) > '\xff':
+            for c in value:
+                check_char_overflow(c, pos)
+    return value
+
+
 class Token(object):
-    def __init__(self, literal: str, tok_type: TokenType, st: tuple, ed: tuple):
+    __slots__ = ('literal', 'tok_type', 'st', 'ed', 'lines', 'name_id',
+                 '__value')
+
+    def __init__(self, literal: str, tok_type: TokenType, st: int, ed: int,
+                 lines, name_id: int = None):
         """
-        st: (row:int, col:int) start position of token, inclusive
-        ed: (row:int, col:int) end position of token, exclusive
+        st: offset of the first char of token in source code
+        ed: offset of the lookahead char, i.e. end of token, exclusive
+        lines: `LineIndex` of the source code, to get (row, col) positions
         tok_type: type of token
         literal: literal representation of token in source code
+        name_id: id of an identifier in the `NameTable` of the tokenizer
         """
         self.literal = literal
         self.tok_type = tok_type
-        for pos in [st, ed]:
-            assert len(pos) == 2, f'pos must be two elements, not {len(pos)}'
-            row, col = pos
-            assert type(row) is int, f'row must be int, not {type(row)}'
-            assert type(col) is int, f'col must be int, not {type(col)}'
-        self.st_pos = st
-        self.ed_pos = ed
-        self.value = self.__init_value()
+        self.st = st
+        self.ed = ed
+        self.lines = lines
+        self.name_id = name_id
+        self.__value = ...
+
+    @property
+    def st_pos(self) -> tuple:
+        """
+        (row, col) just after the first char, where the DFA starts the token
+        """
+        return self.lines.pos(self.st + 1)
+
+    @property
+    def ed_pos(self) -> tuple:
+        """
+        (row, col) just after the lookahead char, where the DFA ends the token
+        """
+        return self.lines.pos(self.ed + 1)
+
+    @property
+    def value(self):
+        """
+        Decoded on first access, overflow of a literal is raised from here
+        """
+        if self.__value is ...:
+            self.__value = literal_value(self.literal, self.tok_type,
+                                         self.st_pos)
+        return self.__value
 
     def __str__(self):
         return f'@literal={"# " + self.literal + " #" :>15}, @type={self.tok_type :<16}, @val={repr(self.value) :>10}, @pos={(self.st_pos, self.ed_pos)}'
 
-    def __check_char_overflow(self, c: str):
-        if ord(c) < 0 or ord(c) > 255:
-            raise CharOverflow(self.st_pos[0], self.st_pos[1], c)
-
-    def __check_int_overflow(self, integer: int):
-        min_int = -2147483648
-        max_int = 2147483647
-        if integer < min_int or integer > max_int:
-            raise Integer32Overflow(self.st_pos[0], self.st_pos[1], integer)
-
-    def __init_value(self):
-        if self.tok_type == TokenType.INTEGER_LITERAL:
-            integer = eval(self.literal)
-            self.__check_int_overflow(integer)
-            return integer
-        elif self.tok_type == TokenType.FLOAT_LITERAL:
-            return eval(self.literal)
-        elif self.tok_type == TokenType.CHAR_LITERAL:
-            c = eval(self.literal)
-            self.__check_char_overflow(c)
-            return c
-        elif self.tok_type == TokenType.STR_LITERAL:
-            s = eval(self.literal)
-            for c in s:
-                self.__check_char_overflow(c)
-            return s
-        return self.literal
+
+class MappedToken(Token):
+    """
+    Token whose literal stays in a bytes-like source (e.g. a `mmap`) until
+    `literal` or `value` is requested
+    """
+    __slots__ = ('source', '__literal')
+
+    def __init__(self, source, tok_type: TokenType, st: int, ed: int, lines):
+        """
+        source: bytes-like object holding the ASCII source code, the literal
+            is `source[st:ed]`
+        """
+        super().__init__(None, tok_type, st, ed, lines)
+        self.source = source
+
+    @property
+    def literal(self) -> str:
+        if self.__literal is None:
+            self.__literal = self.source[self.st:self.ed].decode('ascii')
+        return self.__literal
+
+    @literal.setter
+    def literal(self, literal: str):
+        self.__literal = literal
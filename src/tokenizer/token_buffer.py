@@ -0,0 +1,128 @@
+import typing
+from array import array
+from tokenizer.name_table import NameTable
+from tokenizer.token import Token, TokenType, literal_value
+
+# every token type, a kind is the index of its type in this tuple
+kind_to_type = tuple(value for name, value in vars(TokenType).items()
+                     if name.isupper())
+type_to_kind = {tok_type: kind for kind, tok_type in enumerate(kind_to_type)}
+
+
+class TokenBuffer(object):
+    def __init__(self, tokens: typing.Iterable[Token] = (),
+                 names: NameTable = None):
+        """
+        Tokens of one source stored column by column: kinds, start and end
+        offsets and name ids (-1 but for identifiers) in `array`s and
+        references to the literals in a list. Items are `TokenView`s created
+        on access, so the buffer can be handed to the parser in place of a
+        list of `Token`.
+
+        The name ids are the ones of the tokens, `names` must be the table
+        of their tokenizer. Tokens appended as columns by `extend_columns`
+        have their names interned in it.
+        """
+        self.kinds = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.name_ids = array('i')
+        self.literals = []
+        self.lines = None
+        self.names = NameTable() if names is None else names
+        self.extend(tokens)
+
+    def append(self, token: Token):
+        self.kinds.append(type_to_kind[token.tok_type])
+        self.starts.append(token.st)
+        self.ends.append(token.ed)
+        name_id = token.name_id
+        self.name_ids.append(-1 if name_id is None else name_id)
+        self.literals.append(token.literal)
+        self.lines = token.lines
+
+    def extend(self, tokens: typing.Iterable[Token]):
+        for token in tokens:
+            self.append(token)
+
+    def extend_columns(self, kinds: bytes, starts: bytes, ends: bytes,
+                       literals: typing.List[str]):
+        """
+        Append tokens given as the bytes of the kind and offset columns and
+        their literals, interning the names of the identifiers in `names`
+        """
+        first = len(self.kinds)
+        self.kinds.frombytes(kinds)
+        self.starts.frombytes(starts)
+        self.ends.frombytes(ends)
+        self.literals.extend(literals)
+        identifier = type_to_kind[TokenType.IDENTIFIER]
+        intern = self.names.intern
+        self.name_ids.extend(intern(literal) if kind == identifier else -1
+                             for kind, literal
+                             in zip(self.kinds[first:], literals))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, idx: int):
+        if idx < 0:
+            idx += len(self.kinds)
+        if idx < 0 or idx >= len(self.kinds):
+            raise IndexError('token index out of range')
+        return TokenView(self, idx)
+
+    def __iter__(self):
+        for idx in range(len(self.kinds)):
+            yield TokenView(self, idx)
+
+
+class TokenView(object):
+    """
+    Read-only `Token` interface over one entry of a `TokenBuffer`
+    """
+    __slots__ = ('buffer', 'idx')
+
+    def __init__(self, buffer: TokenBuffer, idx: int):
+        self.buffer = buffer
+        self.idx = idx
+
+    @property
+    def literal(self) -> str:
+        return self.buffer.literals[self.idx]
+
+    @property
+    def tok_type(self) -> str:
+        return kind_to_type[self.buffer.kinds[self.idx]]
+
+    @property
+    def st(self) -> int:
+        return self.buffer.starts[self.idx]
+
+    @property
+    def ed(self) -> int:
+        return self.buffer.ends[self.idx]
+
+    @property
+    def lines(self):
+        return self.buffer.lines
+
+    @property
+    def st_pos(self) -> tuple:
+        return self.buffer.lines.pos(self.st + 1)
+
+    @property
+    def ed_pos(self) -> tuple:
+        return self.buffer.lines.pos(self.ed + 1)
+
+    @property
+    def name_id(self):
+        name_id = self.buffer.name_ids[self.idx]
+        return None if name_id == -1 else name_id
+
+    @property
+    def value(self):
+        # not memoized, `decode_literal` caches the decoding
+        return literal_value(self.literal, self.tok_type, self.st_pos)
+
+    __str__ = Token.__str__
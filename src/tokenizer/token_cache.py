@@ -0,0 +1,117 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from tokenizer.line_index import LineIndex
+from tokenizer.token_buffer import TokenBuffer
+from tokenizer.tokenizer import Tokenizer
+
+# bump whenever the tokens produced for a given source change
+lexer_version = 1
+
+# cached files hold native `array`s and `marshal` data
+version_tag = f'{lexer_version}-{sys.implementation.cache_tag}-{sys.byteorder}'
+
+suffix = '.tok'
+
+
+class TokenCache(object):
+    def __init__(self, directory: str, max_size: int = 64 * 2 ** 20):
+        """
+        Token streams cached in `directory`, one file per source keyed by a
+        hash of the source and `version_tag`. When the files exceed
+        `max_size` bytes in total, the least recently used ones are removed.
+
+        Files are written to a temporary file and renamed into place, so
+        processes sharing the directory never read a partial file.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def tokenize(self, source: str) -> TokenBuffer:
+        """
+        Tokens of `source`, lexed only on a cache miss. Sources with lexical
+        errors raise as usual and are not cached
+        """
+        tokens = self.load(source)
+        if tokens is None:
+            tokenizer = Tokenizer(source)
+            tokens = TokenBuffer(tokenizer.iter_tokens(), tokenizer.names)
+            self.store(source, tokens)
+        return tokens
+
+    def path(self, source: str) -> str:
+        digest = hashlib.sha256(version_tag.encode('ascii'))
+        digest.update(source.encode('utf-8', 'surrogatepass'))
+        return os.path.join(self.directory, digest.hexdigest() + suffix)
+
+    def load(self, source: str):
+        """
+        Cached tokens of `source`, None on a miss
+        """
+        path = self.path(source)
+        try:
+            with open(path, 'rb') as file:
+                kinds, starts, ends, literals = marshal.load(file)
+            # mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (EOFError, ValueError, TypeError):
+            # not written by this version, drop it
+            self.__remove(path)
+            return None
+
+        tokens = TokenBuffer()
+        tokens.extend_columns(kinds, starts, ends, literals)
+        tokens.lines = LineIndex()
+        tokens.lines.add_lines(source + '\n', 0)
+        return tokens
+
+    def store(self, source: str, tokens: TokenBuffer):
+        data = marshal.dumps((tokens.kinds.tobytes(), tokens.starts.tobytes(),
+                              tokens.ends.tobytes(), tokens.literals))
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, self.path(source))
+        except OSError:
+            self.__remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache fits in
+        `self.max_size`
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # removed by another process
+                    continue
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+                total += stat.st_size
+
+        entries.sort()
+        for _, path, size in entries:
+            if total <= self.max_size:
+                break
+            self.__remove(path)
+            total -= size
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
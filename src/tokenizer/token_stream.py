@@ -0,0 +1,42 @@
+import typing
+from tokenizer.token import Token
+
+
+class TokenStream(object):
+    def __init__(self, tokens: typing.Iterable[Token], size: int = 8):
+        """
+        Tokens of `tokens`, a list or an iterator such as
+        `Tokenizer.iter_tokens`, read one at a time when first indexed into a
+        ring buffer of the last `size` tokens read. Indexes count from the
+        first token of `tokens`, only the buffered ones can be read, which is
+        enough for a parser that looks ahead, unreads and looks back a few
+        tokens, without the list of all tokens.
+        """
+        self.iterator = iter(tokens)
+        self.size = size
+        self.ring: typing.List[typing.Union[Token, None]] = [None] * size
+        # tokens read from `self.iterator` so far
+        self.count = 0
+        self.exhausted = False
+
+    def available(self, idx: int) -> bool:
+        """
+        Whether there is a token `idx`, reading up to it if needed
+        """
+        while self.count <= idx:
+            if self.exhausted:
+                return False
+            token = next(self.iterator, None)
+            if token is None:
+                self.exhausted = True
+                return False
+            self.ring[self.count % self.size] = token
+            self.count += 1
+        return True
+
+    def __getitem__(self, idx: int) -> Token:
+        if idx < 0 or idx < self.count - self.size:
+            raise IndexError(f'token {idx} is not buffered any more')
+        if not self.available(idx):
+            raise IndexError('token index out of range')
+        return self.ring[idx % self.size]
@@ -1,6 +1,12 @@
+import re
+import typing
 from exception.tokenizer_exceptions import *
 from tokenizer.DFA import DFA
-from tokenizer.charsets import CharSets
+from tokenizer.charsets import (CharSets, char_class_table, BLANK, DIGIT,
+                               ALPHA, PUNC, VALID, BASE, S_CHAR, C_CHAR,
+                               HEX_DIGIT)
+from tokenizer.line_index import LineIndex
+from tokenizer.name_table import NameTable
 from tokenizer.token import Token, TokenType
 
 reserved_words = [
@@ -14,138 +20,266 @@ reserved_words = [
     'print', 'scan'
 ]
 
+key_to_type = {
+    'const': TokenType.CONST,
+    'void': TokenType.VOID,
+    'int': TokenType.INT,
+    'char': TokenType.CHAR,
+    'double': TokenType.DOUBLE,
+    'struct': TokenType.STRUCT,
+    'if': TokenType.IF,
+    'else': TokenType.ELSE,
+    'switch': TokenType.SWITCH,
+    'case': TokenType.CASE,
+    'default': TokenType.DEFAULT,
+    'while': TokenType.WHILE,
+    'for': TokenType.FOR,
+    'do': TokenType.DO,
+    'return': TokenType.RETURN,
+    'break': TokenType.BREAK,
+    'continue': TokenType.CONTINUE,
+    'print': TokenType.PRINT,
+    'scan': TokenType.SCAN,
+}
+
+op_to_type = {
+    '(': TokenType.LEFT_PARENTHESES,
+    ')': TokenType.RIGHT_PARENTHESES,
+    '{': TokenType.LEFT_BRACE,
+    '}': TokenType.RIGHT_BRACE,
+    ',': TokenType.COMMA,
+    ':': TokenType.COLON,
+    ';': TokenType.SEMICOLON,
+    '*': TokenType.MUL,
+    '+': TokenType.ADD,
+    '-': TokenType.SUB,
+    '/': TokenType.DIV,
+    '=': TokenType.ASSIGN,
+    '<': TokenType.LESS,
+    '>': TokenType.GREATER,
+    '<=': TokenType.LEQ,
+    '>=': TokenType.GEQ,
+    '!=': TokenType.NEQ,
+    '==': TokenType.EQ,
+}
+
+
+def char_class(char: str) -> int:
+    code = ord(char)
+    return char_class_table[code] if code < 128 else 0
+
 
 def is_blank(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    return char in CharSets.blank_chars
+    return char_class(char) & BLANK != 0
 
 
 def is_digit(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    return char in CharSets.digit_chars
+    return char_class(char) & DIGIT != 0
 
 
 def is_punc(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    return char in CharSets.punc_chars
+    return char_class(char) & PUNC != 0
 
 
 def is_alpha(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    return char in CharSets.alpha_chars
+    return char_class(char) & ALPHA != 0
 
 
 def is_valid_char(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    checks = [is_blank, is_digit, is_punc, is_alpha]
-    return any(check(char) for check in checks)
+    return char_class(char) & VALID != 0
 
 
 def is_base_char(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    if char in CharSets.not_base_chars:
-        return False
-    return is_valid_char(char)
+    return char_class(char) & BASE != 0
 
 
 def is_s_char(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    if char in ['"', '\\', '\n', '\r']:
-        return False
-    return is_valid_char(char)
+    return char_class(char) & S_CHAR != 0
 
 
 def is_c_char(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    if char in ['\'', '\\', '\n', '\r']:
-        return False
-    return is_valid_char(char)
+    return char_class(char) & C_CHAR != 0
 
 
 def is_hex_digit(char: str):
-    assert len(char) == 1, 'char must be `str` that have size = 1'
-    is_legal_alpha = char.lower() in ['a', 'b', 'c', 'd', 'e', 'f']
-    return is_legal_alpha or is_digit(char)
+    return char_class(char) & HEX_DIGIT != 0
+
+
+def _char_class(chars) -> str:
+    return '[' + ''.join(re.escape(c) for c in chars) + ']'
+
+
+valid_chars = (CharSets.blank_chars + CharSets.digit_chars +
+                CharSets.alpha_chars + CharSets.punc_chars)
+_esc_seq = r"""\\(?:[\\'"nrt]|x[0-9a-fA-F]{2})"""
+
+# Every alternative only accepts a lexeme on which the DFA would stop by
+# itself, hence the negative lookaheads on numbers: `1.e`, `0x` or `03` are
+# left unmatched so that `Tokenizer.dfa_next_token` can report them.
+# Like the DFA, an unterminated comment runs to the end of the source.
+token_regex = re.compile('|'.join([
+    r'(?P<BLANK>[ \t\r\n]+)',
+    r'(?P<COMMENT>/\*[^*]*\*+(?:[^/*][^*]*\*+)*/|/\*.*\Z'
+    r'|//[^\n\r]*(?:[\n\r]|\Z))',
+    r'(?P<IDENTIFIER>[A-Za-z][A-Za-z0-9]*)',
+    r'(?P<HEX>0[xX][0-9a-fA-F]+)',
+    r'(?P<FLOAT>(?:[0-9]+\.|\.)[0-9]*(?:[eE][+-]?[0-9]+|(?![eE0-9]))'
+    r'|[0-9]+[eE][+-]?[0-9]+)',
+    r'(?P<INTEGER>0(?![0-9.eExX])|[1-9][0-9]*(?![0-9.eE]))',
+    r'(?P<CHAR>\'(?:' + _char_class(
+        sorted(set(valid_chars) - set('\'\\\n\r'))) +
+    '|' + _esc_seq + r')\')',
+    r'(?P<STR>"(?:' + _char_class(
+        sorted(set(valid_chars) - set('"\\\n\r'))) +
+    '|' + _esc_seq + r')+")',
+    r'(?P<OP><=|>=|!=|==|[-(){},:;*+<>=]|/(?![*/]))',
+]), re.DOTALL)
+
+skipped_groups = {'BLANK', 'COMMENT'}
+line_end_regex = re.compile(r'[\n\r]')
+literal_groups = {
+    'HEX': TokenType.INTEGER_LITERAL,
+    'INTEGER': TokenType.INTEGER_LITERAL,
+    'FLOAT': TokenType.FLOAT_LITERAL,
+    'CHAR': TokenType.CHAR_LITERAL,
+    'STR': TokenType.STR_LITERAL,
+}
+valid_char_set = frozenset(valid_chars)
 
 
 class Tokenizer(object):
-    def __init__(self, source: str):
-        self.source = list(map(lambda x: x + '\n', source.split('\n')))
-        self.end_row = len(self.source) - 1
-        self.end_col = len(self.source[-1]) - 1
+    def __init__(self, source: str = '', stream: typing.TextIO = None,
+                 chunk_size: int = 64 * 1024, names: NameTable = None):
+        """
+        source: the whole source code
+        stream: text file to read the source code from, in chunks of
+            `chunk_size` chars, instead of `source`
+        names: table to intern identifiers into, a new one by default
+
+        Only a window of the source is kept in `self.text`, which starts at
+        offset `self.base`. A '\n' is appended to the end of the source, so the
+        last token always has a lookahead char.
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.eof = stream is None
+        self.text = source + '\n' if stream is None else ''
+        self.base = 0
+
+        # offset of next char
+        self.offset = 0
 
-        # next position
-        self.row = 0
-        self.col = 0
+        # start of every line read so far, shared with the tokens
+        self.lines = LineIndex()
+        self.lines.add_lines(self.text, 0)
+
+        # tokens of the whole source, kept by `retokenize`
+        self.tokens = None
+        # (first, old_end, new_end), `retokenize` replaced the tokens
+        # [first, old_end) of the previous source by [first, new_end)
+        self.retokenized = None
+
+        # identifiers share one `str` per name and carry its id
+        self.names = NameTable() if names is None else names
+
+    @classmethod
+    def from_file(cls, file: typing.TextIO, chunk_size: int = 64 * 1024):
+        return cls(stream=file, chunk_size=chunk_size)
 
     def next_token(self):
+        """
+        Match the next whole token with `token_regex`.
+
+        Tokens record the offsets of their first char and of the lookahead
+        char, see `Token`. Input the regex refuses, i.e. lexical errors, is handed to
+        `dfa_next_token`, so the exceptions raised are exactly the ones of
+        the DFA.
+        """
+        offset = self.offset
+        while True:
+            text = self.text
+            idx = offset - self.base
+            if idx >= len(text):
+                if self.__fill(keep=offset):
+                    continue
+                self.offset = offset
+                return None
+            match = token_regex.match(text, idx)
+
+            # a match reaching the end of the window may go on in next chunk
+            if match is None or match.end() == len(text):
+                if self.__need_more(idx) and self.__fill(keep=offset):
+                    continue
+                if match is None:
+                    self.offset = offset
+                    return self.dfa_next_token()
+
+            kind = match.lastgroup
+            st, ed = match.span()
+            if kind in skipped_groups:
+                offset = self.base + ed
+                continue
+
+            # the lookahead char is validated by the DFA before it stops
+            if text[ed] not in valid_char_set:
+                row, col = self.lines.pos(self.base + ed + 1)
+                raise InvalidCharacter(row, col, text[ed])
+
+            literal = match.group()
+            name_id = None
+            if kind == 'IDENTIFIER':
+                tok_type = key_to_type.get(literal)
+                if tok_type is None:
+                    tok_type = TokenType.IDENTIFIER
+                    name_id = self.names.intern(literal)
+                    literal = self.names.names[name_id]
+            elif kind == 'OP':
+                tok_type = op_to_type[literal]
+            else:
+                tok_type = literal_groups[kind]
+
+            self.offset = self.base + ed
+            return Token(literal=literal, tok_type=tok_type, st=self.base + st,
+                         ed=self.base + ed, lines=self.lines, name_id=name_id)
+
+    def dfa_next_token(self):
+        """
+        Read the next token char by char with the DFA. This is the reference
+        engine of the tokenizer, `next_token` falls back to it for diagnostics.
+        """
         state = DFA.INIT
         token = ''
-        st_pos = ...
+        st = ...
 
-        def unread_and_return_token(tok_type: TokenType):
-            ed_pos = self.__current_pos()
-            rtn = Token(literal=token, tok_type=tok_type, st=st_pos, ed=ed_pos)
+        def unread_and_return_token(tok_type: TokenType, name_id=None):
+            literal = token if name_id is None else self.names.names[name_id]
+            rtn = Token(literal=literal, tok_type=tok_type, st=st,
+                        ed=self.offset - 1, lines=self.lines, name_id=name_id)
             self.__unread_char()
             return rtn
 
         def return_single_char_op():
-            op_to_type = {
-                '(': TokenType.LEFT_PARENTHESES,
-                ')': TokenType.RIGHT_PARENTHESES,
-                '{': TokenType.LEFT_BRACE,
-                '}': TokenType.RIGHT_BRACE,
-                ',': TokenType.COMMA,
-                ':': TokenType.COLON,
-                ';': TokenType.SEMICOLON,
-                '*': TokenType.MUL,
-                '+': TokenType.ADD,
-                '-': TokenType.SUB,
-                '/': TokenType.DIV
-            }
             op = token
             if op not in op_to_type:
-                raise IllegalSingleCharOp(self.row, self.col, op)
+                raise IllegalSingleCharOp(*self.__current_pos(), op)
             tok_type = op_to_type[op]
             return unread_and_return_token(tok_type)
 
         def return_identifier():
             # print(f'identifier @token is "{token}"')
             if token in reserved_words:
-                key_to_type = {
-                    'const': TokenType.CONST,
-                    'void': TokenType.VOID,
-                    'int': TokenType.INT,
-                    'char': TokenType.CHAR,
-                    'double': TokenType.DOUBLE,
-                    'struct': TokenType.STRUCT,
-                    'if': TokenType.IF,
-                    'else': TokenType.ELSE,
-                    'switch': TokenType.SWITCH,
-                    'case': TokenType.CASE,
-                    'default': TokenType.DEFAULT,
-                    'while': TokenType.WHILE,
-                    'for': TokenType.FOR,
-                    'do': TokenType.DO,
-                    'return': TokenType.RETURN,
-                    'break': TokenType.BREAK,
-                    'continue': TokenType.CONTINUE,
-                    'print': TokenType.PRINT,
-                    'scan': TokenType.SCAN,
-                }
                 return unread_and_return_token(tok_type=key_to_type[token])
             else:
-                return unread_and_return_token(tok_type=TokenType.IDENTIFIER)
+                return unread_and_return_token(
+                    tok_type=TokenType.IDENTIFIER,
+                    name_id=self.names.intern(token))
 
         while True:
             next_char = self.__next_char()
             if not next_char:
                 return None
             if not is_valid_char(next_char):
-                if state not in [DFA.LINE_COMMENT_VAL,
-                                 DFA.MULTI_LINE_COMMENT_VAL_NOT_STAR,
-                                 DFA.MULTI_LINE_COMMENT_VAL_STAR]:
-                    raise InvalidCharacter(self.row, self.col, next_char)
+                raise InvalidCharacter(*self.__current_pos(), next_char)
 
             if state == DFA.INIT:
                 if is_blank(next_char):
@@ -176,11 +310,11 @@ class Tokenizer(object):
                     state = DFA.STR_ST
                 else:
                     raise UnexpectedStartOfToken(
-                        self.row, self.col, next_char)
+                        *self.__current_pos(), next_char)
 
                 if state == DFA.INIT:
                     continue
-                st_pos = self.__current_pos()
+                st = self.offset - 1
 
             elif state == DFA.IDENTIFIER:
                 if is_alpha(next_char) or is_digit(next_char):
@@ -197,7 +331,7 @@ class Tokenizer(object):
                     state = DFA.HEX
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.HEX:
                 if is_hex_digit(next_char):
                     state = DFA.HEX
@@ -253,7 +387,7 @@ class Tokenizer(object):
                     state = DFA.FLOAT_EXP_ST
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.FLOAT_TAIL:
                 if is_digit(next_char):
                     state = DFA.FLOAT_TAIL
@@ -271,13 +405,13 @@ class Tokenizer(object):
                     state = DFA.FLOAT_EXP_ED
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.FLOAT_EXP_SIGN:
                 if is_digit(next_char):
                     state = DFA.FLOAT_EXP_ED
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.FLOAT_EXP_ED:
                 if is_digit(next_char):
                     state = DFA.FLOAT_EXP_ED
@@ -291,18 +425,22 @@ class Tokenizer(object):
             elif state == DFA.SINGLE_CHAR_OP:
                 return return_single_char_op()
             elif state == DFA.DIV:
+                # comments are skipped in bulk, any char is allowed in them
                 if next_char == '*':
-                    state = DFA.MULTI_LINE_COMMENT_VAL_NOT_STAR
+                    self.__skip_block_comment()
                 elif next_char == '/':
-                    state = DFA.LINE_COMMENT_VAL
+                    self.__skip_line_comment()
                 else:
                     return return_single_char_op()
+                state = DFA.INIT
+                token = ''
+                continue
             elif state == DFA.EXCL:
                 if next_char == '=':
                     state = DFA.NEQ
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.ASSIGN:
                 if next_char == '=':
                     state = DFA.EQ
@@ -329,37 +467,6 @@ class Tokenizer(object):
             elif state == DFA.EQ:
                 return unread_and_return_token(tok_type=TokenType.EQ)
 
-            # comment
-            elif state == DFA.MULTI_LINE_COMMENT_VAL_NOT_STAR:
-                if next_char == '*':
-                    state = DFA.MULTI_LINE_COMMENT_VAL_STAR
-                else:
-                    state = DFA.MULTI_LINE_COMMENT_VAL_NOT_STAR
-            elif state == DFA.MULTI_LINE_COMMENT_VAL_STAR:
-                if next_char == '/':
-                    state = DFA.MULTI_LINE_COMMENT_ED
-                elif next_char == '*':
-                    state = DFA.MULTI_LINE_COMMENT_VAL_STAR
-                else:
-                    state = DFA.MULTI_LINE_COMMENT_VAL_NOT_STAR
-            elif state == DFA.MULTI_LINE_COMMENT_ED:
-                # print(f'Read multiline comment "{token}"')
-                self.__unread_char()
-                state = DFA.INIT
-                token = ''
-                continue
-            elif state == DFA.LINE_COMMENT_VAL:
-                if ord(next_char) in [0x0A, 0x0D]:
-                    state = DFA.LINE_COMMENT_ED
-                else:
-                    state = DFA.LINE_COMMENT_VAL
-            elif state == DFA.LINE_COMMENT_ED:
-                # print(f'Read line comment "{token}"')
-                self.__unread_char()
-                state = DFA.INIT
-                token = ''
-                continue
-
             # char
             elif state == DFA.CHAR_ST:
                 # print(f'@char read {next_char}')
@@ -377,7 +484,7 @@ class Tokenizer(object):
                     state = DFA.CHAR_ED
                 else:
                     raise InvalidInputForState(
-                        self.row, self.col, next_char, state)
+                        *self.__current_pos(), next_char, DFA.names[state])
             elif state == DFA.CHAR_ED:
                 return unread_and_return_token(TokenType.CHAR_LITERAL)
 
@@ -407,53 +514,173 @@ class Tokenizer(object):
 
             token += next_char
 
+    def iter_tokens(self):
+        """
+        Yield tokens lazily, with a stream only the current window of the
+        source and the line index are kept in memory
+        """
+        while True:
+            token = self.next_token()
+            if token is None:
+                return
+            yield token
+
     def all_tokens(self):
-        tokens = []
+        return list(self.iter_tokens())
+
+    def retokenize(self, edit_range: tuple, new_text: str) -> list:
+        """
+        Replace the source between offsets `edit_range` = (st, ed) with
+        `new_text`, and return the tokens of the new source.
+
+        Tokens whose lookahead char is before `st` are kept. Lexing restarts
+        after the last of them and stops as soon as a token starts, after
+        the edit, where a token of the previous source started: from there
+        the previous tokens are reused, shifted in place. The first call
+        tokenizes the whole source.
+        """
+        assert self.stream is None, 'cannot retokenize a stream'
+        st, ed = edit_range
+        assert 0 <= st <= ed < len(self.text), f'invalid range {edit_range}'
+
+        old_tokens = self.tokens
+        self.tokens = None
+        self.text = self.text[:st] + new_text + self.text[ed:]
+        self.lines.replace(st, ed, new_text)
+        if old_tokens is None:
+            self.offset = 0
+            self.tokens = self.all_tokens()
+            self.retokenized = (0, 0, len(self.tokens))
+            return self.tokens
+
+        # keep tokens[:keep], which have `token.ed < st`
+        lo, hi = 0, len(old_tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if old_tokens[mid].ed < st:
+                lo = mid + 1
+            else:
+                hi = mid
+        keep = lo
+        tokens = old_tokens[:keep]
+
+        # candidates for re-synchronization are the tokens after the edit
+        delta = len(new_text) - (ed - st)
+        new_ed = st + len(new_text)
+        idx = keep
+        while idx < len(old_tokens) and old_tokens[idx].st < ed:
+            idx += 1
+
+        self.offset = tokens[-1].ed if tokens else 0
         while True:
             token = self.next_token()
             if token is None:
-                return tokens
+                break
+            if token.st >= new_ed:
+                while (idx < len(old_tokens) and
+                       old_tokens[idx].st + delta < token.st):
+                    idx += 1
+                if (idx < len(old_tokens) and
+                        old_tokens[idx].st + delta == token.st):
+                    break
             tokens.append(token)
 
+        self.retokenized = (keep, len(old_tokens) if token is None else idx,
+                            len(tokens))
+        if token is not None:
+            reused = old_tokens[idx:]
+            if delta:
+                for token in reused:
+                    token.st += delta
+                    token.ed += delta
+            tokens.extend(reused)
+            self.offset = len(self.text)
+        self.tokens = tokens
+        return tokens
+
     def __current_pos(self):
-        return self.row, self.col
+        return self.lines.pos(self.offset)
 
-    def __previous_pos(self):
-        self.__unread_char()
-        row, col = self.__current_pos()
-        self.__next_char()
-        return row, col
+    def __need_more(self, idx: int) -> bool:
+        """
+        Whether a lexeme starting at `self.text[idx]` may be cut by the end
+        of the window. Only comments span lines, so without an unterminated
+        comment a complete line after `idx` is enough to decide.
+        """
+        if self.eof:
+            return False
+        if self.text.startswith('/*', idx):
+            return self.text.find('*/', idx + 2) == -1
+        return self.text.find('\n', idx) == -1
+
+    def __fill(self, keep: int) -> bool:
+        """
+        Read the next chunk of the stream into the window, and discard
+        the part of the window before offset `keep`.
+        Return False if the stream is exhausted
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            chunk = '\n'
+
+        self.lines.add_lines(chunk, self.base + len(self.text))
+
+        self.text = self.text[keep - self.base:] + chunk
+        self.base = keep
+        return True
+
+    def __skip_block_comment(self):
+        """
+        Move past the '*/' closing the comment whose '/*' was just read, or
+        to the end of the source if there is none
+        """
+        start = self.offset
+        while True:
+            idx = self.text.find('*/', start - self.base)
+            if idx != -1:
+                self.offset = self.base + idx + 2
+                return
+            # a '*' ending the window may be closed by the next chunk
+            start = max(start, self.base + len(self.text) - 1)
+            if not self.__fill(keep=start):
+                self.offset = self.base + len(self.text)
+                return
+
+    def __skip_line_comment(self):
+        """
+        Move past the '\\n' or '\\r' ending the comment whose '//' was just
+        read
+        """
+        while True:
+            match = line_end_regex.search(self.text, self.offset - self.base)
+            if match is not None:
+                self.offset = self.base + match.end()
+                return
+            self.offset = self.base + len(self.text)
+            if not self.__fill(keep=self.offset):
+                return
 
     def __next_char(self):
         if self.is_eof():
             return ''
-        c = self.source[self.row][self.col]
+        c = self.text[self.offset - self.base]
         # print(f'[read-char] "{c}"')
-        self.__move_to_next_pos()
+        self.offset += 1
         return c
 
     def __unread_char(self):
-        if self.col == 0 and self.row == 0:
+        if self.offset == 0:
             raise IndexError(
                 'cannot unread char from the beginning of source code')
-
-        self.col -= 1
-        if self.col == -1:
-            self.row -= 1
-            self.col = len(self.source[self.row]) - 1
-        # print(f'[unread] "{self.source[self.row][self.col]}')
-
-    def __move_to_next_pos(self):
-        self.col += 1
-        if self.col == len(self.source[self.row]):
-            self.row += 1
-            self.col = 0
+        self.offset -= 1
 
     def is_eof(self):
-        # for the case that input file is empty and `self.end_row` is -1
-        if self.row > self.end_row:
-            return True
-        return self.row == self.end_row and self.col > self.end_col
+        if self.offset - self.base < len(self.text):
+            return False
+        return not self.__fill(keep=self.base)
 
     def __read_escape_seq(self):
         """
@@ -463,7 +690,7 @@ class Tokenizer(object):
             | '\\x'<hexadecimal-digit><hexadecimal-digit>
         """
         if self.__next_char() != '\\':
-            raise IllegalEscapeSequenceException(self.row, self.col,
+            raise IllegalEscapeSequenceException(*self.__current_pos(),
                                                  msg='try to read a escape-seq when first character is not \\')
 
         next_char = self.__next_char()
@@ -474,13 +701,13 @@ class Tokenizer(object):
             for i in range(2):
                 next_char = self.__next_char()
                 if not next_char:
-                    raise IllegalEscapeSequenceException(self.row, self.col,
+                    raise IllegalEscapeSequenceException(*self.__current_pos(),
                                                          msg='Incomplete hex esc-seq')
                 elif not is_hex_digit(next_char):
-                    raise IllegalEscapeSequenceException(self.row, self.col,
+                    raise IllegalEscapeSequenceException(*self.__current_pos(),
                                                          msg=f'Except hexdecimal digit, while get {next_char}')
                 chars += next_char
             return '\\' + chars
         else:
-            raise IllegalEscapeSequenceException(self.row, self.col,
+            raise IllegalEscapeSequenceException(*self.__current_pos(),
                                                  msg=f'Illegal esc-seq start with \\{next_char}')